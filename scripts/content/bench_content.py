@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for the parsing and generation hot paths.
+
+Runs each case over the fixture pages in ``bench/fixtures`` and writes
+``.build/bench/latest.json``::
+
+    {"meta": {"git": "5b3fc51", "python": "3.11.7", "fixtures": {name: sha256}, ...},
+     "results": {"extract_json_from_html": {"median_us": 812.4, "min_us": 790.1,
+                                            "stdev_us": 9.8, "number": 200, "rounds": 7}, ...}}
+
+Pass ``--save NAME`` to keep a copy as ``NAME.json``. Pass ``--compare NAME``
+to print the change against a saved run. Fixture hashes are recorded so runs
+over different inputs are not compared by mistake.
+
+``--startup`` instead times ``content_cli.py`` in fresh interpreters and fails
+if a command goes over its budget or imports a module it must not: ``--help``
+loads no third-party module, ``index`` no HTTP client or HTML parser.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+from typing import Callable, Optional
+
+from bs4 import BeautifulSoup
+
+from chunk_content import BUILD_DIR, PROJECT_ROOT, content_hash
+from guide_specs import extract_sections, load_guide_specs
+from hero_merge import fandom_snapshot, master_snapshot, merge_hero, parse_skill_cards
+
+import update_content as uc
+
+FIXTURE_DIR = Path(__file__).resolve().parent / "bench" / "fixtures"
+BENCH_DIR = BUILD_DIR / "bench"
+SYNTHETIC_TREE = BENCH_DIR / "tree"
+SYNTHETIC_DOCS = 10_000
+SYNTHETIC_CATEGORIES = ("heroes", "gear", "mechanics", "meta", "pets", "relics", "events", "progression")
+SAMPLE_HERO_DOC = uc.HERO_RAG_DIR / "adjudicator.md"
+
+CLI = Path(__file__).resolve().parent / "content_cli.py"
+NETWORK_MODULES = ("requests", "bs4", "aiohttp", "urllib3")
+# argv -> (milliseconds over a bare interpreter, modules that must not load)
+STARTUP_CASES = {
+    ("--help",): (100, NETWORK_MODULES + ("numpy", "scipy")),
+    ("index", "--help"): (1000, NETWORK_MODULES),
+}
+
+
+def _fixture(name: str) -> str:
+    return (FIXTURE_DIR / name).read_text(encoding="utf-8")
+
+
+def build_synthetic_tree(root: Path = SYNTHETIC_TREE, docs: int = SYNTHETIC_DOCS) -> Path:
+    """Create (once) a rag-content-like tree of ``docs`` markdown files."""
+    marker = root / ".complete"
+    if marker.exists() and marker.read_text() == str(docs):
+        return root
+    shutil.rmtree(root, ignore_errors=True)
+    template = SAMPLE_HERO_DOC.read_text(encoding="utf-8")
+    for number in range(docs):
+        category = SYNTHETIC_CATEGORIES[number % len(SYNTHETIC_CATEGORIES)]
+        path = root / category / f"doc-{number:05d}.md"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(template.replace("Adjudicator", f"Doc {number}"), encoding="utf-8")
+    marker.write_text(str(docs))
+    return root
+
+
+def _content_orchestrator(rag_dir: Path):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scrapers"))
+    import orchestrator
+
+    logging.getLogger("orchestrator").setLevel(logging.WARNING)
+    orchestrator.RAG_CONTENT_DIR = rag_dir
+    return orchestrator.ContentOrchestrator()
+
+
+def build_cases(workdir: Path, tree_docs: int) -> dict[str, Callable[[], object]]:
+    hero_page = _fixture("hero_page.html")
+    hero_list = _fixture("hero_list.html")
+    guide_page = _fixture("hero_guide.html")
+    fandom_page = _fixture("fandom_article.html")
+
+    list_soup = BeautifulSoup(hero_list, "html.parser")
+    guide_soup = BeautifulSoup(guide_page, "html.parser")
+    master = uc.extract_json_from_html(hero_page)["heroes"]
+    fandom_data = uc.extract_fandom_sections(fandom_page)
+    # Listing snapshots are left out: building them downloads portraits.
+    snapshots = {
+        hero["slug"]: {
+            "master": master_snapshot(hero),
+            "html": parse_skill_cards(hero_page),
+            "fandom": fandom_snapshot(fandom_data),
+        }
+        for hero in master
+    }
+    markdown_target = workdir / SAMPLE_HERO_DOC.name
+    shutil.copyfile(SAMPLE_HERO_DOC, markdown_target)
+
+    orchestrator = _content_orchestrator(build_synthetic_tree(docs=tree_docs))
+
+    cases: dict[str, Callable[[], object]] = {
+        "extract_json_from_html": lambda: uc.extract_json_from_html(hero_page),
+        "build_hero_index": lambda: uc.build_hero_index(list_soup),
+        "parse_skill_cards": lambda: parse_skill_cards(hero_page),
+        "merge_hero": lambda: [merge_hero(slug, sources) for slug, sources in snapshots.items()],
+        "guides.parse_page": lambda: BeautifulSoup(guide_page, "html.parser"),
+        "extract_fandom_sections": lambda: uc.extract_fandom_sections(fandom_page),
+        "update_markdown": lambda: uc.update_markdown(markdown_target, fandom_data),
+        f"generate_content_index[{tree_docs}]": orchestrator.generate_content_index,
+    }
+    guide_spec = load_guide_specs()[0]
+    # hero_guide_variants.html moves things around (icons in headings, wrapped
+    # tables); every section must still be found there.
+    for path in sorted(FIXTURE_DIR.glob("hero_guide*.html")):
+        found = extract_sections(guide_spec, BeautifulSoup(path.read_text(encoding="utf-8"), "html.parser"))
+        missing = [spec.title for spec, text in found.items() if text is None]
+        if missing:
+            raise AssertionError(f"{path.name}: no anchor for {', '.join(missing)}")
+    cases["guides.extract_sections"] = lambda: extract_sections(guide_spec, guide_soup)
+    return cases
+
+
+def measure(func: Callable[[], object], rounds: int) -> dict:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    samples = [elapsed / number * 1e6 for elapsed in timer.repeat(repeat=rounds, number=number)]
+    return {
+        "median_us": round(statistics.median(samples), 2),
+        "min_us": round(min(samples), 2),
+        "stdev_us": round(statistics.stdev(samples), 2) if len(samples) > 1 else 0.0,
+        "number": number,
+        "rounds": rounds,
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(rounds: int = 7, only: Optional[str] = None, tree_docs: int = SYNTHETIC_DOCS) -> dict:
+    with tempfile.TemporaryDirectory() as workdir:
+        cases = build_cases(Path(workdir), tree_docs)
+        results = {}
+        for name, func in cases.items():
+            if only and only not in name:
+                continue
+            # Some cases print progress; keep terminal I/O out of the timings.
+            with contextlib.redirect_stdout(io.StringIO()):
+                results[name] = measure(func, rounds)
+            print(f"{name:<40} {results[name]['median_us']:>12.1f} us  (±{results[name]['stdev_us']:.1f})")
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "fixtures": {path.name: content_hash(path.read_bytes()) for path in sorted(FIXTURE_DIR.glob("*.html"))},
+            "synthetic_docs": tree_docs,
+        },
+        "results": results,
+    }
+
+
+def _imported_modules(argv: tuple[str, ...]) -> set[str]:
+    """Top-level packages a fresh interpreter imports to run ``content_cli.py argv``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", str(CLI), *argv], capture_output=True, text=True, check=False
+    )
+    return {
+        line.rsplit("|", 1)[1].strip().split(".")[0]
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "|" in line
+    }
+
+
+def _median_ms(argv: list[str], rounds: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        subprocess.run(argv, capture_output=True, check=False)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def check_startup(rounds: int = 7) -> list[str]:
+    """Time each ``STARTUP_CASES`` command; return the failures."""
+    bare = _median_ms([sys.executable, "-c", "pass"], rounds)
+    print(f"{'bare interpreter':<30} {bare:8.1f} ms")
+    failures = []
+    for argv, (budget, forbidden) in STARTUP_CASES.items():
+        name = " ".join(argv)
+        overhead = _median_ms([sys.executable, str(CLI), *argv], rounds) - bare
+        loaded = sorted(_imported_modules(argv) & set(forbidden))
+        print(f"{name:<30} {overhead:+8.1f} ms  (budget {budget} ms)" + (f"  loads {', '.join(loaded)}" if loaded else ""))
+        if overhead > budget:
+            failures.append(f"{name}: {overhead:.0f} ms over a bare interpreter (budget {budget} ms)")
+        if loaded:
+            failures.append(f"{name}: imports {', '.join(loaded)}")
+    return failures
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Print per-case change against ``baseline``; return names slower than ``threshold``."""
+    if current["meta"]["fixtures"] != baseline["meta"].get("fixtures"):
+        print("warning: fixtures differ from the baseline run; timings are not directly comparable")
+    regressions = []
+    print(f"\n{'case':<40} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if not before:
+            print(f"{name:<40} {'-':>12} {result['median_us']:>12.1f} {'new':>8}")
+            continue
+        change = result["median_us"] / before["median_us"] - 1
+        flag = " !" if change > threshold else ""
+        print(f"{name:<40} {before['median_us']:>12.1f} {result['median_us']:>12.1f} {change:>+7.1%}{flag}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark content parsing and generation hot paths.")
+    parser.add_argument("--rounds", type=int, default=7, help="Timed rounds per case")
+    parser.add_argument("--only", help="Run cases whose name contains this substring")
+    parser.add_argument("--docs", type=int, default=SYNTHETIC_DOCS, help="Docs in the synthetic index tree")
+    parser.add_argument("--save", metavar="NAME", help=f"Also save results as {BENCH_DIR.name}/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="Compare against a saved run (name or path)")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Slowdown that counts as a regression with --compare (default 0.10 = 10%%)",
+    )
+    parser.add_argument("--startup", action="store_true", help="Check content_cli.py startup time and imports instead")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    args = parse_args(argv)
+    if args.startup:
+        failures = check_startup(args.rounds)
+        for failure in failures:
+            print(f"FAIL {failure}")
+        sys.exit(1 if failures else 0)
+
+    report = run_benchmarks(args.rounds, args.only, args.docs)
+
+    BENCH_DIR.mkdir(parents=True, exist_ok=True)
+    text = json.dumps(report, indent=2, sort_keys=True)
+    (BENCH_DIR / "latest.json").write_text(text, encoding="utf-8")
+    if args.save:
+        (BENCH_DIR / f"{args.save}.json").write_text(text, encoding="utf-8")
+        print(f"Saved {BENCH_DIR / args.save}.json")
+
+    if args.compare:
+        path = Path(args.compare)
+        if not path.exists():
+            path = BENCH_DIR / f"{args.compare}.json"
+        regressions = compare(report, json.loads(path.read_text(encoding="utf-8")), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) slower than {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
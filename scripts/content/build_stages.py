@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Retrieval build stages: changelog, chunks, dedup, lexical and vector
+indexes, hero bundles and compression.
+
+``update_content.py`` runs these after crawling. Run on their own they only
+import the NumPy/SciPy stack, not the HTTP clients or HTML parsers::
+
+    python3 scripts/content/build_stages.py            # skip if no docs changed
+    python3 scripts/content/build_stages.py --force    # rebuild everything
+"""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Optional
+
+from chunk_content import CHUNKS_FILE, DEFAULT_MAX_TOKENS, DEFAULT_OVERLAP, build_chunks, chunk_params_changed
+from compress_artifacts import compress_artifacts
+from content_diff import CHANGELOG_FILE, capture_snapshot, diff_content, docs_changed, save_snapshot, summarize
+from dedup_content import DEDUP_CHUNKS_FILE, run_dedup
+from hero_bundles import build_hero_bundles
+from lexical_index import LEXICAL_INDEX, build_lexical_index
+from run_metrics import METRICS_DIR, metrics
+from vector_index import VECTOR_DIR, build_vector_index
+
+BUILD_FLAGS = ("chunks", "dedup", "index", "vectors", "bundles", "compress")
+
+
+def run_build_stages(args: argparse.Namespace, build_all: bool) -> None:
+    """Run the stages whose flag is set on ``args``, or every out-of-date one with ``build_all``."""
+    # With build_all, the doc-derived stages are skipped when the changelog shows
+    # no doc changes and their output already exists. Explicit flags always run.
+    # New chunk parameters rechunk every doc, and --refit rebuilds the vectors.
+    # Bundles and compression keep their own per-input hashes, so they always run.
+    snapshot = None
+    rebuild_docs = True
+    if build_all:
+        with metrics.stage("changelog"):
+            snapshot = capture_snapshot()
+            changelog = diff_content(snapshot)
+        rebuild_docs = docs_changed(changelog)
+        print(f"Changes since last build: {summarize(changelog)} -> {CHANGELOG_FILE}")
+    rechunk = chunk_params_changed(args.chunk_tokens, args.chunk_overlap)
+
+    def needed(flag: bool, output: Path, changed: bool = False) -> bool:
+        if flag:
+            return True
+        if not build_all:
+            return False
+        if rebuild_docs or changed or not output.exists():
+            return True
+        print(f"Skipping {output.name}: no content changes")
+        return False
+
+    if needed(args.chunks, CHUNKS_FILE, rechunk):
+        with metrics.stage("chunks"):
+            stats = build_chunks(args.chunk_tokens, args.chunk_overlap)
+            metrics.cache("chunks", hits=stats["reused"], misses=stats["rechunked"])
+            metrics.files(written=1)
+
+    if needed(args.dedup, DEDUP_CHUNKS_FILE, rechunk):
+        with metrics.stage("dedup"):
+            run_dedup(emit=True)
+            metrics.files(written=2)
+
+    if needed(args.index, LEXICAL_INDEX, rechunk):
+        with metrics.stage("index"):
+            build_lexical_index()
+            metrics.files(written=1)
+
+    if needed(args.vectors, VECTOR_DIR, rechunk or args.refit):
+        with metrics.stage("vectors"):
+            build_vector_index(force_refit=args.refit)
+
+    if build_all or args.bundles:
+        with metrics.stage("bundles"):
+            stats = build_hero_bundles()
+            metrics.cache("bundles", hits=stats["unchanged"], misses=stats["rebuilt"])
+            metrics.files(written=stats["rebuilt"], skipped=stats["unchanged"])
+
+    # Runs last so it sees every artifact written above.
+    if build_all or args.compress:
+        with metrics.stage("compress"):
+            stats = compress_artifacts()
+            metrics.cache("compress", hits=stats["skipped"], misses=stats["compressed"])
+            metrics.files(written=stats["compressed"], skipped=stats["skipped"])
+
+    # Only advance the baseline once every stage has consumed the changes.
+    if snapshot is not None:
+        save_snapshot(snapshot)
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rebuild the rag-content retrieval artifacts.")
+    parser.add_argument("--force", action="store_true", help="Rebuild every artifact even if no docs changed")
+    parser.add_argument("--chunk-tokens", type=int, default=DEFAULT_MAX_TOKENS, help="Token budget per retrieval chunk")
+    parser.add_argument("--chunk-overlap", type=int, default=DEFAULT_OVERLAP, help="Tokens of overlap between split chunks")
+    parser.add_argument(
+        "--refit",
+        action="store_true",
+        help="Refit the vector index instead of folding in changed chunks",
+    )
+    parser.add_argument(
+        "--metrics-dir",
+        type=Path,
+        default=METRICS_DIR,
+        help="Where to write the JSON run report and Prometheus textfile",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    args = parse_args(argv)
+    for flag in BUILD_FLAGS:
+        setattr(args, flag, args.force)
+    try:
+        run_build_stages(args, build_all=True)
+    except BaseException:
+        metrics.status = "failed"
+        raise
+    finally:
+        print(f"Run metrics -> {metrics.write('build', args.metrics_dir)}")
+
+
+if __name__ == "__main__":
+    main()
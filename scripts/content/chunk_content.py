@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""Split rag-content markdown into heading-aware, token-budgeted chunks."""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+RAG_DIR = PROJECT_ROOT / "rag-content"
+BUILD_DIR = RAG_DIR / ".build"
+CHUNKS_FILE = BUILD_DIR / "chunks.jsonl"
+CHUNKS_MANIFEST = BUILD_DIR / "chunks-manifest.json"
+
+DEFAULT_MAX_TOKENS = 384
+DEFAULT_OVERLAP = 48
+
+# Rough stand-in for a BPE tokenizer: words and individual punctuation marks.
+TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+HEADING_RE = re.compile(r"^(#{1,3})\s+(.*?)\s*#*\s*$")
+FENCE_RE = re.compile(r"^\s*(```|~~~)")
+
+
+@dataclass
+class Section:
+    heading_path: list[str]
+    heading_line: str
+    body: str
+
+
+@dataclass
+class Chunk:
+    id: str
+    source: str
+    heading_path: list[str]
+    text: str
+    tokens: int
+    chunk_hash: str
+    source_hash: str
+
+
+def count_tokens(text: str) -> int:
+    return len(TOKEN_RE.findall(text))
+
+
+def display_path(path: Path) -> str:
+    """``path`` relative to the repo root when it is inside it, else as given."""
+    try:
+        return path.resolve().relative_to(PROJECT_ROOT).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def content_hash(data: bytes | str) -> str:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def iter_markdown_files(root: Path = RAG_DIR) -> Iterator[Path]:
+    """Yield content docs under ``root``, skipping hidden dirs and the README."""
+    for path in sorted(root.rglob("*.md")):
+        rel = path.relative_to(root)
+        if any(part.startswith(".") for part in rel.parts):
+            continue
+        if rel.as_posix() == "README.md":
+            continue
+        yield path
+
+
+def split_sections(markdown: str) -> list[Section]:
+    """Split a document on #/##/### headings, tracking the heading path."""
+    sections: list[Section] = []
+    path: list[str] = []
+    heading_line = ""
+    body: list[str] = []
+    in_fence = False
+
+    def flush() -> None:
+        text = "\n".join(body).strip()
+        if text or heading_line:
+            sections.append(Section(list(path), heading_line, text))
+
+    for line in markdown.splitlines():
+        if FENCE_RE.match(line):
+            in_fence = not in_fence
+        match = None if in_fence else HEADING_RE.match(line)
+        if not match:
+            body.append(line)
+            continue
+
+        flush()
+        level = len(match.group(1))
+        title = match.group(2).strip()
+        del path[level - 1:]
+        while len(path) < level - 1:
+            path.append("")
+        path.append(title)
+        heading_line = line.strip()
+        body = []
+
+    flush()
+    return [section for section in sections if section.body or section.heading_line]
+
+
+def _split_oversized(unit: str, max_tokens: int) -> list[str]:
+    """Break a paragraph that alone exceeds the budget into lines, then words."""
+    if count_tokens(unit) <= max_tokens:
+        return [unit]
+
+    lines = [line for line in unit.splitlines() if line.strip()]
+    if len(lines) > 1:
+        pieces: list[str] = []
+        for line in lines:
+            pieces.extend(_split_oversized(line, max_tokens))
+        return pieces
+
+    words = unit.split()
+    pieces = []
+    current: list[str] = []
+    current_tokens = 0
+    for word in words:
+        word_tokens = count_tokens(word)
+        if current and current_tokens + word_tokens > max_tokens:
+            pieces.append(" ".join(current))
+            current, current_tokens = [], 0
+        current.append(word)
+        current_tokens += word_tokens
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def window_units(units: list[str], max_tokens: int, overlap: int) -> list[str]:
+    """Greedily pack units into windows, carrying up to ``overlap`` tokens of tail."""
+    windows: list[str] = []
+    current: list[tuple[str, int]] = []
+    current_tokens = 0
+    fresh = 0
+
+    for unit in units:
+        unit_tokens = count_tokens(unit)
+        if current and current_tokens + unit_tokens > max_tokens:
+            windows.append("\n\n".join(text for text, _ in current))
+            carried: list[tuple[str, int]] = []
+            carried_tokens = 0
+            for text, tokens in reversed(current):
+                if carried_tokens + tokens > overlap or carried_tokens + tokens + unit_tokens > max_tokens:
+                    break
+                carried.insert(0, (text, tokens))
+                carried_tokens += tokens
+            current, current_tokens, fresh = carried, carried_tokens, 0
+        current.append((unit, unit_tokens))
+        current_tokens += unit_tokens
+        fresh += 1
+
+    if current and fresh:
+        windows.append("\n\n".join(text for text, _ in current))
+    return windows
+
+
+def _common_prefix(paths: Iterable[list[str]]) -> list[str]:
+    paths = list(paths)
+    if not paths:
+        return []
+    prefix = paths[0]
+    for other in paths[1:]:
+        size = 0
+        for left, right in zip(prefix, other):
+            if left != right:
+                break
+            size += 1
+        prefix = prefix[:size]
+    return list(prefix)
+
+
+def chunk_document(source: str, markdown: str, max_tokens: int, overlap: int) -> list[Chunk]:
+    """Chunk one document along its heading structure."""
+    source_hash = content_hash(markdown)
+    min_tokens = max_tokens // 4
+    pieces: list[tuple[list[str], str]] = []
+
+    pending: list[tuple[list[str], str]] = []
+    pending_tokens = 0
+
+    def flush_pending() -> None:
+        nonlocal pending, pending_tokens
+        if pending:
+            text = "\n\n".join(text for _, text in pending)
+            pieces.append((_common_prefix(path for path, _ in pending), text))
+        pending, pending_tokens = [], 0
+
+    for section in split_sections(markdown):
+        text = "\n\n".join(part for part in (section.heading_line, section.body) if part)
+        tokens = count_tokens(text)
+
+        if tokens > max_tokens:
+            flush_pending()
+            head_tokens = count_tokens(section.heading_line)
+            budget = max(max_tokens - head_tokens, 1)
+            units: list[str] = []
+            for paragraph in re.split(r"\n\s*\n", section.body):
+                if paragraph.strip():
+                    units.extend(_split_oversized(paragraph.strip(), budget))
+            for window in window_units(units, budget, overlap):
+                body = "\n\n".join(part for part in (section.heading_line, window) if part)
+                pieces.append((section.heading_path, body))
+            continue
+
+        # Small neighbouring sections share a chunk so stubs don't fragment, but a
+        # reasonably sized chunk is closed at the next ## boundary.
+        if pending:
+            new_topic = section.heading_path[:2] != pending[-1][0][:2]
+            if pending_tokens + tokens > max_tokens or (new_topic and pending_tokens >= min_tokens):
+                flush_pending()
+        pending.append((section.heading_path, text))
+        pending_tokens += tokens
+
+    flush_pending()
+
+    chunks = []
+    for index, (heading_path, text) in enumerate(pieces):
+        heading_path = [title for title in heading_path if title]
+        chunks.append(
+            Chunk(
+                id=f"{source}#{index}",
+                source=source,
+                heading_path=heading_path,
+                text=text,
+                tokens=count_tokens(text),
+                chunk_hash=content_hash(text)[:16],
+                source_hash=source_hash,
+            )
+        )
+    return chunks
+
+
+def load_chunks(path: Path = CHUNKS_FILE) -> list[dict]:
+    if not path.exists():
+        return []
+    with path.open(encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle if line.strip()]
+
+
+def _load_manifest(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return {}
+
+
+def chunk_params_changed(
+    max_tokens: int = DEFAULT_MAX_TOKENS,
+    overlap: int = DEFAULT_OVERLAP,
+    manifest_path: Path = CHUNKS_MANIFEST,
+) -> bool:
+    """Whether the last ``build_chunks`` run used other parameters, or none is recorded."""
+    return _load_manifest(manifest_path).get("params") != {"max_tokens": max_tokens, "overlap": overlap}
+
+
+def build_chunks(
+    max_tokens: int = DEFAULT_MAX_TOKENS,
+    overlap: int = DEFAULT_OVERLAP,
+    force: bool = False,
+    rag_dir: Path = RAG_DIR,
+    output: Path = CHUNKS_FILE,
+    manifest_path: Path = CHUNKS_MANIFEST,
+) -> dict:
+    """Re-chunk changed docs and rewrite ``chunks.jsonl``; returns run stats."""
+    if overlap >= max_tokens:
+        raise ValueError("overlap must be smaller than max_tokens")
+
+    params = {"max_tokens": max_tokens, "overlap": overlap}
+    manifest = _load_manifest(manifest_path)
+    reuse = not force and manifest.get("params") == params
+    previous_files = manifest.get("files", {}) if reuse else {}
+
+    previous: dict[str, list[dict]] = {}
+    if reuse:
+        for record in load_chunks(output):
+            previous.setdefault(record["source"], []).append(record)
+
+    records: list[dict] = []
+    files: dict[str, dict] = {}
+    stats = {"files": 0, "rechunked": 0, "reused": 0, "chunks": 0, "tokens": 0}
+
+    for path in iter_markdown_files(rag_dir):
+        source = path.relative_to(rag_dir).as_posix()
+        raw = path.read_bytes()
+        file_hash = content_hash(raw)
+        stats["files"] += 1
+
+        cached = previous.get(source)
+        if cached and previous_files.get(source, {}).get("hash") == file_hash:
+            file_records = cached
+            stats["reused"] += 1
+        else:
+            markdown = raw.decode("utf-8")
+            file_records = [asdict(chunk) for chunk in chunk_document(source, markdown, max_tokens, overlap)]
+            stats["rechunked"] += 1
+
+        records.extend(file_records)
+        files[source] = {"hash": file_hash, "chunks": len(file_records)}
+
+    stats["chunks"] = len(records)
+    stats["tokens"] = sum(record["tokens"] for record in records)
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_suffix(".jsonl.tmp")
+    with tmp_path.open("w", encoding="utf-8") as handle:
+        for record in records:
+            handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+    tmp_path.replace(output)
+    manifest_path.write_text(json.dumps({"params": params, "files": files}, indent=2), encoding="utf-8")
+
+    print(
+        f"Chunked {stats['files']} docs ({stats['rechunked']} re-chunked, {stats['reused']} unchanged): "
+        f"{stats['chunks']} chunks, {stats['tokens']} tokens -> {display_path(output)}"
+    )
+    return stats
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Chunk rag-content markdown for retrieval.")
+    parser.add_argument("--max-tokens", type=int, default=DEFAULT_MAX_TOKENS, help="Token budget per chunk")
+    parser.add_argument("--overlap", type=int, default=DEFAULT_OVERLAP, help="Tokens carried between split chunks")
+    parser.add_argument("--force", action="store_true", help="Re-chunk every file, ignoring content hashes")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    build_chunks(args.max_tokens, args.overlap, force=args.force)
+
+
+if __name__ == "__main__":
+    main()
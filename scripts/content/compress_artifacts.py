@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Write max-level .gz and .br siblings for generated content artifacts."""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+from pathlib import Path
+from typing import Iterator
+
+from chunk_content import BUILD_DIR, PROJECT_ROOT, RAG_DIR, content_hash
+from hero_store import HERO_DATA_DIR, HEROES_JSON
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+COMPRESS_MANIFEST = BUILD_DIR / "compress-manifest.json"
+COMPRESSED_SUFFIXES = (".gz", ".br")
+
+# Files written by the pipeline that are worth serving precompressed.
+ARTIFACT_GLOBS = (
+    (HEROES_JSON.parent, HEROES_JSON.name),
+    (HERO_DATA_DIR, "**/*.json"),
+    (RAG_DIR, "index.json"),
+    (BUILD_DIR, "chunks*.jsonl"),
+    (BUILD_DIR, "*.idx"),
+    (BUILD_DIR, "vectors/*.npy"),
+    (BUILD_DIR, "bundles/*.json"),
+)
+
+
+def iter_artifacts() -> Iterator[Path]:
+    seen: set[Path] = set()
+    for root, pattern in ARTIFACT_GLOBS:
+        if not root.exists():
+            continue
+        for path in sorted(root.glob(pattern)):
+            if path.is_file() and path.suffix not in COMPRESSED_SUFFIXES and path not in seen:
+                seen.add(path)
+                yield path
+
+
+def iter_orphans(artifacts: set[Path]) -> Iterator[Path]:
+    """Compressed siblings whose artifact no longer exists."""
+    seen: set[Path] = set()
+    for root, pattern in ARTIFACT_GLOBS:
+        if not root.exists():
+            continue
+        for suffix in COMPRESSED_SUFFIXES:
+            for path in sorted(root.glob(pattern + suffix)):
+                if path not in seen and path.with_name(path.name[: -len(suffix)]) not in artifacts:
+                    seen.add(path)
+                    yield path
+
+
+def compress_gzip(data: bytes) -> bytes:
+    # mtime=0 keeps output byte-identical across runs.
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def compress_brotli(data: bytes) -> bytes:
+    return brotli.compress(data, quality=11)
+
+
+def _sibling(path: Path, suffix: str) -> Path:
+    return path.with_name(path.name + suffix)
+
+
+def compress_artifacts(force: bool = False, manifest_path: Path = COMPRESS_MANIFEST) -> dict:
+    """Compress changed artifacts and return byte totals per format."""
+    codecs = {".gz": compress_gzip}
+    if brotli is not None:
+        codecs[".br"] = compress_brotli
+    else:
+        print("  brotli not installed; writing .gz only (pip install brotli)")
+
+    manifest = {}
+    if manifest_path.exists() and not force:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+
+    new_manifest: dict[str, dict] = {}
+    totals = {suffix: {"original": 0, "compressed": 0} for suffix in codecs}
+    stats = {"files": 0, "compressed": 0, "skipped": 0, "removed": 0}
+    artifacts: set[Path] = set()
+
+    for path in iter_artifacts():
+        artifacts.add(path)
+        key = path.relative_to(PROJECT_ROOT).as_posix()
+        data = path.read_bytes()
+        digest = content_hash(data)
+        previous = manifest.get(key, {})
+        stats["files"] += 1
+
+        unchanged = previous.get("hash") == digest and all(
+            _sibling(path, suffix).exists() for suffix in previous.get("sizes", {})
+        ) and set(previous.get("sizes", {})) | set(previous.get("skipped", [])) >= set(codecs)
+        if unchanged:
+            sizes = previous["sizes"]
+            stats["skipped"] += 1
+        else:
+            sizes = {}
+            for suffix in COMPRESSED_SUFFIXES:
+                packed = codecs[suffix](data) if suffix in codecs else None
+                sibling = _sibling(path, suffix)
+                if packed is not None and len(packed) < len(data):
+                    sibling.write_bytes(packed)
+                    sizes[suffix] = len(packed)
+                else:
+                    # Also drops a stale .br when brotli is no longer installed.
+                    sibling.unlink(missing_ok=True)
+            stats["compressed"] += 1
+
+        for suffix in codecs:
+            totals[suffix]["original"] += len(data)
+            totals[suffix]["compressed"] += sizes.get(suffix, len(data))
+        new_manifest[key] = {
+            "hash": digest,
+            "sizes": sizes,
+            "skipped": sorted(set(codecs) - set(sizes)),
+        }
+
+    # Globbed rather than taken from the old manifest, which --force ignores.
+    for orphan in iter_orphans(artifacts):
+        orphan.unlink()
+        stats["removed"] += 1
+
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps(new_manifest, indent=2, sort_keys=True), encoding="utf-8")
+
+    print(
+        f"Compressed {stats['compressed']} of {stats['files']} artifacts "
+        f"({stats['skipped']} unchanged, {stats['removed']} orphaned siblings removed)"
+    )
+    for suffix, total in totals.items():
+        if total["original"]:
+            saved = total["original"] - total["compressed"]
+            print(
+                f"  {suffix}: {total['original']} -> {total['compressed']} bytes "
+                f"({saved} saved, {saved / total['original']:.0%})"
+            )
+    stats["totals"] = totals
+    return stats
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Precompress generated content artifacts.")
+    parser.add_argument("--force", action="store_true", help="Recompress every artifact")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    compress_artifacts(force=args.force)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""One command for the content pipeline: ``topheroes-content <command> [options]``.
+
+Each command is a plugin: the ``module:function`` that implements it and the
+arguments it is called with. The module is imported only when its command
+runs, so ``--help`` loads nothing but this file and ``index`` never loads the
+HTTP clients or HTML parsers. ``bench_content.py --startup`` checks both.
+
+Other packages can add commands through the ``topheroes_content.commands``
+entry-point group (``name = "module:function"``; the function takes the
+argument list). Entry points are only read for a name that is not built in.
+
+Run it from a checkout, or install it with ``pip install -e scripts/python``::
+
+    python3 scripts/content/content_cli.py crawl --resume
+    topheroes-content index --force
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+
+PROG = "topheroes-content"
+PLUGIN_GROUP = "topheroes_content.commands"
+
+
+class Command:
+    """A lazily imported subcommand."""
+
+    __slots__ = ("name", "target", "args", "help")
+
+    def __init__(self, name: str, target: str, args: tuple = (), help: str = "") -> None:
+        self.name = name
+        self.target = target
+        self.args = args
+        self.help = help
+
+    def load(self):
+        from importlib import import_module
+
+        module, _, function = self.target.partition(":")
+        return getattr(import_module(module), function or "main")
+
+
+COMMANDS = {
+    command.name: command
+    for command in (
+        Command("crawl", "update_content:main", ("--heroes-json",), "Crawl hero.php and hero pages, then merge hero data"),
+        Command("enrich", "update_content:main", ("--fandom",), "Add Fandom lore and skills to hero docs, then merge"),
+        Command("guides", "update_content:main", ("--guides",), "Extract guide pages into rag-content"),
+        Command("images", "update_content:main", ("--images",), "Fetch hero portraits still missing, then merge"),
+        Command("index", "build_stages:main", (), "Rebuild chunks, indexes, bundles and compressed artifacts"),
+        Command("validate", "validate_content:main", (), "Check docs, guide specs and hero data"),
+        Command("bench", "bench_content:main", (), "Run the micro-benchmarks, or the startup check with --startup"),
+        Command("watch", "content_daemon:main", (), "Run the update stages on a schedule"),
+    )
+}
+
+
+def plugin_command(name: str):
+    """The entry-point command called ``name``, if an installed package provides one."""
+    from importlib.metadata import entry_points
+
+    for entry in entry_points(group=PLUGIN_GROUP):
+        if entry.name == name:
+            return Command(name, entry.value, (), f"Plugin from {entry.module}")
+    return None
+
+
+def build_parser() -> argparse.ArgumentParser:
+    width = max(len(name) for name in COMMANDS)
+    listing = "\n".join(f"  {name:<{width}}  {command.help}" for name, command in COMMANDS.items())
+    parser = argparse.ArgumentParser(
+        prog=PROG,
+        description="Update, index and check the Top Heroes content.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=f"commands:\n{listing}\n\nRun '{PROG} <command> --help' for the options of a command.\n"
+        f"Installed packages can add commands through the '{PLUGIN_GROUP}' entry points.",
+    )
+    parser.add_argument("command", help="Command to run")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="Options for the command")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    command = COMMANDS.get(args.command) or plugin_command(args.command)
+    if command is None:
+        parser.error(f"unknown command {args.command!r} (choose from {', '.join(COMMANDS)})")
+    run = command.load()
+    # The command parses its own options; name it in their usage line.
+    sys.argv[0] = f"{PROG} {command.name}"
+    run([*command.args, *args.args])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""Run the update_content stages on a schedule in one long-lived process.
+
+Cron pays interpreter startup, imports, a cold connection pool and cold
+caches on every run. The daemon imports ``update_content`` once and runs each
+job on its own interval, so these stay warm between cycles:
+
+- the pooled HTTP session (``update_content.SESSION``)
+- the parsed ``hero.php`` and the current release's ``HERO_MASTER`` (``site_data.py``)
+- the Fandom title index and the slugs it has resolved
+- the changelog baseline and per-doc section hashes (``content_diff.py``)
+
+Jobs and their default intervals:
+
+    heroes   6h    --heroes-json (then merge)
+    guides   12h   --guides
+    fandom   24h   --fandom (then merge)
+    build    1h    --build: retrieval artifacts, skipped when no docs changed
+
+Every job runs once at startup, then again after its interval, stretched or
+shrunk by up to ``--jitter`` so jobs do not line up. A failed job is logged and
+retried on its next turn. Each run writes the usual metrics report as
+``daemon-<job>.json``/``.prom``; the state of every job is kept in
+``.build/daemon/status.json`` and, with ``--status-port``, served at
+``http://127.0.0.1:<port>/status``::
+
+    {"started": ..., "pid": ..., "jobs": {"heroes": {"interval": 21600, "next_run": ...,
+     "runs": 3, "failures": 0, "last": {"started": ..., "seconds": 4.1, "status": "ok",
+     "requests": 2, "report": ".../daemon-heroes.json"}}}}
+
+Unrecognized options are passed to update_content (``--delay``,
+``--hero-shards``, ``--replay-url`` ...).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import signal
+import threading
+import time
+import traceback
+from copy import copy
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+import update_content
+from chunk_content import BUILD_DIR
+from run_metrics import metrics
+
+STATUS_FILE = BUILD_DIR / "daemon" / "status.json"
+JOBS = {
+    "heroes": (("heroes_json",), 6 * 3600),
+    "guides": (("guides",), 12 * 3600),
+    "fandom": (("fandom",), 24 * 3600),
+    "build": (("build",), 3600),
+}
+DEFAULT_JITTER = 0.1
+UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_interval(text: str) -> float:
+    """``90``, ``90s``, ``30m``, ``6h`` or ``1d`` in seconds."""
+    text = text.strip().lower()
+    if text and text[-1] in UNITS:
+        return float(text[:-1]) * UNITS[text[-1]]
+    return float(text)
+
+
+def parse_every(text: str) -> tuple[str, float]:
+    name, _, interval = text.partition("=")
+    if name not in JOBS or not interval:
+        raise argparse.ArgumentTypeError(f"expected JOB=INTERVAL with JOB in {', '.join(JOBS)}")
+    try:
+        return name, parse_interval(interval)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"bad interval {interval!r}") from None
+
+
+@dataclass
+class Job:
+    name: str
+    flags: tuple[str, ...]
+    interval: float
+    next_run: float = 0.0
+    runs: int = 0
+    failures: int = 0
+    last: Optional[dict] = None
+
+    def schedule(self, now: float, rng: random.Random, jitter: float) -> None:
+        self.next_run = now + self.interval * (1 + rng.uniform(-jitter, jitter))
+
+    def status(self) -> dict:
+        return {
+            "interval": self.interval,
+            "next_run": round(self.next_run, 3),
+            "runs": self.runs,
+            "failures": self.failures,
+            "last": self.last,
+        }
+
+
+@dataclass
+class Daemon:
+    jobs: list[Job]
+    base_args: argparse.Namespace
+    jitter: float = DEFAULT_JITTER
+    status_file: Path = STATUS_FILE
+    seed: Optional[int] = None
+    started: float = field(default_factory=time.time)
+    stop: threading.Event = field(default_factory=threading.Event)
+
+    def __post_init__(self) -> None:
+        self.rng = random.Random(self.seed)
+        self._lock = threading.Lock()
+
+    def job_args(self, job: Job) -> argparse.Namespace:
+        args = copy(self.base_args)
+        args.all = False
+        for flag in update_content.STAGE_FLAGS:
+            setattr(args, flag, flag in job.flags)
+        return args
+
+    def run_job(self, job: Job) -> None:
+        print(f"[{time.strftime('%H:%M:%S')}] {job.name}: running")
+        metrics.reset()
+        started = time.time()
+        error = None
+        try:
+            update_content.run_stages(self.job_args(job))
+        except Exception as exc:
+            metrics.status = "failed"
+            error = f"{type(exc).__name__}: {exc}"
+            traceback.print_exc()
+        report_path = metrics.write(f"daemon-{job.name}", self.base_args.metrics_dir)
+        requests = sum(sum(stage.requests.values()) for stage in metrics.stages.values())
+        with self._lock:
+            job.runs += 1
+            job.failures += error is not None
+            job.last = {
+                "started": round(started, 3),
+                "seconds": round(time.time() - started, 3),
+                "status": metrics.status,
+                "error": error,
+                "requests": requests,
+                "report": str(report_path),
+            }
+            job.schedule(time.time(), self.rng, self.jitter)
+        print(f"  {job.name}: {job.last['status']} in {job.last['seconds']:.1f} s, {requests} requests")
+        self.write_status()
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "started": round(self.started, 3),
+                "pid": os.getpid(),
+                "jobs": {job.name: job.status() for job in self.jobs},
+            }
+
+    def write_status(self) -> None:
+        self.status_file.parent.mkdir(parents=True, exist_ok=True)
+        partial = self.status_file.with_suffix(".tmp")
+        partial.write_text(json.dumps(self.status(), indent=2), encoding="utf-8")
+        partial.replace(self.status_file)
+
+    def run(self, once: bool = False) -> None:
+        for job in self.jobs:
+            job.next_run = self.started
+        while not self.stop.is_set():
+            # Jobs keep their declared order when several are due together.
+            for job in self.jobs:
+                if self.stop.is_set():
+                    break
+                if job.next_run <= time.time():
+                    self.run_job(job)
+            if once:
+                return
+            self.stop.wait(max(0.0, min(job.next_run for job in self.jobs) - time.time()))
+
+
+def serve_status(daemon: Daemon, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve ``GET /status`` from a background thread."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] not in ("/", "/status"):
+                self.send_error(404)
+                return
+            body = json.dumps(daemon.status(), indent=2).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def parse_args(argv: Optional[list[str]] = None) -> tuple[argparse.Namespace, list[str]]:
+    parser = argparse.ArgumentParser(
+        description="Run update_content stages on a schedule, keeping caches warm between cycles.",
+        epilog="Other options are passed to update_content.py.",
+    )
+    parser.add_argument(
+        "--every",
+        type=parse_every,
+        action="append",
+        default=[],
+        metavar="JOB=INTERVAL",
+        help=f"Override a job interval, e.g. heroes=2h or build=15m; 0 disables (jobs: {', '.join(JOBS)})",
+    )
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        default=DEFAULT_JITTER,
+        help="Randomize each interval by up to this fraction",
+    )
+    parser.add_argument("--status-port", type=int, default=None, help="Serve job status at http://127.0.0.1:PORT/status")
+    parser.add_argument("--status-file", type=Path, default=STATUS_FILE, help="Where to write job status")
+    parser.add_argument("--once", action="store_true", help="Run every enabled job once and exit")
+    return parser.parse_known_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    args, rest = parse_args(argv)
+    intervals = {name: interval for name, (_flags, interval) in JOBS.items()}
+    intervals.update(args.every)
+    jobs = [Job(name, JOBS[name][0], intervals[name]) for name in JOBS if intervals[name] > 0]
+    if not jobs:
+        raise SystemExit("Every job is disabled")
+
+    base_args = update_content.parse_args(rest)
+    update_content.configure_http(base_args)
+    daemon = Daemon(jobs, base_args, jitter=args.jitter, status_file=args.status_file)
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: daemon.stop.set())
+    server = serve_status(daemon, args.status_port) if args.status_port else None
+    if server:
+        print(f"Status on http://127.0.0.1:{args.status_port}/status")
+    print("Jobs: " + ", ".join(f"{job.name} every {job.interval:g} s" for job in jobs))
+    try:
+        daemon.run(once=args.once)
+    finally:
+        if server:
+            server.shutdown()
+        daemon.write_status()
+    print(f"Stopped; status in {args.status_file}")
+
+
+if __name__ == "__main__":
+    main()
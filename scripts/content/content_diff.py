@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""Field-level diff of hero records and section-level diff of rag-content docs.
+
+A snapshot of the last build lives in ``.build/content-snapshot.json``: the
+hero records keyed by ``id`` plus one hash per doc section. ``diff_content()``
+compares the current tree against it and writes ``.build/changelog.json``::
+
+    {"heroes": {"added": [...], "removed": [...],
+                "changed": {"warlock": {"skills[Hex].description": {"old": ..., "new": ...}}}},
+     "docs": {"added": [...], "removed": [...],
+              "changed": {"heroes/warlock.md": {"added": [...], "removed": [...], "changed": [...]}}}}
+
+Whitespace differences are ignored, so reformatting a doc or re-indenting
+heroes.json produces an empty changelog.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+from pathlib import Path
+from typing import Any, Optional
+
+from chunk_content import BUILD_DIR, RAG_DIR, content_hash, iter_markdown_files, split_sections
+from hero_store import load_heroes
+
+SNAPSHOT_FILE = BUILD_DIR / "content-snapshot.json"
+CHANGELOG_FILE = BUILD_DIR / "changelog.json"
+
+WHITESPACE_RE = re.compile(r"\s+")
+# Keys that identify an item inside a list of records, in order of preference.
+ITEM_KEYS = ("id", "name", "title")
+# Per-file state keyed by (mtime, size); a file is re-read when either changes.
+_SECTION_CACHE: dict[Path, tuple[tuple[int, int], dict[str, str]]] = {}
+_SNAPSHOT_CACHE: dict[Path, tuple[tuple[int, int], dict]] = {}
+
+
+def _stat_key(path: Path) -> tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _squash(text: str) -> str:
+    return WHITESPACE_RE.sub(" ", text).strip()
+
+
+def _normalize_value(value: Any) -> Any:
+    if isinstance(value, str):
+        return _squash(value)
+    if isinstance(value, list):
+        return [_normalize_value(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _normalize_value(item) for key, item in value.items()}
+    return value
+
+
+def _item_key(items: list) -> Optional[str]:
+    """Return the field that uniquely names every dict in ``items``, if any."""
+    if not items or not all(isinstance(item, dict) for item in items):
+        return None
+    for key in ITEM_KEYS:
+        names = [item.get(key) for item in items]
+        if all(names) and len(set(map(str, names))) == len(names):
+            return key
+    return None
+
+
+def diff_values(old: Any, new: Any, path: str = "") -> dict[str, dict]:
+    """Return ``{field path: {"old", "new"}}`` for every leaf that differs."""
+    if old == new:
+        return {}
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes: dict[str, dict] = {}
+        for key in dict.fromkeys([*old, *new]):
+            child = f"{path}.{key}" if path else key
+            changes.update(diff_values(old.get(key), new.get(key), child))
+        return changes
+    if isinstance(old, list) and isinstance(new, list):
+        key = _item_key(old)
+        if key and key == _item_key(new):
+            old_items = {str(item[key]): item for item in old}
+            new_items = {str(item[key]): item for item in new}
+            changes = {}
+            for name in dict.fromkeys([*old_items, *new_items]):
+                changes.update(diff_values(old_items.get(name), new_items.get(name), f"{path}[{name}]"))
+            return changes
+    return {path: {"old": old, "new": new}}
+
+
+def diff_heroes(old: dict[str, dict], new: dict[str, dict]) -> dict:
+    changed = {}
+    for hero_id in sorted(set(old) & set(new)):
+        fields = diff_values(old[hero_id], new[hero_id])
+        if fields:
+            changed[hero_id] = fields
+    return {
+        "added": sorted(set(new) - set(old)),
+        "removed": sorted(set(old) - set(new)),
+        "changed": changed,
+    }
+
+
+def section_hashes(markdown: str) -> dict[str, str]:
+    """Hash each section's whitespace-normalized text, keyed by heading path."""
+    hashes: dict[str, str] = {}
+    for section in split_sections(markdown):
+        base = " > ".join(part for part in section.heading_path if part) or "(preamble)"
+        key = base
+        repeat = 1
+        while key in hashes:
+            repeat += 1
+            key = f"{base} #{repeat}"
+        hashes[key] = content_hash(_squash(section.body))
+    return hashes
+
+
+def diff_docs(old: dict[str, dict], new: dict[str, dict]) -> dict:
+    changed = {}
+    for source in sorted(set(old) & set(new)):
+        before, after = old[source], new[source]
+        if before == after:
+            continue
+        changed[source] = {
+            "added": [key for key in after if key not in before],
+            "removed": [key for key in before if key not in after],
+            "changed": [key for key in after if key in before and before[key] != after[key]],
+        }
+    return {
+        "added": sorted(set(new) - set(old)),
+        "removed": sorted(set(old) - set(new)),
+        "changed": changed,
+    }
+
+
+def _doc_hashes(path: Path) -> dict[str, str]:
+    key = _stat_key(path)
+    cached = _SECTION_CACHE.get(path)
+    if cached is None or cached[0] != key:
+        cached = key, section_hashes(path.read_text(encoding="utf-8"))
+        _SECTION_CACHE[path] = cached
+    return cached[1]
+
+
+def capture_snapshot(rag_dir: Path = RAG_DIR) -> dict:
+    heroes = {hero["id"]: _normalize_value(hero) for hero in load_heroes()}
+    docs = {path.relative_to(rag_dir).as_posix(): _doc_hashes(path) for path in iter_markdown_files(rag_dir)}
+    return {"heroes": heroes, "docs": docs}
+
+
+def load_snapshot(path: Path = SNAPSHOT_FILE) -> Optional[dict]:
+    if not path.exists():
+        return None
+    key = _stat_key(path)
+    cached = _SNAPSHOT_CACHE.get(path)
+    if cached is None or cached[0] != key:
+        cached = key, json.loads(path.read_text(encoding="utf-8"))
+        _SNAPSHOT_CACHE[path] = cached
+    return cached[1]
+
+
+def save_snapshot(snapshot: dict, path: Path = SNAPSHOT_FILE) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(snapshot, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    _SNAPSHOT_CACHE[path] = _stat_key(path), snapshot
+
+
+def docs_changed(changelog: dict) -> bool:
+    docs = changelog["docs"]
+    return bool(docs["added"] or docs["removed"] or docs["changed"])
+
+
+def diff_content(
+    snapshot: Optional[dict] = None,
+    previous: Optional[dict] = None,
+    output: Path = CHANGELOG_FILE,
+) -> dict:
+    """Diff the current tree against the saved snapshot and write the changelog.
+
+    With no saved snapshot everything is reported as added. The snapshot is not
+    updated here; call ``save_snapshot`` once downstream stages have succeeded.
+    """
+    snapshot = snapshot if snapshot is not None else capture_snapshot()
+    previous = previous if previous is not None else load_snapshot() or {"heroes": {}, "docs": {}}
+    changelog = {
+        "heroes": diff_heroes(previous["heroes"], snapshot["heroes"]),
+        "docs": diff_docs(previous["docs"], snapshot["docs"]),
+    }
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(changelog, indent=2, ensure_ascii=False), encoding="utf-8")
+    return changelog
+
+
+def summarize(changelog: dict) -> str:
+    heroes, docs = changelog["heroes"], changelog["docs"]
+    fields = sum(len(changes) for changes in heroes["changed"].values())
+    sections = sum(sum(len(parts) for parts in change.values()) for change in docs["changed"].values())
+    return (
+        f"heroes +{len(heroes['added'])} -{len(heroes['removed'])} ~{len(heroes['changed'])} ({fields} fields); "
+        f"docs +{len(docs['added'])} -{len(docs['removed'])} ~{len(docs['changed'])} ({sections} sections)"
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Diff hero data and rag-content against the last build.")
+    parser.add_argument("--save", action="store_true", help="Record the current tree as the new baseline")
+    parser.add_argument("--verbose", action="store_true", help="Print every changed hero field and doc section")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    snapshot = capture_snapshot()
+    changelog = diff_content(snapshot)
+    print(f"Changes since last build: {summarize(changelog)} -> {CHANGELOG_FILE}")
+    if args.verbose:
+        for hero_id, fields in changelog["heroes"]["changed"].items():
+            for field in fields:
+                print(f"  hero {hero_id}: {field}")
+        for source, parts in changelog["docs"]["changed"].items():
+            for kind, keys in parts.items():
+                for key in keys:
+                    print(f"  doc {source}: {kind} {key}")
+    if args.save:
+        save_snapshot(snapshot)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Append-only NDJSON journal of completed crawl items, fsynced in batches."""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from chunk_content import BUILD_DIR
+
+JOURNAL_DIR = BUILD_DIR / "journal"
+
+
+class CrawlJournal:
+    """Checkpoint log for one pipeline stage.
+
+    Each line is ``{"key": ..., "record": ...}``. A torn final line from a
+    crash is ignored on read, and a key written twice keeps its last record.
+    """
+
+    def __init__(self, stage: str, batch: int = 10, directory: Path = JOURNAL_DIR):
+        self.stage = stage
+        self.path = directory / f"{stage}.ndjson"
+        self.batch = batch
+        self._handle: Optional[Any] = None
+        self._pending = 0
+
+    def _scan(self) -> tuple[dict[str, Any], int]:
+        """Return the readable entries and the byte length they span."""
+        entries: dict[str, Any] = {}
+        valid = 0
+        if not self.path.exists():
+            return entries, valid
+        with self.path.open("rb") as handle:
+            for line in handle:
+                try:
+                    entry = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    break  # partial write at the tail
+                if not line.endswith(b"\n"):
+                    break
+                entries[entry["key"]] = entry["record"]
+                valid += len(line)
+        return entries, valid
+
+    def _read(self) -> dict[str, Any]:
+        return self._scan()[0]
+
+    def completed(self) -> set[str]:
+        return set(self._read())
+
+    def records(self) -> Iterator[Any]:
+        """Yield journaled records in completion order."""
+        yield from self._read().values()
+
+    def reset(self) -> None:
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+    def append(self, key: str, record: Any) -> None:
+        if self._handle is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.path.exists():
+                # Drop a torn tail so new lines are not appended after it.
+                os.truncate(self.path, self._scan()[1])
+            self._handle = self.path.open("a", encoding="utf-8")
+        self._handle.write(json.dumps({"key": key, "record": record}, ensure_ascii=False) + "\n")
+        self._pending += 1
+        if self._pending >= self.batch:
+            self.sync()
+
+    def sync(self) -> None:
+        if self._handle is None or not self._pending:
+            return
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        self._pending = 0
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self.sync()
+            self._handle.close()
+            self._handle = None
+
+    def __enter__(self) -> "CrawlJournal":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""Find near-duplicate chunks or paragraphs in rag-content with MinHash LSH."""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+from chunk_content import (
+    BUILD_DIR,
+    CHUNKS_FILE,
+    RAG_DIR,
+    count_tokens,
+    display_path,
+    iter_markdown_files,
+    load_chunks,
+)
+
+DEDUP_REPORT = BUILD_DIR / "dedup-report.json"
+DEDUP_CHUNKS_FILE = BUILD_DIR / "chunks.dedup.jsonl"
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+WORD_RE = re.compile(r"\w+")
+
+
+@dataclass
+class Unit:
+    id: str
+    source: str
+    heading_path: list[str]
+    text: str
+    tokens: int
+
+
+class MinHasher:
+    """MinHash signatures over word shingles using universal hash permutations."""
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = random.Random(seed)
+        self.permutations = [
+            (rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def shingles(self, text: str) -> set[int]:
+        words = WORD_RE.findall(text.lower())
+        size = min(self.shingle_size, len(words))
+        if size == 0:
+            return set()
+        return {
+            zlib.crc32(" ".join(words[i:i + size]).encode("utf-8"))
+            for i in range(len(words) - size + 1)
+        }
+
+    def signature(self, shingles: set[int]) -> tuple[int, ...]:
+        if not shingles:
+            return tuple([MAX_HASH] * self.num_perm)
+        return tuple(
+            min(((a * value + b) % MERSENNE_PRIME) & MAX_HASH for value in shingles)
+            for a, b in self.permutations
+        )
+
+
+def estimate_similarity(left: tuple[int, ...], right: tuple[int, ...]) -> float:
+    matches = sum(1 for a, b in zip(left, right) if a == b)
+    return matches / len(left)
+
+
+def lsh_candidates(signatures: list[tuple[int, ...]], bands: int) -> set[tuple[int, int]]:
+    """Bucket signature bands; units sharing any bucket become candidate pairs."""
+    rows = len(signatures[0]) // bands if signatures else 0
+    pairs: set[tuple[int, int]] = set()
+    for band in range(bands):
+        buckets: dict[tuple[int, ...], list[int]] = {}
+        start = band * rows
+        for index, signature in enumerate(signatures):
+            buckets.setdefault(signature[start:start + rows], []).append(index)
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            for i, left in enumerate(members):
+                for right in members[i + 1:]:
+                    pairs.add((left, right))
+    return pairs
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, left: int, right: int) -> None:
+        left, right = self.find(left), self.find(right)
+        if left != right:
+            self.parent[max(left, right)] = min(left, right)
+
+
+def load_units(mode: str, chunks_path: Path = CHUNKS_FILE, rag_dir: Path = RAG_DIR) -> list[Unit]:
+    if mode == "chunks":
+        return [
+            Unit(record["id"], record["source"], record["heading_path"], record["text"], record["tokens"])
+            for record in load_chunks(chunks_path)
+        ]
+
+    units = []
+    for path in iter_markdown_files(rag_dir):
+        source = path.relative_to(rag_dir).as_posix()
+        paragraphs = re.split(r"\n\s*\n", path.read_text(encoding="utf-8"))
+        for index, paragraph in enumerate(p.strip() for p in paragraphs):
+            if paragraph and not paragraph.startswith("#"):
+                units.append(Unit(f"{source}#p{index}", source, [], paragraph, count_tokens(paragraph)))
+    return units
+
+
+def find_duplicates(
+    units: list[Unit],
+    threshold: float = 0.8,
+    num_perm: int = 128,
+    bands: int = 16,
+    min_tokens: int = 12,
+) -> list[dict]:
+    """Cluster units whose estimated Jaccard similarity reaches ``threshold``."""
+    if num_perm % bands:
+        raise ValueError("num_perm must be divisible by bands")
+
+    candidates = [index for index, unit in enumerate(units) if unit.tokens >= min_tokens]
+    if not candidates:
+        return []
+
+    hasher = MinHasher(num_perm=num_perm)
+    signatures = [hasher.signature(hasher.shingles(units[index].text)) for index in candidates]
+
+    union = _UnionFind(len(candidates))
+    for left, right in lsh_candidates(signatures, bands):
+        if estimate_similarity(signatures[left], signatures[right]) >= threshold:
+            union.union(left, right)
+
+    groups: dict[int, list[int]] = {}
+    for position in range(len(candidates)):
+        groups.setdefault(union.find(position), []).append(position)
+
+    clusters = []
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        # Keep the most complete copy; ties go to the first in corpus order.
+        keep = max(members, key=lambda position: (units[candidates[position]].tokens, -position))
+        entries = []
+        for position in members:
+            unit = units[candidates[position]]
+            # Scored against the kept copy, which need not be a pair LSH compared.
+            score = 1.0 if position == keep else estimate_similarity(signatures[keep], signatures[position])
+            entries.append(
+                {
+                    "id": unit.id,
+                    "source": unit.source,
+                    "heading_path": unit.heading_path,
+                    "tokens": unit.tokens,
+                    "similarity": round(score, 3),
+                    "keep": position == keep,
+                }
+            )
+        clusters.append(
+            {
+                "keep": units[candidates[keep]].id,
+                "redundant_tokens": sum(entry["tokens"] for entry in entries if not entry["keep"]),
+                "members": entries,
+            }
+        )
+
+    clusters.sort(key=lambda cluster: cluster["redundant_tokens"], reverse=True)
+    return clusters
+
+
+def write_deduplicated_chunks(
+    clusters: Iterable[dict],
+    chunks_path: Path = CHUNKS_FILE,
+    output: Path = DEDUP_CHUNKS_FILE,
+) -> int:
+    drop = {member["id"] for cluster in clusters for member in cluster["members"] if not member["keep"]}
+    kept = 0
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w", encoding="utf-8") as handle:
+        for record in load_chunks(chunks_path):
+            if record["id"] in drop:
+                continue
+            handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+            kept += 1
+    return kept
+
+
+def run_dedup(
+    mode: str = "chunks",
+    threshold: float = 0.8,
+    emit: bool = False,
+    report_path: Path = DEDUP_REPORT,
+    output: Optional[Path] = None,
+) -> dict:
+    if emit and mode != "chunks":
+        raise ValueError("--emit requires --mode chunks")
+    units = load_units(mode)
+    clusters = find_duplicates(units, threshold=threshold)
+    redundant = sum(cluster["redundant_tokens"] for cluster in clusters)
+    report = {
+        "mode": mode,
+        "threshold": threshold,
+        "units": len(units),
+        "clusters": len(clusters),
+        "duplicate_units": sum(len(cluster["members"]) - 1 for cluster in clusters),
+        "redundant_tokens": redundant,
+        "total_tokens": sum(unit.tokens for unit in units),
+        "details": clusters,
+    }
+
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(
+        f"Found {report['clusters']} near-duplicate clusters over {report['units']} {mode} "
+        f"({redundant} of {report['total_tokens']} tokens redundant)"
+    )
+
+    if emit:
+        destination = output or DEDUP_CHUNKS_FILE
+        kept = write_deduplicated_chunks(clusters, output=destination)
+        print(f"  Wrote {kept} deduplicated chunks to {display_path(destination)}")
+    return report
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Detect near-duplicate rag-content with MinHash LSH.")
+    parser.add_argument("--mode", choices=["chunks", "paragraphs"], default="chunks", help="Units to compare")
+    parser.add_argument("--threshold", type=float, default=0.8, help="Minimum estimated Jaccard similarity")
+    parser.add_argument("--emit", action="store_true", help="Write chunks.dedup.jsonl without duplicates")
+    args = parser.parse_args()
+    if args.emit and args.mode != "chunks":
+        parser.error("--emit requires --mode chunks")
+    return args
+
+
+def main() -> None:
+    args = parse_args()
+    run_dedup(args.mode, args.threshold, emit=args.emit)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Score retrieval quality and latency for each index variant on labeled queries."""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Callable
+
+from chunk_content import BUILD_DIR, CHUNKS_FILE, display_path
+from dedup_content import DEDUP_CHUNKS_FILE
+from lexical_index import LexicalIndex, build_lexical_index
+from vector_index import VectorIndex, build_vector_index
+
+QUERIES_FILE = Path(__file__).resolve().parent / "eval" / "queries.json"
+EVAL_DIR = BUILD_DIR / "eval"
+EVAL_REPORT = BUILD_DIR / "eval-report.json"
+CUTOFFS = (1, 3, 5, 10)
+
+# A searcher maps (query, k) to ranked source paths.
+Searcher = Callable[[str, int], list[str]]
+
+
+def _lexical(chunks: Path, workdir: Path) -> Searcher:
+    path = workdir / "lexical.idx"
+    build_lexical_index(chunks, path)
+    index = LexicalIndex(path)
+    return lambda query, k: [hit.record["source"] for hit in index.search(query, k)]
+
+
+def _vector(mode: str) -> Callable[[Path, Path], Searcher]:
+    def factory(chunks: Path, workdir: Path) -> Searcher:
+        build_vector_index(chunks, workdir, force_refit=True)
+        index = VectorIndex(workdir)
+        return lambda query, k: [hit.source for hit in index.search(query, k, mode)]
+
+    return factory
+
+
+# name -> (chunk file, index factory)
+VARIANTS: dict[str, tuple[Path, Callable[[Path, Path], Searcher]]] = {
+    "lexical": (DEDUP_CHUNKS_FILE, _lexical),
+    "lexical-raw": (CHUNKS_FILE, _lexical),
+    "tfidf": (DEDUP_CHUNKS_FILE, _vector("tfidf")),
+    "lsa": (DEDUP_CHUNKS_FILE, _vector("lsa")),
+}
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    position = min(len(ordered) - 1, max(0, round(percent / 100 * (len(ordered) - 1))))
+    return ordered[position]
+
+
+def _unique(sources: list[str]) -> list[str]:
+    seen: set[str] = set()
+    return [source for source in sources if not (source in seen or seen.add(source))]
+
+
+def evaluate_variant(name: str, queries: list[dict], repeat: int, depth: int) -> dict:
+    chunks, factory = VARIANTS[name]
+    if not chunks.exists():
+        chunks = CHUNKS_FILE
+    workdir = EVAL_DIR / name
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    started = time.perf_counter()
+    search = factory(chunks, workdir)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    latencies: list[float] = []
+    recall = {k: [] for k in CUTOFFS}
+    reciprocal_ranks: list[float] = []
+    per_query = []
+
+    for item in queries:
+        relevant = set(item["relevant"])
+        ranked: list[str] = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            ranked = search(item["query"], depth)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+        sources = _unique(ranked)
+        first = next((rank for rank, source in enumerate(sources, start=1) if source in relevant), None)
+        reciprocal_ranks.append(1 / first if first else 0.0)
+        for k in CUTOFFS:
+            recall[k].append(len(relevant.intersection(sources[:k])) / len(relevant))
+        per_query.append({"query": item["query"], "first_relevant_rank": first, "top": sources[:3]})
+
+    return {
+        "chunks": display_path(chunks),
+        "build_ms": round(build_ms, 2),
+        "mrr": round(statistics.fmean(reciprocal_ranks), 4),
+        "recall": {f"@{k}": round(statistics.fmean(values), 4) for k, values in recall.items()},
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50), 3),
+            "p95": round(_percentile(latencies, 95), 3),
+        },
+        "queries": per_query,
+    }
+
+
+def run_evaluation(
+    variants: list[str],
+    queries_path: Path = QUERIES_FILE,
+    output: Path = EVAL_REPORT,
+    repeat: int = 5,
+) -> dict:
+    queries = json.loads(queries_path.read_text(encoding="utf-8"))
+    depth = max(CUTOFFS) * 3  # chunks, collapsed to unique sources afterwards
+    report = {
+        "queries": len(queries),
+        "variants": {name: evaluate_variant(name, queries, repeat, depth) for name in variants},
+    }
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+    print(f"\n{'variant':<12} {'MRR':>6} {'R@1':>6} {'R@5':>6} {'R@10':>6} {'p50 ms':>8} {'p95 ms':>8} {'build ms':>9}")
+    for name, result in report["variants"].items():
+        print(
+            f"{name:<12} {result['mrr']:>6.3f} {result['recall']['@1']:>6.3f} {result['recall']['@5']:>6.3f} "
+            f"{result['recall']['@10']:>6.3f} {result['latency_ms']['p50']:>8.3f} "
+            f"{result['latency_ms']['p95']:>8.3f} {result['build_ms']:>9.1f}"
+        )
+    print(f"Report written to {display_path(output)}")
+    return report
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Evaluate rag-content retrieval quality and latency.")
+    parser.add_argument(
+        "--variants",
+        default=",".join(VARIANTS),
+        help=f"Comma-separated index variants ({', '.join(VARIANTS)})",
+    )
+    parser.add_argument("--queries", type=Path, default=QUERIES_FILE, help="Labeled query file")
+    parser.add_argument("--output", type=Path, default=EVAL_REPORT, help="JSON report path")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per query")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    variants = [name.strip() for name in args.variants.split(",") if name.strip()]
+    unknown = [name for name in variants if name not in VARIANTS]
+    if unknown:
+        raise SystemExit(f"Unknown variants: {', '.join(unknown)}")
+    run_evaluation(variants, args.queries, args.output.resolve(), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
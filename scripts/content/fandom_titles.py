@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""Resolve local hero slugs to canonical Fandom article titles.
+
+The index lists every main-namespace article on the wiki and every redirect,
+read from the MediaWiki API (``list=allpages`` and the redirect table). It is
+cached in ``.build/fandom-titles.json`` and rebuilt once it is older than
+``TITLE_TTL``::
+
+    {"built": 1718000000.0, "titles": ["Adjudicator", ...],
+     "redirects": {"Adjudicater": "Adjudicator", ...}, "reported": ["some-slug"]}
+
+``TitleIndex.resolve(slug)`` tries, in order: an exact normalized match on an
+article title (case, punctuation and apostrophes ignored), the same on a
+redirect, then the closest normalized title or redirect with the same numbers
+(``FUZZY_CUTOFF``). A slug that resolves to nothing gets no article request;
+``report_unresolved`` prints it on the first run that finds it and only counts
+it afterwards, across index refreshes too.
+"""
+from __future__ import annotations
+
+import argparse
+import difflib
+import json
+import re
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Callable, Optional
+from urllib.parse import urlencode
+
+from chunk_content import BUILD_DIR
+
+FANDOM_API = "https://topheroes1.fandom.com/api.php"
+TITLE_INDEX_FILE = BUILD_DIR / "fandom-titles.json"
+TITLE_TTL = 24 * 3600
+FUZZY_CUTOFF = 0.88
+MAX_API_PAGES = 50
+# Loaded index by file, reused until the file's mtime changes.
+_LOADED: dict[Path, tuple[int, "TitleIndex"]] = {}
+
+
+def normalize_title(text: str) -> str:
+    """``"Beast-Master's_Call"`` -> ``"beast masters call"``."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = re.sub(r"['’`]", "", text.lower())
+    return re.sub(r"[\W_]+", " ", text).strip()
+
+
+def _api_query(get_json: Callable[[str], Any], params: dict) -> list[dict]:
+    """Follow ``continue`` tokens; returns each response's ``query`` object.
+
+    Raises ``ValueError`` on an API error or a response without a ``query``.
+    """
+    queries = []
+    extra: dict = {}
+    for _ in range(MAX_API_PAGES):
+        data = get_json(f"{FANDOM_API}?{urlencode({**params, **extra, 'format': 'json'})}")
+        if "error" in data:
+            error = data["error"]
+            raise ValueError(f"Fandom API error: {error.get('code')}: {error.get('info')}")
+        if "query" not in data:
+            raise ValueError("Fandom API response has no query")
+        queries.append(data["query"])
+        if "continue" not in data:
+            break
+        extra = data["continue"]
+    return queries
+
+
+class TitleIndex:
+    def __init__(self, titles: list[str], redirects: dict[str, str], built: float,
+                 reported: Optional[set[str]] = None, path: Path = TITLE_INDEX_FILE) -> None:
+        self.titles = titles
+        self.redirects = redirects
+        self.built = built
+        self.reported = reported or set()
+        self.path = path
+        self.keys: dict[str, str] = {}
+        for source, target in redirects.items():
+            self.keys.setdefault(normalize_title(source), target)
+        # Articles win over redirects with the same normalized name.
+        self.keys.update((normalize_title(title), title) for title in titles)
+        self._resolved: dict[str, Optional[str]] = {}
+
+    @classmethod
+    def build(cls, get_json: Callable[[str], Any], path: Path = TITLE_INDEX_FILE) -> "TitleIndex":
+        titles = [
+            page["title"]
+            for query in _api_query(
+                get_json,
+                {"action": "query", "list": "allpages", "apnamespace": 0,
+                 "apfilterredir": "nonredirects", "aplimit": "max"},
+            )
+            for page in query.get("allpages", [])
+        ]
+        redirects = {
+            redirect["from"]: redirect["to"]
+            for query in _api_query(
+                get_json,
+                {"action": "query", "generator": "allpages", "gapnamespace": 0,
+                 "gapfilterredir": "redirects", "gaplimit": "max", "redirects": 1},
+            )
+            for redirect in query.get("redirects", [])
+        }
+        if not titles:
+            # Never cache an empty index: it would disable Fandom until it expires.
+            raise ValueError("Fandom API listed no articles")
+        return cls(titles, redirects, time.time(), path=path)
+
+    @classmethod
+    def load(cls, path: Path = TITLE_INDEX_FILE) -> Optional["TitleIndex"]:
+        if not path.exists():
+            return None
+        mtime = path.stat().st_mtime_ns
+        loaded = _LOADED.get(path)
+        if loaded is not None and loaded[0] == mtime:
+            return loaded[1]
+        data = json.loads(path.read_text(encoding="utf-8"))
+        index = cls(data["titles"], data["redirects"], data["built"], set(data.get("reported", [])), path)
+        _LOADED[path] = (mtime, index)
+        return index
+
+    @classmethod
+    def cached(cls, get_json: Callable[[str], Any], ttl: float = TITLE_TTL, refresh: bool = False,
+               path: Path = TITLE_INDEX_FILE) -> "TitleIndex":
+        """The cached index if it is younger than ``ttl``, else a fresh one (saved).
+
+        Raises ``ValueError`` when the API returns an error or no articles.
+        """
+        previous = cls.load(path)
+        fresh = previous is not None and previous.titles and time.time() - previous.built < ttl
+        if fresh and not refresh:
+            return previous
+        index = cls.build(get_json, path)
+        if previous is not None:
+            index.reported = previous.reported
+        index.save()
+        return index
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "built": self.built,
+            "titles": self.titles,
+            "redirects": self.redirects,
+            "reported": sorted(self.reported),
+        }
+        self.path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        _LOADED[self.path] = (self.path.stat().st_mtime_ns, self)
+
+    def resolve(self, slug: str) -> Optional[str]:
+        """Canonical article title for a local slug or name, or None."""
+        if slug not in self._resolved:
+            key = normalize_title(slug)
+            title = self.keys.get(key)
+            if title is None and key:
+                # Numbers must agree: "altar marshal" is not "altar marshal 2".
+                numbers = re.findall(r"\d+", key)
+                candidates = [other for other in self.keys if re.findall(r"\d+", other) == numbers]
+                close = difflib.get_close_matches(key, candidates, n=1, cutoff=FUZZY_CUTOFF)
+                title = self.keys[close[0]] if close else None
+            # A redirect may point at another redirect.
+            seen = set()
+            while title in self.redirects and title not in seen:
+                seen.add(title)
+                title = self.redirects[title]
+            self._resolved[slug] = title
+        return self._resolved[slug]
+
+    def report_unresolved(self, slugs: list[str]) -> None:
+        """Print slugs not reported by an earlier run; count the rest."""
+        new = [slug for slug in slugs if slug not in self.reported]
+        for slug in new:
+            print(f"  No Fandom article for {slug}")
+        if len(new) < len(slugs):
+            print(f"  {len(slugs) - len(new)} heroes without a Fandom article (reported earlier)")
+        if new:
+            self.reported.update(new)
+            self.save()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build the Fandom title index and resolve hero slugs.")
+    parser.add_argument("slugs", nargs="*", help="Slugs or names to resolve")
+    parser.add_argument("--refresh", action="store_true", help="Rebuild the index even if it is fresh")
+    return parser.parse_args()
+
+
+def main() -> None:
+    import requests
+
+    args = parse_args()
+    index = TitleIndex.cached(lambda url: requests.get(url, timeout=20).json(), refresh=args.refresh)
+    age = (time.time() - index.built) / 3600
+    print(f"{len(index.titles)} articles, {len(index.redirects)} redirects (built {age:.1f} h ago)")
+    for slug in args.slugs:
+        print(f"  {slug} -> {index.resolve(slug)}")
+
+
+if __name__ == "__main__":
+    main()
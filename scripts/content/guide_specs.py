@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""Declarative extraction of guide pages into rag-content markdown.
+
+``guide_specs.json`` lists guide pages and, for each, the sections to pull
+out. A section is found by its anchor and rendered by walking the anchor's
+following siblings::
+
+    {"title": "Faction Meta Guides",            # "# title" heading of the output
+     "output": "meta/faction-meta.md",          # relative to rag-content/
+     "anchor": {"tags": ["h2"], "text": "Faction Meta Guides"},
+     "intro": "optional paragraph after the title",
+     "walk": {"until": ["h2"], "only": "div", "limit": 10, "first_match": false},
+     "rules": {"p": "paragraph", "h3": {"heading": 2}, "div": {"cards": ["h3", "h4"]}},
+     "fallback": {"table_contains": ["Hero", "Trait"]}}
+
+An anchor matches a tag in ``tags`` whose text contains ``text``; without
+``tags`` it matches the tag that directly holds a text node containing
+``text`` (what ``soup.find(string=...)`` finds, anchored on its parent). ``walk``
+stops at an ``until`` tag, considers only ``only`` tags, visits at most
+``limit`` siblings and, with ``first_match``, stops at the first sibling
+that produced output. Rules map a tag name to an action:
+
+    "paragraph"                     the element's text, if any
+    {"heading": N}                  the text as a level-N heading
+    {"cards": [tags], ...}          "## card title" plus the card's paragraph for
+                                    each heading inside; "parent_fallback" takes the
+                                    paragraph from the card's parent, and
+                                    "min_text_length" keeps the element's own text
+                                    when it has no card headings
+    "table"                         the element (or the first table in it) as a
+                                    markdown table
+
+``compile_specs`` validates the file once. ``extract_sections`` finds every
+section's anchor in one pass over the page, so adding a section adds no
+extra document scans. ``fallback.table_contains`` picks the first table on
+the page whose text has every listed word when the walk finds none.
+Output goes through ``markdown_emitter.MarkdownWriter``.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from bs4 import BeautifulSoup, NavigableString
+
+from markdown_emitter import MarkdownWriter
+from tracing import traced
+
+GUIDE_SPECS_FILE = Path(__file__).resolve().parent / "guide_specs.json"
+ACTIONS = ("paragraph", "heading", "cards", "table")
+
+Rule = tuple[str, dict]
+
+
+def clean_text(text: Optional[str]) -> str:
+    if not text:
+        return ""
+    return text.strip().replace('"', "'").replace("\n", " ")
+
+
+# eq=False keeps identity hashing, so specs can key the result dict.
+@dataclass(frozen=True, eq=False)
+class SectionSpec:
+    title: str
+    output: str
+    anchor_text: str
+    anchor_tags: frozenset[str] = frozenset()
+    intro: Optional[str] = None
+    until: frozenset[str] = frozenset()
+    only: Optional[str] = None
+    limit: Optional[int] = None
+    first_match: bool = False
+    rules: dict[str, Rule] = field(default_factory=dict)
+    fallback_table: tuple[str, ...] = ()
+
+    def anchors(self, tag: Any) -> bool:
+        if self.anchor_tags:
+            return tag.name in self.anchor_tags and self.anchor_text in tag.get_text()
+        # Direct text children only: an icon next to the text must not hide it, and
+        # a wrapper around the heading must not become the anchor.
+        return any(isinstance(child, NavigableString) and self.anchor_text in child for child in tag.children)
+
+
+@dataclass(frozen=True)
+class GuidePage:
+    url: str
+    sections: tuple[SectionSpec, ...]
+
+
+def _compile_rule(tag: str, rule: Union[str, dict]) -> Rule:
+    if isinstance(rule, str):
+        action, options = rule, {}
+    else:
+        actions = [key for key in rule if key in ACTIONS]
+        if len(actions) != 1:
+            raise ValueError(f"Rule for <{tag}> needs exactly one of {', '.join(ACTIONS)}: {rule}")
+        action, options = actions[0], dict(rule)
+    if action not in ACTIONS:
+        raise ValueError(f"Unknown action for <{tag}>: {action}")
+    return action, options
+
+
+def compile_specs(data: dict) -> tuple[GuidePage, ...]:
+    pages = []
+    for page in data["pages"]:
+        sections = []
+        for section in page["sections"]:
+            anchor = section["anchor"]
+            walk = section.get("walk", {})
+            sections.append(
+                SectionSpec(
+                    title=section["title"],
+                    output=section["output"],
+                    anchor_text=anchor["text"],
+                    anchor_tags=frozenset(anchor.get("tags", ())),
+                    intro=section.get("intro"),
+                    until=frozenset(walk.get("until", ())),
+                    only=walk.get("only"),
+                    limit=walk.get("limit"),
+                    first_match=walk.get("first_match", False),
+                    rules={tag: _compile_rule(tag, rule) for tag, rule in section["rules"].items()},
+                    fallback_table=tuple(section.get("fallback", {}).get("table_contains", ())),
+                )
+            )
+        pages.append(GuidePage(url=page["url"], sections=tuple(sections)))
+    return tuple(pages)
+
+
+def load_guide_specs(path: Path = GUIDE_SPECS_FILE) -> tuple[GuidePage, ...]:
+    return compile_specs(json.loads(path.read_text(encoding="utf-8")))
+
+
+def _table(element: Any, out: MarkdownWriter) -> bool:
+    table = element if element.name == "table" else element.find("table")
+    if table is None:
+        return False
+    rows = table.find_all("tr")
+    if rows:
+        headers = [clean_text(cell.get_text()) for cell in rows[0].find_all(["th", "td"])]
+        out.table(headers, ([clean_text(cell.get_text()) for cell in row.find_all("td")] for row in rows[1:]))
+    return True
+
+
+def _cards(element: Any, options: dict, out: MarkdownWriter) -> bool:
+    headers = element.find_all(options["cards"])
+    if not headers:
+        minimum = options.get("min_text_length")
+        text = clean_text(element.get_text()) if minimum is not None else ""
+        if not text or len(text) < minimum:
+            return False
+        return out.paragraph(text)
+
+    level = options.get("card_heading", 2)
+    for header in headers:
+        out.heading(clean_text(header.get_text()), level)
+        paragraph = header.find_next_sibling("p")
+        if paragraph is None and options.get("parent_fallback"):
+            paragraph = header.parent.find("p")
+        if paragraph is not None:
+            out.paragraph(clean_text(paragraph.get_text()))
+    return True
+
+
+def apply_rule(rule: Rule, element: Any, out: MarkdownWriter) -> bool:
+    """Render one sibling into ``out``; False means the rule found nothing to render."""
+    action, options = rule
+    if action == "paragraph":
+        return out.paragraph(clean_text(element.get_text()))
+    if action == "heading":
+        out.heading(clean_text(element.get_text()), options["heading"])
+        return True
+    if action == "cards":
+        return _cards(element, options, out)
+    return _table(element, out)
+
+
+def render_section(spec: SectionSpec, anchor: Any, tables: list) -> str:
+    out = MarkdownWriter()
+    out.heading(spec.title)
+    if spec.intro:
+        out.paragraph(spec.intro)
+
+    matched = False
+    visited = 0
+    sibling = anchor.find_next_sibling()
+    while sibling is not None and sibling.name not in spec.until:
+        if spec.only is None or sibling.name == spec.only:
+            if spec.limit is not None and visited >= spec.limit:
+                break
+            visited += 1
+            rule = spec.rules.get(sibling.name)
+            if rule and apply_rule(rule, sibling, out):
+                matched = True
+                if spec.first_match:
+                    break
+        sibling = sibling.find_next_sibling()
+
+    if not matched and spec.fallback_table:
+        for table in tables:
+            text = table.get_text()
+            if all(word in text for word in spec.fallback_table):
+                _table(table, out)
+                break
+    return out.getvalue()
+
+
+@traced("parse")
+def extract_sections(page: GuidePage, soup: BeautifulSoup) -> dict[SectionSpec, Optional[str]]:
+    """Render every section of ``page``; a section whose anchor is missing maps to None."""
+    anchors: dict[SectionSpec, Any] = {}
+    pending = list(page.sections)
+    wants_tables = any(spec.fallback_table for spec in page.sections)
+    tables = []
+    for tag in soup.find_all(True):
+        if wants_tables and tag.name == "table":
+            tables.append(tag)
+        for spec in pending:
+            if spec.anchors(tag):
+                anchors[spec] = tag
+                pending.remove(spec)
+                break
+        if not pending and not wants_tables:
+            break
+    return {
+        spec: render_section(spec, anchors[spec], tables) if spec in anchors else None
+        for spec in page.sections
+    }
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""Join hero records, heroDetailData.json and rag-content/heroes into per-hero context bundles."""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+from pathlib import Path
+from typing import Optional
+
+from chunk_content import BUILD_DIR, PROJECT_ROOT, RAG_DIR, content_hash, count_tokens, display_path, split_sections
+from hero_store import load_heroes
+
+HERO_DETAIL_JSON = PROJECT_ROOT / "src" / "data" / "heroDetailData.json"
+HERO_RAG_DIR = RAG_DIR / "heroes"
+BUNDLE_DIR = BUILD_DIR / "bundles"
+
+# Overview bullets that only restate structured fields already in the bundle.
+REDUNDANT_FIELD_RE = re.compile(
+    r"^\s*-\s*\*\*(Faction|Rarity|Role|Position|Unique Weapon|Recommended Gear)\*\*:",
+    re.IGNORECASE,
+)
+EMPTY_SKILL_RE = re.compile(r"^\*\*Type:\*\*\s*$")
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\W+", " ", text.lower()).strip()
+
+
+def _load_json(path: Path, default):
+    if not path.exists():
+        return default
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def markdown_sections(markdown: str, known_text: set[str]) -> list[dict]:
+    """Keep markdown sections that add information, dropping repeats and stubs."""
+    sections = []
+    seen = set(known_text)
+    for section in split_sections(markdown):
+        if len(section.heading_path) < 2:
+            continue  # the title section only repeats the hero name
+        path = [re.sub(r"\[\]$", "", part).strip() for part in section.heading_path[1:]]
+        if not path[-1]:
+            continue
+
+        paragraphs = []
+        for paragraph in re.split(r"\n\s*\n", section.body):
+            lines = [
+                line
+                for line in paragraph.strip().splitlines()
+                if not REDUNDANT_FIELD_RE.match(line) and not EMPTY_SKILL_RE.match(line)
+            ]
+            text = "\n".join(lines).strip()
+            key = _normalize(text)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            paragraphs.append(text)
+
+        if paragraphs:
+            sections.append({"path": path, "text": "\n\n".join(paragraphs)})
+    return sections
+
+
+def render_context(hero: dict, detail: dict, sections: list[dict]) -> str:
+    lines = [f"# {hero.get('name') or detail.get('name') or hero['id']}"]
+    summary = [hero.get(field) for field in ("faction", "rarity", "role") if hero.get(field)]
+    tier = detail.get("tier") or {}
+    if tier:
+        summary.append("Tier " + ", ".join(f"{mode} {grade}" for mode, grade in tier.items()))
+    if summary:
+        lines.append(" | ".join(summary))
+
+    build = []
+    if hero.get("gear_set") not in (None, "", "None"):
+        build.append(f"Gear: {hero['gear_set']}")
+    if hero.get("unique_weapon") not in (None, "", "None"):
+        build.append(f"Weapon: {hero['unique_weapon']}")
+    if hero.get("positions"):
+        build.append("Positions: " + "/".join(hero["positions"]))
+    best_with = detail.get("best_with") or {}
+    if best_with.get("pet"):
+        build.append(f"Pet: {best_with['pet']}")
+    if best_with.get("relics"):
+        build.append("Relics: " + ", ".join(best_with["relics"]))
+    if build:
+        lines.append("; ".join(build))
+
+    for label, key in (("Synergies", "synergies"), ("Counters", "counters"), ("Weak against", "weak_against")):
+        if detail.get(key):
+            lines.append(f"{label}: " + ", ".join(detail[key]))
+    if detail.get("positioning"):
+        lines.append(f"Positioning: {detail['positioning']}")
+
+    skills = [skill for skill in hero.get("skills", []) if skill.get("name") and skill.get("type") != "Unknown"]
+    if skills:
+        lines.append("Skills:")
+        for skill in skills:
+            text = "; ".join(part for part in (skill.get("description"), skill.get("tips")) if part)
+            lines.append(f"- {skill['name']} ({skill.get('type', 'Passive')})" + (f": {text}" if text else ""))
+
+    for section in sections:
+        lines.append("")
+        lines.append(f"## {' > '.join(section['path'])}")
+        lines.append(section["text"])
+    return "\n".join(lines).strip() + "\n"
+
+
+def build_bundle(hero_id: str, hero: dict, detail: dict, markdown: str) -> dict:
+    known = {_normalize(skill.get("description", "")) for skill in hero.get("skills", [])}
+    known.discard("")
+    sections = markdown_sections(markdown, known) if markdown else []
+    context = render_context(dict(hero, id=hero_id), detail, sections)
+    return {
+        "id": hero_id,
+        "game_id": hero.get("game_id", hero_id.replace("-", "")),
+        "name": hero.get("name", hero_id.replace("-", " ").title()),
+        "sources": {
+            "heroes_json": bool(hero),
+            "detail": bool(detail),
+            "markdown": f"heroes/{hero_id}.md" if markdown else None,
+        },
+        "tokens": count_tokens(context),
+        "context": context,
+    }
+
+
+def build_hero_bundles(force: bool = False, output_dir: Path = BUNDLE_DIR) -> dict:
+    """Rebuild bundles whose heroes.json entry, detail entry or markdown changed."""
+    heroes = {hero["id"]: hero for hero in load_heroes()}
+    details = _load_json(HERO_DETAIL_JSON, {})
+    markdown_files = {path.stem: path for path in HERO_RAG_DIR.glob("*.md")} if HERO_RAG_DIR.exists() else {}
+    by_game_id = {hero.get("game_id"): hero_id for hero_id, hero in heroes.items()}
+
+    def resolve(key: str) -> str:
+        return key if key in heroes else by_game_id.get(key.replace("-", ""), key)
+
+    details = {resolve(key): detail for key, detail in details.items()}
+    markdown_files = {resolve(key): path for key, path in markdown_files.items()}
+    hero_ids = set(heroes) | set(details) | set(markdown_files)
+    manifest_path = output_dir / "manifest.json"
+    manifest = {} if force else _load_json(manifest_path, {})
+    new_manifest: dict[str, dict] = {}
+    stats = {"bundles": 0, "rebuilt": 0, "unchanged": 0, "removed": 0, "tokens": 0}
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    for hero_id in sorted(hero_ids):
+        hero = heroes.get(hero_id, {})
+        detail = details.get(hero_id, {})
+        md_path = markdown_files.get(hero_id)
+        markdown = md_path.read_text(encoding="utf-8") if md_path else ""
+
+        inputs = {
+            "heroes_json": content_hash(json.dumps(hero, sort_keys=True)),
+            "detail": content_hash(json.dumps(detail, sort_keys=True)),
+            "markdown": content_hash(markdown),
+        }
+        bundle_path = output_dir / f"{hero_id}.json"
+        previous = manifest.get(hero_id)
+        if previous and previous.get("inputs") == inputs and bundle_path.exists():
+            new_manifest[hero_id] = previous
+            stats["unchanged"] += 1
+        else:
+            bundle = build_bundle(hero_id, hero, detail, markdown)
+            bundle_path.write_text(json.dumps(bundle, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+            new_manifest[hero_id] = {"inputs": inputs, "tokens": bundle["tokens"]}
+            stats["rebuilt"] += 1
+        stats["tokens"] += new_manifest[hero_id]["tokens"]
+
+    # Read the directory rather than the old manifest, which --force ignores.
+    for path in output_dir.glob("*.json"):
+        if path != manifest_path and path.stem not in new_manifest:
+            path.unlink()
+            stats["removed"] += 1
+
+    stats["bundles"] = len(new_manifest)
+    manifest_path.write_text(json.dumps(new_manifest, indent=2, sort_keys=True), encoding="utf-8")
+    print(
+        f"Hero bundles: {stats['bundles']} total ({stats['rebuilt']} rebuilt, {stats['unchanged']} unchanged, "
+        f"{stats['removed']} removed), {stats['tokens']} tokens -> {display_path(output_dir)}"
+    )
+    return stats
+
+
+def load_bundle(hero_id: str, bundle_dir: Path = BUNDLE_DIR) -> Optional[dict]:
+    path = bundle_dir / f"{hero_id}.json"
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else None
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build precomputed per-hero context bundles.")
+    parser.add_argument("--force", action="store_true", help="Rebuild every bundle")
+    parser.add_argument("--show", metavar="HERO_ID", help="Print one bundle's context after building")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    build_hero_bundles(force=args.force)
+    if args.show:
+        bundle = load_bundle(args.show)
+        print(bundle["context"] if bundle else f"No bundle for {args.show}")
+
+
+if __name__ == "__main__":
+    main()
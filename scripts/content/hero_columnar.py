@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""Columnar, string-interned encoding for hero records, with a decoder and benchmark.
+
+Every string value goes into one table ordered by frequency, so common values
+like ``"Nature"`` or ``"Passive"`` become small integers. Each field is then
+stored as one column::
+
+    {"format": "th-columnar/2", "count": 50, "strings": [...],
+     "schema": [{"name": "faction", "kind": "str"}, ...],
+     "columns": {"faction": [3, 3, 7, ...],
+                 "positions": {"offsets": [0, 2, ...], "values": [1, 4, ...]},
+                 "skills": {"offsets": [0, 6, ...], "columns": {"name": [...], ...}}}}
+
+Nested lists of records (skills) are flattened into one table indexed by
+offsets, so decoding never has to rebuild repeated keys from text.
+
+A field that some rows lack gets a bitmap in ``"present"`` (hex, bit *i* set
+when row *i* has the key), and a list field holding ``None`` in some rows gets
+one in ``"null"``, so a missing key, ``None`` and ``[]`` decode back as they
+were. Nested tables carry their own ``"present"``/``"null"`` maps.
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import statistics
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+from hero_store import HERO_DATA_DIR, load_heroes
+
+FORMAT = "th-columnar/2"
+COLUMNAR_FILE = HERO_DATA_DIR / "heroes.columnar.json"
+NULL = -1
+
+# Records whose keys differ: a missing key, None, "" and [] must all survive.
+RAGGED_SAMPLE = [
+    {
+        "id": "a",
+        "name": "A",
+        "positions": ["front"],
+        "skills": [{"name": "Slash", "tips": ""}, {"name": "Guard", "cooldown": None}],
+    },
+    {"id": "b", "positions": None, "skills": [], "notes": ""},
+    {"id": "c", "name": None, "skills": None, "positions": []},
+    {"id": "d", "power": 120},
+]
+
+
+def _kind(values: list[Any]) -> str:
+    present = [value for value in values if value is not None]
+    if all(isinstance(value, str) for value in present):
+        return "str"
+    if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in present):
+        return "num"
+    if all(isinstance(value, list) and all(isinstance(item, str) for item in value) for value in present):
+        return "str_list"
+    if all(isinstance(value, list) and all(isinstance(item, dict) for item in value) for value in present):
+        return "table"
+    return "json"
+
+
+def _schema(rows: list[dict]) -> list[dict]:
+    names = list(dict.fromkeys(key for row in rows for key in row))
+    schema = []
+    for name in names:
+        values = [row.get(name) for row in rows]
+        field = {"name": name, "kind": _kind(values)}
+        if field["kind"] == "table":
+            field["fields"] = _schema([item for value in values if value for item in value])
+        schema.append(field)
+    return schema
+
+
+def _collect_strings(rows: list[dict], schema: list[dict], counts: Counter) -> None:
+    for field in schema:
+        name, kind = field["name"], field["kind"]
+        for row in rows:
+            value = row.get(name)
+            if value is None:
+                continue
+            if kind == "str":
+                counts[value] += 1
+            elif kind == "str_list":
+                counts.update(value)
+        if kind == "table":
+            _collect_strings([item for row in rows for item in row.get(name) or []], field["fields"], counts)
+
+
+def _bitmap(flags: list[bool]) -> str:
+    return format(sum(1 << position for position, flag in enumerate(flags) if flag), "x")
+
+
+def _bits(bitmaps: dict[str, str], name: str, count: int) -> list[bool]:
+    """The flags of ``name``'s bitmap; all set when the field has none."""
+    if name not in bitmaps:
+        return [True] * count
+    bits = int(bitmaps[name], 16)
+    return [bool(bits >> position & 1) for position in range(count)]
+
+
+def _encode_columns(rows: list[dict], schema: list[dict], lookup: dict[str, int]) -> tuple[dict, dict, dict]:
+    """Return the columns plus the ``present`` and ``null`` bitmaps of ``rows``."""
+    columns: dict[str, Any] = {}
+    present: dict[str, str] = {}
+    null: dict[str, str] = {}
+    for field in schema:
+        name, kind = field["name"], field["kind"]
+        values = [row.get(name) for row in rows]
+        if not all(name in row for row in rows):
+            present[name] = _bitmap([name in row for row in rows])
+        if kind == "str":
+            columns[name] = [NULL if value is None else lookup[value] for value in values]
+        elif kind in ("num", "json"):
+            columns[name] = values
+        else:
+            if any(value is None and name in row for row, value in zip(rows, values)):
+                null[name] = _bitmap([value is None and name in row for row, value in zip(rows, values)])
+            offsets = [0]
+            flat: list[Any] = []
+            for value in values:
+                flat.extend(value or [])
+                offsets.append(len(flat))
+            if kind == "str_list":
+                columns[name] = {"offsets": offsets, "values": [lookup[item] for item in flat]}
+            else:
+                nested, nested_present, nested_null = _encode_columns(flat, field["fields"], lookup)
+                columns[name] = {"offsets": offsets, "columns": nested}
+                if nested_present:
+                    columns[name]["present"] = nested_present
+                if nested_null:
+                    columns[name]["null"] = nested_null
+    return columns, present, null
+
+
+def encode(records: list[dict]) -> dict:
+    schema = _schema(records)
+    counts: Counter = Counter()
+    _collect_strings(records, schema, counts)
+    strings = [value for value, _ in counts.most_common()]
+    lookup = {value: index for index, value in enumerate(strings)}
+    columns, present, null = _encode_columns(records, schema, lookup)
+    payload = {
+        "format": FORMAT,
+        "count": len(records),
+        "strings": strings,
+        "schema": schema,
+        "columns": columns,
+    }
+    if present:
+        payload["present"] = present
+    if null:
+        payload["null"] = null
+    return payload
+
+
+def _decode_columns(
+    columns: dict,
+    schema: list[dict],
+    count: int,
+    strings: list[str],
+    present: dict[str, str],
+    null: dict[str, str],
+) -> list[dict]:
+    rows: list[dict] = [{} for _ in range(count)]
+    for field in schema:
+        name, kind = field["name"], field["kind"]
+        column = columns[name]
+        if kind == "str":
+            values = [None if index == NULL else strings[index] for index in column]
+        elif kind in ("num", "json"):
+            values = column
+        else:
+            offsets = column["offsets"]
+            if kind == "str_list":
+                flat = [strings[index] for index in column["values"]]
+            else:
+                flat = _decode_columns(
+                    column["columns"],
+                    field["fields"],
+                    offsets[-1],
+                    strings,
+                    column.get("present", {}),
+                    column.get("null", {}),
+                )
+            nulls = _bits(null, name, count) if name in null else [False] * count
+            values = [
+                None if nulls[position] else flat[offsets[position]:offsets[position + 1]]
+                for position in range(count)
+            ]
+        for row, value, has_key in zip(rows, values, _bits(present, name, count)):
+            if has_key:
+                row[name] = value
+    return rows
+
+
+def decode(payload: dict) -> list[dict]:
+    if payload.get("format") != FORMAT:
+        raise ValueError(f"Unsupported hero encoding: {payload.get('format')!r}")
+    return _decode_columns(
+        payload["columns"],
+        payload["schema"],
+        payload["count"],
+        payload["strings"],
+        payload.get("present", {}),
+        payload.get("null", {}),
+    )
+
+
+def dumps(records: list[dict]) -> str:
+    return json.dumps(encode(records), ensure_ascii=False, separators=(",", ":"))
+
+
+def write_columnar(records: list[dict], path: Path = COLUMNAR_FILE) -> int:
+    text = dumps(records)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return len(text.encode("utf-8"))
+
+
+def _scaled(records: list[dict], scale: int) -> list[dict]:
+    """Replicate the roster to model growth; ids stay unique."""
+    if scale <= 1:
+        return records
+    return [dict(record, id=f"{record['id']}-{copy}") for copy in range(scale) for record in records]
+
+
+def _median_ms(func, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def benchmark(records: list[dict], repeat: int = 50) -> list[dict]:
+    encodings = {
+        "json-indent": json.dumps(records, indent=2),
+        "json-compact": json.dumps(records, separators=(",", ":")),
+        "columnar": dumps(records),
+    }
+    if decode(json.loads(encodings["columnar"])) != json.loads(encodings["json-compact"]):
+        raise AssertionError("columnar round-trip mismatch")
+    if decode(json.loads(dumps(RAGGED_SAMPLE))) != RAGGED_SAMPLE:
+        raise AssertionError("columnar round-trip mismatch on records with different keys")
+
+    results = []
+    for name, text in encodings.items():
+        raw = text.encode("utf-8")
+        if name == "columnar":
+            parse = lambda: decode(json.loads(text))  # noqa: E731
+        else:
+            parse = lambda: json.loads(text)  # noqa: E731
+        results.append(
+            {
+                "format": name,
+                "bytes": len(raw),
+                "gzip_bytes": len(gzip.compress(raw, compresslevel=9, mtime=0)),
+                "parse_ms": round(_median_ms(parse, repeat), 3),
+            }
+        )
+    return results
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Encode heroes columnar and benchmark against JSON.")
+    parser.add_argument("--write", action="store_true", help=f"Write {COLUMNAR_FILE.name}")
+    parser.add_argument("--scale", type=int, default=1, help="Replicate the roster N times for the benchmark")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed parses per format")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    records = load_heroes()
+    if args.write:
+        size = write_columnar(records)
+        print(f"Wrote {len(records)} heroes ({size} bytes) to {COLUMNAR_FILE}")
+
+    records = _scaled(records, args.scale)
+    print(f"{len(records)} heroes")
+    print(f"{'format':<14} {'bytes':>9} {'gzip':>8} {'parse ms':>9}")
+    for result in benchmark(records, args.repeat):
+        print(f"{result['format']:<14} {result['bytes']:>9} {result['gzip_bytes']:>8} {result['parse_ms']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
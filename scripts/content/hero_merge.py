@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""Merge per-source hero snapshots into hero records with field-level provenance.
+
+Each crawl stage stores what it learned about a hero as a snapshot, taken
+from pages it has already downloaded, under
+``.build/snapshots/<source>/<hero_id>.json``:
+
+    master   the hero's ``HERO_MASTER`` entry (hero page)
+    listing  name, faction and rarity from hero.php, plus the local portrait
+    html     the skill cards rendered on the hero page
+    fandom   skill notes from the hero's Fandom article
+
+``merge_hero`` builds one record from them. ``FIELD_SOURCES`` and
+``SKILL_FIELD_SOURCES`` list the sources for each field in order of
+precedence; the first one with a non-empty value wins, otherwise the field
+gets its default. Skills are matched across sources by normalized name, or
+failing that by the closest name (``SKILL_MATCH_CUTOFF``). The source that
+won each field is recorded as provenance, with skill fields as
+``skills[<name>].<field>`` (the same paths ``content_diff`` reports).
+
+``merge_heroes`` keeps the snapshot hashes, record and provenance of every
+hero in ``.build/merge/state.json`` and only re-merges heroes whose snapshots
+changed since the last run. The hashes include ``RULES_HASH``, so editing the
+precedence rules, defaults or cutoff above re-merges every hero.
+"""
+from __future__ import annotations
+
+import argparse
+import difflib
+import json
+import re
+from pathlib import Path
+from typing import Any, Optional
+
+from bs4 import BeautifulSoup
+
+from chunk_content import BUILD_DIR, content_hash
+from guide_specs import clean_text
+
+SNAPSHOT_DIR = BUILD_DIR / "snapshots"
+MERGE_DIR = BUILD_DIR / "merge"
+ROSTER_FILE = SNAPSHOT_DIR / "roster.json"
+SOURCES = ("master", "listing", "html", "fandom")
+
+FIELD_SOURCES: dict[str, tuple[str, ...]] = {
+    "game_id": ("master",),
+    "name": ("master", "listing", "html"),
+    "faction": ("master", "listing"),
+    "rarity": ("master", "listing"),
+    "role": ("master",),
+    "image": ("listing",),
+    "gear_set": ("master",),
+    "unique_weapon": ("master",),
+    "positions": ("master",),
+}
+# The first of these with any skills sets the skill list and its order.
+SKILL_LIST_SOURCES = ("master", "html")
+SKILL_FIELD_SOURCES: dict[str, tuple[str, ...]] = {
+    "type": ("master", "html"),
+    "description": ("master", "html", "fandom"),
+    "tips": ("master",),
+}
+DEFAULTS: dict[str, Any] = {
+    "faction": "Unknown",
+    "rarity": "Legendary",
+    "role": "DPS",
+    "image": "/img/heroes/placeholder.png",
+    "gear_set": "None",
+    "unique_weapon": "None",
+    "positions": [],
+}
+SKILL_DEFAULTS = {"name": "Unknown", "type": "Passive", "description": "", "tips": ""}
+
+SKILL_TITLE_SELECTOR = ".text-sm.font-bold.text-slate-900"
+SKILL_TEXT_SELECTOR = r"p.text-\[13px\].text-slate-800"
+SKILL_TYPES = ("Active", "Passive", "Ultimate")
+SCRIPT_RE = re.compile(r"<script\b.*?</script>", re.DOTALL | re.IGNORECASE)
+# Skill names that differ by a letter or two across sources ("Judgment"/"Judgement").
+SKILL_MATCH_CUTOFF = 0.85
+# Stored with each hero's snapshot hashes; a record merged under other rules is stale.
+RULES_HASH = content_hash(
+    json.dumps(
+        [FIELD_SOURCES, SKILL_LIST_SOURCES, SKILL_FIELD_SOURCES, DEFAULTS, SKILL_DEFAULTS, SKILL_MATCH_CUTOFF],
+        sort_keys=True,
+    )
+)
+
+
+def skill_key(name: str) -> str:
+    """``"2. Guardian Discipline (Passive)"`` and ``"Guardian discipline"`` share a key."""
+    name = re.sub(r"^\s*\d+\.\s*", "", name)
+    name = re.sub(r"\s*\([^)]*\)\s*$", "", name)
+    return re.sub(r"\W+", " ", name.lower()).strip()
+
+
+def _present(value: Any) -> bool:
+    return value not in (None, "", [], {})
+
+
+# -- snapshots --------------------------------------------------------------
+
+
+def master_snapshot(hero: dict) -> dict:
+    """The fields a ``HERO_MASTER`` entry actually carries, in record form."""
+    snapshot: dict[str, Any] = {}
+    game_id = hero.get("hero_id", hero.get("id"))
+    if game_id:
+        snapshot["game_id"] = game_id.replace("-", "").lower()
+    fields = {field: hero.get(field) for field in ("faction", "rarity", "role", "unique_weapon", "positions")}
+    fields["name"] = hero.get("hero_name", hero.get("name"))
+    snapshot.update((field, value) for field, value in fields.items() if _present(value))
+    gear_set = (hero.get("gear") or {}).get("default_set_name")
+    if gear_set:
+        snapshot["gear_set"] = gear_set
+    skills = [
+        {
+            "name": skill.get("name", "Unknown"),
+            "type": skill.get("type", ""),
+            "description": clean_text(skill.get("base_description", "")),
+            "tips": clean_text(skill.get("tips", "")),
+        }
+        for skill in hero.get("skills") or []
+    ]
+    if skills:
+        snapshot["skills"] = skills
+    return snapshot
+
+
+def parse_skill_cards(page_html: str) -> dict:
+    """Hero name and skill cards from a hero page, ignoring its (large) scripts."""
+    soup = BeautifulSoup(SCRIPT_RE.sub("", page_html), "html.parser")
+    snapshot: dict[str, Any] = {}
+    heading = soup.find("h1")
+    if heading is not None and heading.get_text(strip=True):
+        snapshot["name"] = heading.get_text(strip=True)
+
+    skills = []
+    for title in soup.select(SKILL_TITLE_SELECTOR):
+        card = title.find_parent("div")
+        if card is None or title.find_parent("a") is not None:
+            continue
+        text = card.select_one(SKILL_TEXT_SELECTOR)
+        if text is None:
+            paragraphs = [p for p in card.find_all("p") if p is not title and "text-xs" not in (p.get("class") or [])]
+            text = max(paragraphs, key=lambda p: len(p.get_text(strip=True)), default=None)
+        tags = [tag.get_text(strip=True) for tag in card.select("span.rounded-full, p.text-xs")]
+        skill_type = next((tag for tag in tags if tag.title() in SKILL_TYPES), tags[0] if tags else "")
+        skills.append(
+            {
+                "name": title.get_text(strip=True),
+                "type": skill_type.title(),
+                "description": clean_text(text.get_text(" ", strip=True)) if text is not None else "",
+            }
+        )
+    if skills:
+        snapshot["skills"] = skills
+    return snapshot
+
+
+def fandom_snapshot(sections: dict) -> dict:
+    """Skill notes from the ``skills`` markdown of ``extract_fandom_sections``.
+
+    Each ``###`` heading names a skill; its first paragraph is the description.
+    """
+    notes: dict[str, dict] = {}
+    name = None
+    for block in re.split(r"\n\s*\n", sections.get("skills", "")):
+        block = block.strip()
+        if block.startswith("### "):
+            name = block[4:].strip()
+            notes.setdefault(skill_key(name), {"name": name, "description": ""})
+        elif name and block and block[0] not in ">-":
+            note = notes[skill_key(name)]
+            if not note["description"]:
+                note["description"] = clean_text(block)
+    skills = [note for note in notes.values() if note["description"]]
+    return {"skills": skills} if skills else {}
+
+
+def snapshot_path(source: str, hero_id: str, directory: Path = SNAPSHOT_DIR) -> Path:
+    return directory / source / f"{hero_id}.json"
+
+
+def store_snapshot(source: str, hero_id: str, data: dict, directory: Path = SNAPSHOT_DIR) -> bool:
+    """Write a snapshot if it differs from the stored one; True when it changed."""
+    path = snapshot_path(source, hero_id, directory)
+    text = json.dumps(data, ensure_ascii=False, sort_keys=True)
+    if path.exists() and path.read_text(encoding="utf-8") == text:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return True
+
+
+def load_snapshots(hero_id: str, directory: Path = SNAPSHOT_DIR) -> dict[str, str]:
+    """Raw snapshot text per source, for the sources this hero has."""
+    snapshots = {}
+    for source in SOURCES:
+        path = snapshot_path(source, hero_id, directory)
+        if path.exists():
+            snapshots[source] = path.read_text(encoding="utf-8")
+    return snapshots
+
+
+def write_roster(hero_ids: list[str], directory: Path = SNAPSHOT_DIR) -> None:
+    """Record the hero list order; it is the order of the merged records."""
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / ROSTER_FILE.name).write_text(json.dumps(hero_ids), encoding="utf-8")
+
+
+def load_roster(directory: Path = SNAPSHOT_DIR) -> list[str]:
+    path = directory / ROSTER_FILE.name
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else []
+
+
+# -- merge ------------------------------------------------------------------
+
+
+def _skill_in(skills: dict[str, dict], key: str) -> dict:
+    if key in skills:
+        return skills[key]
+    close = difflib.get_close_matches(key, list(skills), n=1, cutoff=SKILL_MATCH_CUTOFF)
+    return skills[close[0]] if close else {}
+
+
+def _pick(sources: tuple[str, ...], values: dict[str, Any]) -> tuple[Any, Optional[str]]:
+    for source in sources:
+        if _present(values.get(source)):
+            return values[source], source
+    return None, None
+
+
+def merge_hero(hero_id: str, snapshots: dict[str, dict]) -> tuple[dict, dict[str, str]]:
+    """Combine one hero's snapshots; returns (record, provenance)."""
+    record: dict[str, Any] = {"id": hero_id}
+    provenance: dict[str, str] = {}
+    for field, sources in FIELD_SOURCES.items():
+        value, source = _pick(sources, {name: snapshots.get(name, {}).get(field) for name in sources})
+        if source is None:
+            if field == "game_id":
+                value = hero_id.replace("-", "").lower()
+            elif field == "name":
+                value = hero_id.replace("-", " ").title()
+            else:
+                value = DEFAULTS[field]
+        record[field] = value
+        provenance[field] = source or "default"
+
+    by_source = {
+        source: {skill_key(skill["name"]): skill for skill in snapshots.get(source, {}).get("skills", [])}
+        for source in SOURCES
+    }
+    base, base_source = _pick(SKILL_LIST_SOURCES, {name: snapshots.get(name, {}).get("skills") for name in SOURCES})
+    skills = []
+    for base_skill in base or []:
+        key = skill_key(base_skill["name"])
+        skill = {"name": base_skill["name"]}
+        for field, sources in SKILL_FIELD_SOURCES.items():
+            value, source = _pick(sources, {name: _skill_in(by_source[name], key).get(field) for name in sources})
+            skill[field] = value if source else SKILL_DEFAULTS[field]
+            provenance[f"skills[{skill['name']}].{field}"] = source or "default"
+        skills.append(skill)
+    record["skills"] = skills
+    provenance["skills"] = base_source or "default"
+    return record, provenance
+
+
+def merge_heroes(
+    hero_ids: Optional[list[str]] = None,
+    force: bool = False,
+    snapshot_dir: Path = SNAPSHOT_DIR,
+    merge_dir: Path = MERGE_DIR,
+) -> tuple[list[dict], dict]:
+    """Merge every hero on the roster, reusing records whose snapshots are unchanged.
+
+    Returns the records in roster order and ``{"heroes", "merged", "unchanged"}``.
+    """
+    if hero_ids is None:
+        hero_ids = load_roster(snapshot_dir)
+    state_path = merge_dir / "state.json"
+    state = {} if force or not state_path.exists() else json.loads(state_path.read_text(encoding="utf-8"))
+    new_state: dict[str, dict] = {}
+    records = []
+    stats = {"heroes": 0, "merged": 0, "unchanged": 0}
+
+    for hero_id in hero_ids:
+        raw = load_snapshots(hero_id, snapshot_dir)
+        inputs = {source: content_hash(text) for source, text in raw.items()}
+        inputs["rules"] = RULES_HASH
+        previous = state.get(hero_id)
+        if previous and previous["inputs"] == inputs:
+            new_state[hero_id] = previous
+            stats["unchanged"] += 1
+        else:
+            record, provenance = merge_hero(hero_id, {source: json.loads(text) for source, text in raw.items()})
+            new_state[hero_id] = {"inputs": inputs, "record": record, "provenance": provenance}
+            stats["merged"] += 1
+        records.append(new_state[hero_id]["record"])
+
+    stats["heroes"] = len(records)
+    merge_dir.mkdir(parents=True, exist_ok=True)
+    state_path.write_text(json.dumps(new_state, ensure_ascii=False, sort_keys=True), encoding="utf-8")
+    return records, stats
+
+
+def load_provenance(hero_id: str, merge_dir: Path = MERGE_DIR) -> Optional[dict]:
+    state_path = merge_dir / "state.json"
+    if not state_path.exists():
+        return None
+    return json.loads(state_path.read_text(encoding="utf-8")).get(hero_id)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Merge stored hero snapshots and show field provenance.")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-merge every hero into state.json (update_content.py --merge --force-merge also rewrites the hero files)",
+    )
+    parser.add_argument("--show", metavar="HERO_ID", help="Print one hero's record and the source of each field")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    records, stats = merge_heroes(force=args.force)
+    print(f"Merged {stats['merged']} heroes ({stats['unchanged']} unchanged, {stats['heroes']} total)")
+    if args.show:
+        entry = load_provenance(args.show)
+        if entry is None:
+            print(f"No merged record for {args.show}")
+            return
+        for field, source in entry["provenance"].items():
+            print(f"  {field:<48} {source}")
+
+
+if __name__ == "__main__":
+    main()
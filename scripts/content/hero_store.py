@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Write and read hero data as a slim roster summary plus content-hashed detail shards.
+
+Layout under ``public/data/heroes`` (served as ``/data/heroes``)::
+
+    summary.json                 roster fields for every hero + shard URL
+    detail/<name>.<hash>.json    full hero records, one hero or a balanced group
+
+A client can load ``summary.json`` up front and fetch a shard on demand. The
+hash in each shard name changes only when its contents do, so shards can be
+cached forever. The app still imports the single-file ``src/data/heroes.json``,
+so ``write_heroes`` writes it too unless ``monolithic=False``.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import textwrap
+from pathlib import Path
+from typing import Iterable, Optional
+
+from tracing import span
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+HEROES_JSON = PROJECT_ROOT / "src" / "data" / "heroes.json"
+HERO_DATA_DIR = PROJECT_ROOT / "public" / "data" / "heroes"
+HERO_SUMMARY = HERO_DATA_DIR / "summary.json"
+HERO_DETAIL_DIR = HERO_DATA_DIR / "detail"
+HERO_DATA_URL = "/data/heroes"
+
+SUMMARY_FIELDS = ("id", "name", "faction", "rarity", "role", "image")
+
+
+def _dumps(data: object) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def balance_shards(heroes: list[dict], count: int) -> list[list[dict]]:
+    """Group heroes into ``count`` shards of similar byte size (largest first)."""
+    shards: list[list[dict]] = [[] for _ in range(max(1, min(count, len(heroes))))]
+    sizes = [0] * len(shards)
+    for hero in sorted(heroes, key=lambda item: len(_dumps(item)), reverse=True):
+        smallest = sizes.index(min(sizes))
+        shards[smallest].append(hero)
+        sizes[smallest] += len(_dumps(hero))
+    return [sorted(shard, key=lambda item: item["id"]) for shard in shards if shard]
+
+
+def _write_shard(detail_dir: Path, stem: str, payload: str) -> tuple[str, bool]:
+    """Write a content-addressed shard unless it already exists; return (name, written)."""
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:10]
+    filename = f"{stem}.{digest}.json"
+    path = detail_dir / filename
+    if path.exists():
+        return filename, False
+    with span("write", "io", path=f"detail/{filename}", bytes=len(payload)):
+        path.write_text(payload, encoding="utf-8")
+    return filename, True
+
+
+def write_heroes(
+    heroes: Iterable[dict],
+    shards: int = 0,
+    monolithic: bool = True,
+    data_dir: Path = HERO_DATA_DIR,
+) -> dict:
+    """Write the summary index and detail shards; ``shards=0`` means one per hero.
+
+    With one shard per hero, ``heroes`` is consumed as a stream: each record is
+    written out and only its summary row is kept in memory.
+    """
+    detail_dir = data_dir / "detail"
+    detail_dir.mkdir(parents=True, exist_ok=True)
+
+    summary_rows: list[dict] = []
+    written: set[str] = set()
+    fresh = 0
+    monolithic_tmp = HEROES_JSON.with_suffix(".json.tmp")
+    if monolithic:
+        HEROES_JSON.parent.mkdir(parents=True, exist_ok=True)
+    legacy = monolithic_tmp.open("w", encoding="utf-8") if monolithic else None
+
+    try:
+        balanced: list[dict] = []
+        for hero in heroes:
+            if legacy is not None:
+                # Same bytes as json.dumps(heroes, indent=2), one record at a time.
+                separator = ",\n" if summary_rows else "[\n"
+                legacy.write(separator + textwrap.indent(json.dumps(hero, indent=2), "  "))
+            row = {field: hero.get(field) for field in SUMMARY_FIELDS}
+            summary_rows.append(row)
+            if shards <= 0:
+                filename, created = _write_shard(detail_dir, hero["id"], _dumps(hero))
+                written.add(filename)
+                fresh += created
+                row["detail"] = f"{HERO_DATA_URL}/detail/{filename}"
+            else:
+                balanced.append(hero)
+
+        if legacy is not None:
+            legacy.write("\n]" if summary_rows else "[]")
+    finally:
+        if legacy is not None:
+            legacy.close()
+    if monolithic:
+        monolithic_tmp.replace(HEROES_JSON)
+
+    if shards > 0:
+        shard_for: dict[str, str] = {}
+        for position, group in enumerate(balance_shards(balanced, shards)):
+            filename, created = _write_shard(detail_dir, f"shard-{position:02d}", _dumps(group))
+            written.add(filename)
+            fresh += created
+            for hero in group:
+                shard_for[hero["id"]] = f"{HERO_DATA_URL}/detail/{filename}"
+        for row in summary_rows:
+            row["detail"] = shard_for[row["id"]]
+
+    stale = [path for path in detail_dir.glob("*.json") if path.name not in written]
+    for path in stale:
+        path.unlink()
+
+    summary_text = _dumps({"count": len(summary_rows), "sharded": shards > 0, "heroes": summary_rows})
+    with span("write", "io", path="summary.json", bytes=len(summary_text)):
+        (data_dir / "summary.json").write_text(summary_text, encoding="utf-8")
+
+    stats = {
+        "heroes": len(summary_rows),
+        "shards": len(written),
+        "written": fresh,
+        "removed": len(stale),
+        "summary_bytes": len(summary_text.encode("utf-8")),
+    }
+    if monolithic:
+        stats["monolithic_bytes"] = HEROES_JSON.stat().st_size
+    return stats
+
+
+def _read_shard(data_dir: Path, url: str) -> object:
+    path = data_dir / url.removeprefix(HERO_DATA_URL).lstrip("/")
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def load_heroes(data_dir: Path = HERO_DATA_DIR, fallback: Optional[Path] = HEROES_JSON) -> list[dict]:
+    """Return full hero records from the sharded layout, or the monolithic file."""
+    summary_path = data_dir / "summary.json"
+    if not summary_path.exists():
+        if fallback and fallback.exists():
+            return json.loads(fallback.read_text(encoding="utf-8"))
+        return []
+
+    summary = json.loads(summary_path.read_text(encoding="utf-8"))
+    records: dict[str, dict] = {}
+    for url in dict.fromkeys(entry["detail"] for entry in summary["heroes"]):
+        shard = _read_shard(data_dir, url)
+        for hero in shard if isinstance(shard, list) else [shard]:
+            records[hero["id"]] = hero
+    return [records[entry["id"]] for entry in summary["heroes"] if entry["id"] in records]
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""Record HTTP responses to a directory and replay them offline.
+
+A cassette directory holds ``requests.ndjson`` (one line per response) and a
+``bodies/`` folder of content-addressed response bodies. Entries are keyed by
+method, host, path and query; the scheme is ignored. The last recording of a
+key wins.
+
+``update_content.py`` records and replays in-process by mounting a requests
+transport adapter (``--record DIR`` / ``--replay DIR``), or sends its requests
+to a running server with ``--replay-url URL``. Other clients, such as the
+aiohttp orchestrator, can replay through the local server::
+
+    python3 scripts/content/http_replay.py DIR --port 8765 --latency 40
+    CONTENT_REPLAY_URL=http://127.0.0.1:8765 python3 scripts/scrapers/orchestrator.py
+
+The server maps ``/<host>/<path>`` back to the recorded ``https://<host>/<path>``.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+RECORD_ENV = "CONTENT_RECORD_DIR"
+REPLAY_URL_ENV = "CONTENT_REPLAY_URL"
+
+# Bodies are stored decoded, so transfer framing headers no longer apply.
+DROPPED_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding", "connection"})
+SUFFIXES = {"text/html": ".html", "application/json": ".json", "image/webp": ".webp", "image/png": ".png"}
+
+# Fixed delay in ms, a (low, high) uniform range in ms, or "recorded" to
+# replay each response's original latency.
+Latency = Union[float, Tuple[float, float], str, None]
+
+
+def request_key(method: str, url: str) -> str:
+    parts = urlsplit(url)
+    key = f"{method.upper()} {parts.netloc}{parts.path or '/'}"
+    return f"{key}?{parts.query}" if parts.query else key
+
+
+def replay_server_url(url: str, server: str) -> str:
+    """Rewrite ``url`` to fetch it through a running replay server."""
+    parts = urlsplit(url)
+    rewritten = f"{server.rstrip('/')}/{parts.netloc}{parts.path or '/'}"
+    return f"{rewritten}?{parts.query}" if parts.query else rewritten
+
+
+class Cassette:
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self.index_path = self.directory / "requests.ndjson"
+        self.body_dir = self.directory / "bodies"
+        self._entries: Optional[dict[str, dict]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def entries(self) -> dict[str, dict]:
+        if self._entries is None:
+            entries: dict[str, dict] = {}
+            if self.index_path.exists():
+                for line in self.index_path.read_text(encoding="utf-8").splitlines():
+                    if line.strip():
+                        entry = json.loads(line)
+                        entries[entry["key"]] = entry
+            self._entries = entries
+        return self._entries
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        status: int,
+        headers: dict,
+        body: bytes,
+        elapsed: float,
+    ) -> None:
+        content_type = headers.get("Content-Type", headers.get("content-type", "")).split(";")[0].strip()
+        name = hashlib.sha256(body).hexdigest()[:16] + SUFFIXES.get(content_type, ".bin")
+        entry = {
+            "key": request_key(method, url),
+            "url": url,
+            "status": status,
+            "headers": {key: value for key, value in headers.items() if key.lower() not in DROPPED_HEADERS},
+            "body": name,
+            "elapsed_ms": round(elapsed * 1000, 2),
+        }
+        with self._lock:
+            self.body_dir.mkdir(parents=True, exist_ok=True)
+            body_path = self.body_dir / name
+            if not body_path.exists():
+                body_path.write_bytes(body)
+            with self.index_path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.entries[entry["key"]] = entry
+
+    def lookup(self, method: str, url: str) -> Optional[dict]:
+        return self.entries.get(request_key(method, url))
+
+    def body(self, entry: dict) -> bytes:
+        return (self.body_dir / entry["body"]).read_bytes()
+
+
+def delay_seconds(entry: Optional[dict], latency: Latency) -> float:
+    if latency is None:
+        return 0.0
+    if latency == "recorded":
+        return (entry or {}).get("elapsed_ms", 0.0) / 1000
+    if isinstance(latency, tuple):
+        return random.uniform(*latency) / 1000
+    return float(latency) / 1000
+
+
+def parse_latency(value: str) -> Latency:
+    """argparse type for ``--replay-latency``: milliseconds, ``A-B`` (uniform) or ``recorded``."""
+    if value == "recorded":
+        return value
+    if "-" in value:
+        low, high = value.split("-", 1)
+        return (float(low), float(high))
+    return float(value)
+
+
+class RecordingAdapter(HTTPAdapter):
+    """HTTPAdapter that writes every response it receives to a cassette."""
+
+    def __init__(self, cassette: Cassette) -> None:
+        super().__init__()
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        self.cassette.record(
+            request.method,
+            request.url,
+            response.status_code,
+            dict(response.headers),
+            response.content,
+            response.elapsed.total_seconds(),
+        )
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """Transport that answers from a cassette and never touches the network.
+
+    Unrecorded requests get a 404 with ``X-Replay-Miss: 1`` and are counted in
+    ``misses``.
+    """
+
+    def __init__(self, cassette: Cassette, latency: Latency = None) -> None:
+        super().__init__()
+        self.cassette = cassette
+        self.latency = latency
+        self.hits = 0
+        self.misses: list[str] = []
+
+    def send(self, request, **kwargs):
+        entry = self.cassette.lookup(request.method, request.url)
+        delay = delay_seconds(entry, self.latency)
+        if delay:
+            time.sleep(delay)
+
+        response = requests.Response()
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        if entry is None:
+            self.misses.append(request.url)
+            response.status_code = 404
+            response.reason = "Not Recorded"
+            response.headers = CaseInsensitiveDict({"X-Replay-Miss": "1"})
+            response._content = b""
+            return response
+
+        self.hits += 1
+        response.status_code = entry["status"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = self.cassette.body(entry)
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+class RedirectAdapter(HTTPAdapter):
+    """HTTPAdapter that sends every request to ``server`` as ``/<host>/<path>``.
+
+    Responses keep the original URL, and are recorded under it when a
+    cassette is given.
+    """
+
+    def __init__(self, server: str, cassette: Optional[Cassette] = None) -> None:
+        super().__init__()
+        self.server = server
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        original = request.url
+        request.url = replay_server_url(original, self.server)
+        try:
+            response = super().send(request, **kwargs)
+        finally:
+            request.url = original
+        response.url = original
+        if self.cassette is not None:
+            self.cassette.record(
+                request.method,
+                original,
+                response.status_code,
+                dict(response.headers),
+                response.content,
+                response.elapsed.total_seconds(),
+            )
+        return response
+
+
+def install(
+    session: requests.Session,
+    record: Optional[Path] = None,
+    replay: Optional[Path] = None,
+    latency: Latency = None,
+    server: Optional[str] = None,
+) -> Optional[BaseAdapter]:
+    """Mount a recording, replaying or redirecting adapter on ``session`` for http and https."""
+    if record and replay:
+        raise ValueError("record and replay are mutually exclusive")
+    if server and replay:
+        raise ValueError("replay and a replay server URL are mutually exclusive")
+    if server:
+        adapter: BaseAdapter = RedirectAdapter(server, Cassette(record) if record else None)
+    elif record:
+        adapter = RecordingAdapter(Cassette(record))
+    elif replay:
+        cassette = Cassette(replay)
+        if not cassette.index_path.exists():
+            raise FileNotFoundError(f"No recording at {cassette.index_path}")
+        adapter = ReplayAdapter(cassette, latency)
+    else:
+        return None
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return adapter
+
+
+def create_app(cassette: Cassette, latency: Latency = None):
+    """aiohttp application serving ``/<host>/<path>`` from ``cassette``."""
+    import asyncio
+
+    from aiohttp import web
+
+    async def handle(request: "web.Request") -> "web.StreamResponse":
+        host, _, path = request.match_info["tail"].partition("/")
+        url = f"https://{host}/{path}" + (f"?{request.query_string}" if request.query_string else "")
+        entry = cassette.lookup(request.method, url)
+        delay = delay_seconds(entry, latency)
+        if delay:
+            await asyncio.sleep(delay)
+        if entry is None:
+            return web.Response(status=404, headers={"X-Replay-Miss": "1"})
+        return web.Response(status=entry["status"], headers=entry["headers"], body=cassette.body(entry))
+
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handle)
+    return app
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve a recorded cassette over HTTP for offline runs.")
+    parser.add_argument("directory", type=Path, help="Cassette directory written by --record")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--latency",
+        type=parse_latency,
+        default=None,
+        help="Injected delay per response: ms, a uniform range like 20-80, or 'recorded'",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    from aiohttp import web
+
+    args = parse_args()
+    cassette = Cassette(args.directory)
+    print(f"Serving {len(cassette.entries)} recorded responses on http://{args.host}:{args.port}")
+    print(f"  e.g. {REPLAY_URL_ENV}=http://{args.host}:{args.port}")
+    web.run_app(create_app(cassette, args.latency), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""Compact BM25 index over rag-content chunks, readable straight from mmap.
+
+File layout (little-endian, every section 8-byte aligned)::
+
+    header        128 bytes  magic, version, counts, BM25 params, section offsets
+    term_hashes   uint64[n_terms]       sorted 64-bit term hashes (the dictionary)
+    term_offsets  uint64[n_terms + 1]   posting ranges per term
+    post_docs     uint32[n_postings]    doc ids
+    post_weights  float32[n_postings]   precomputed BM25 term/doc impact
+    doc_offsets   uint64[n_docs + 1]    ranges into the doc blob
+    doc_blob      bytes                 one UTF-8 JSON record per doc
+
+Opening the file only parses the header and creates NumPy views, so startup
+cost does not grow with the corpus.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import mmap
+import re
+import struct
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from chunk_content import BUILD_DIR, CHUNKS_FILE, display_path, load_chunks
+from dedup_content import DEDUP_CHUNKS_FILE
+
+LEXICAL_INDEX = BUILD_DIR / "lexical.idx"
+
+MAGIC = b"THRIDX01"
+VERSION = 1
+# magic, version, n_docs, n_terms, n_postings, k1, b, then 6 section offsets
+HEADER = struct.Struct("<8sIIIQff6Q")
+HEADER_SIZE = 128
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the their "
+    "this to was were will with you your".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    return [word for word in WORD_RE.findall(text.lower()) if len(word) > 1 and word not in STOPWORDS]
+
+
+def term_hash(term: str) -> int:
+    return int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def default_chunks_path() -> Path:
+    """Prefer the deduplicated chunk set when the dedup stage has run."""
+    return DEDUP_CHUNKS_FILE if DEDUP_CHUNKS_FILE.exists() else CHUNKS_FILE
+
+
+def index_text(record: dict) -> str:
+    return " ".join(record.get("heading_path", [])) + "\n" + record["text"]
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def build_lexical_index(
+    chunks_path: Optional[Path] = None,
+    output: Path = LEXICAL_INDEX,
+    k1: float = 1.2,
+    b: float = 0.75,
+) -> dict:
+    records = load_chunks(chunks_path or default_chunks_path())
+    term_docs: dict[int, list[tuple[int, int]]] = {}
+    doc_lengths = []
+
+    for doc_id, record in enumerate(records):
+        counts = Counter(tokenize(index_text(record)))
+        doc_lengths.append(sum(counts.values()))
+        for term, tf in counts.items():
+            term_docs.setdefault(term_hash(term), []).append((doc_id, tf))
+
+    n_docs = len(records)
+    avg_length = (sum(doc_lengths) / n_docs) if n_docs else 0.0
+
+    hashes = np.array(sorted(term_docs), dtype=np.uint64)
+    offsets = np.zeros(len(hashes) + 1, dtype=np.uint64)
+    docs_parts: list[np.ndarray] = []
+    weight_parts: list[np.ndarray] = []
+    position = 0
+    for index, hashed in enumerate(hashes.tolist()):
+        postings = term_docs[hashed]
+        idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+        doc_ids = np.array([doc for doc, _ in postings], dtype=np.uint32)
+        tfs = np.array([tf for _, tf in postings], dtype=np.float32)
+        norms = np.array([doc_lengths[doc] for doc, _ in postings], dtype=np.float32) / (avg_length or 1.0)
+        weights = idf * tfs * (k1 + 1) / (tfs + k1 * (1 - b + b * norms))
+        docs_parts.append(doc_ids)
+        weight_parts.append(weights.astype(np.float32))
+        position += len(postings)
+        offsets[index + 1] = position
+
+    post_docs = np.concatenate(docs_parts) if docs_parts else np.zeros(0, dtype=np.uint32)
+    post_weights = np.concatenate(weight_parts) if weight_parts else np.zeros(0, dtype=np.float32)
+
+    blobs = [
+        json.dumps(
+            {
+                "id": record["id"],
+                "source": record["source"],
+                "heading_path": record["heading_path"],
+                "tokens": record["tokens"],
+                "preview": record["text"][:240],
+            },
+            ensure_ascii=False,
+        ).encode("utf-8")
+        for record in records
+    ]
+    doc_offsets = np.zeros(n_docs + 1, dtype=np.uint64)
+    doc_offsets[1:] = np.cumsum([len(blob) for blob in blobs], dtype=np.uint64)
+    doc_blob = b"".join(blobs)
+
+    sections = [hashes.tobytes(), offsets.tobytes(), post_docs.tobytes(), post_weights.tobytes(), doc_offsets.tobytes()]
+    section_offsets = []
+    cursor = HEADER_SIZE
+    for section in sections + [doc_blob]:
+        cursor = _align(cursor)
+        section_offsets.append(cursor)
+        cursor += len(section)
+
+    header = HEADER.pack(MAGIC, VERSION, n_docs, len(hashes), len(post_docs), k1, b, *section_offsets)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_suffix(".tmp")
+    with tmp_path.open("wb") as handle:
+        handle.write(header.ljust(HEADER_SIZE, b"\0"))
+        for offset, section in zip(section_offsets, sections + [doc_blob]):
+            handle.write(b"\0" * (offset - handle.tell()))
+            handle.write(section)
+    tmp_path.replace(output)
+
+    stats = {"docs": n_docs, "terms": len(hashes), "postings": len(post_docs), "bytes": output.stat().st_size}
+    print(
+        f"Built lexical index: {stats['docs']} docs, {stats['terms']} terms, "
+        f"{stats['bytes']} bytes -> {display_path(output)}"
+    )
+    return stats
+
+
+@dataclass
+class SearchHit:
+    doc_id: int
+    score: float
+    record: dict
+
+
+class LexicalIndex:
+    """Read-only view over a ``lexical.idx`` file."""
+
+    def __init__(self, path: Path = LEXICAL_INDEX):
+        self._file = path.open("rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n_docs, n_terms, n_postings, self.k1, self.b, *offsets = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} lexical index")
+
+        self.n_docs = n_docs
+        self.term_hashes = np.frombuffer(self._map, dtype=np.uint64, count=n_terms, offset=offsets[0])
+        self.term_offsets = np.frombuffer(self._map, dtype=np.uint64, count=n_terms + 1, offset=offsets[1])
+        self.post_docs = np.frombuffer(self._map, dtype=np.uint32, count=n_postings, offset=offsets[2])
+        self.post_weights = np.frombuffer(self._map, dtype=np.float32, count=n_postings, offset=offsets[3])
+        self.doc_offsets = np.frombuffer(self._map, dtype=np.uint64, count=n_docs + 1, offset=offsets[4])
+        self._blob_start = offsets[5]
+
+    def close(self) -> None:
+        # Views must be released before the map can close.
+        for name in ("term_hashes", "term_offsets", "post_docs", "post_weights", "doc_offsets"):
+            setattr(self, name, None)
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "LexicalIndex":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def record(self, doc_id: int) -> dict:
+        start = self._blob_start + int(self.doc_offsets[doc_id])
+        end = self._blob_start + int(self.doc_offsets[doc_id + 1])
+        return json.loads(self._map[start:end])
+
+    def scores(self, query: str) -> np.ndarray:
+        hashes = np.array(sorted({term_hash(term) for term in tokenize(query)}), dtype=np.uint64)
+        if not len(hashes) or not len(self.term_hashes):
+            return np.zeros(self.n_docs, dtype=np.float32)
+
+        slots = np.searchsorted(self.term_hashes, hashes)
+        found = slots < len(self.term_hashes)
+        slots, hashes = slots[found], hashes[found]
+        slots = slots[self.term_hashes[slots] == hashes]
+
+        ranges = [(int(self.term_offsets[slot]), int(self.term_offsets[slot + 1])) for slot in slots.tolist()]
+        if not ranges:
+            return np.zeros(self.n_docs, dtype=np.float32)
+        docs = np.concatenate([self.post_docs[start:end] for start, end in ranges])
+        weights = np.concatenate([self.post_weights[start:end] for start, end in ranges])
+        return np.bincount(docs, weights=weights, minlength=self.n_docs).astype(np.float32)
+
+    def search(self, query: str, k: int = 5) -> list[SearchHit]:
+        scores = self.scores(query)
+        k = min(k, self.n_docs)
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [SearchHit(int(doc), float(scores[doc]), self.record(int(doc))) for doc in top if scores[doc] > 0]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build the memory-mapped lexical index for rag-content.")
+    parser.add_argument("--chunks", type=Path, help="Chunk file to index (defaults to the deduplicated set)")
+    parser.add_argument("--output", type=Path, default=LEXICAL_INDEX, help="Index file to write")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    started = time.perf_counter()
+    build_lexical_index(args.chunks, args.output)
+    print(f"  Build took {(time.perf_counter() - started) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""Load-test the scrapers against the synthetic stand-in server.
+
+Starts ``standin_server`` in-process, then runs ``update_content.py`` and the
+orchestrator as subprocesses against it for each roster size and concurrency
+level. Each run happens in a throwaway copy of the repo (scripts, rag-content,
+an empty image folder), so nothing in the working tree is touched. Results go
+to ``.build/loadtest/latest.json``::
+
+    {"meta": {"latency": "lognormal:80,0.5", "error_rate": 0.01, ...},
+     "runs": [{"client": "orchestrator", "roster": 200, "concurrency": 8,
+               "seconds": 4.1, "requests": 201, "requests_per_s": 49.0,
+               "heroes_per_s": 48.8, "mb_per_s": 9.6, "throttled": 0, "errors": 2, ...}]}
+
+``update_content.py`` fetches one page at a time, so it runs only at
+concurrency 1; the orchestrator runs at every level (``CONTENT_CONCURRENCY``).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Iterator
+
+from chunk_content import BUILD_DIR, PROJECT_ROOT
+from http_replay import REPLAY_URL_ENV
+from standin_server import add_config_arguments, config_from_args, create_app
+
+LOAD_DIR = BUILD_DIR / "loadtest"
+CLIENTS = ("update_content", "orchestrator")
+UPDATE_STAGES = ("--heroes-json", "--guides", "--fandom")
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(item) for item in value.split(",") if item]
+
+
+def make_sandbox(root: Path) -> Path:
+    """Copy what the scrapers read and write into ``root``; return it."""
+    shutil.copytree(PROJECT_ROOT / "scripts" / "content", root / "scripts" / "content",
+                    ignore=shutil.ignore_patterns("__pycache__"))
+    shutil.copytree(PROJECT_ROOT / "scripts" / "scrapers", root / "scripts" / "scrapers",
+                    ignore=shutil.ignore_patterns("__pycache__"))
+    shutil.copytree(PROJECT_ROOT / "rag-content", root / "rag-content", ignore=shutil.ignore_patterns(".build"))
+    (root / "public" / "img" / "heroes").mkdir(parents=True)
+    return root
+
+
+@contextlib.contextmanager
+def serve(config) -> Iterator[tuple[str, object]]:
+    """Run the stand-in on a free local port in a background thread."""
+    from aiohttp import web
+
+    app = create_app(config)
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(app, access_log=None)
+    loop.run_until_complete(runner.setup())
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    loop.run_until_complete(site.start())
+    host, port = runner.addresses[0][:2]
+    thread = threading.Thread(target=loop.run_forever, name="standin", daemon=True)
+    thread.start()
+    try:
+        yield f"http://{host}:{port}", app
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.run_until_complete(runner.cleanup())
+        loop.close()
+
+
+def run_client(client: str, sandbox: Path, url: str, concurrency: int) -> tuple[float, int, Path]:
+    """Run one client in ``sandbox``; return (seconds, exit code, metrics report path)."""
+    metrics_dir = sandbox / "metrics"
+    env = dict(os.environ, **{REPLAY_URL_ENV: url, "CONTENT_METRICS_DIR": str(metrics_dir)})
+    if client == "update_content":
+        command = [sys.executable, "scripts/content/update_content.py", *UPDATE_STAGES, "--delay", "0"]
+    else:
+        env["CONTENT_CONCURRENCY"] = str(concurrency)
+        command = [sys.executable, "scripts/scrapers/orchestrator.py"]
+    log = sandbox / f"{client}.log"
+    started = time.perf_counter()
+    with log.open("w", encoding="utf-8") as handle:
+        code = subprocess.run(command, cwd=sandbox, env=env, stdout=handle, stderr=subprocess.STDOUT).returncode
+    seconds = time.perf_counter() - started
+    if code != 0:
+        print(f"  {client} exited with {code}; last lines of {log.name}:")
+        for line in log.read_text(encoding="utf-8").splitlines()[-10:]:
+            print(f"    {line}")
+    return seconds, code, metrics_dir / f"{client}.json"
+
+
+def summarize_run(client: str, roster: int, concurrency: int, seconds: float, code: int,
+                  served: Counter, bytes_sent: int, report_path: Path) -> dict:
+    by_status = Counter()
+    for (_route, status), count in served.items():
+        by_status[status] += count
+    requests = sum(served.values())
+    hero_pages = served[("hero_page", 200)]
+    client_report = json.loads(report_path.read_text(encoding="utf-8")) if report_path.exists() else {"stages": {}}
+    stages = client_report["stages"].values()
+    return {
+        "client": client,
+        "roster": roster,
+        "concurrency": concurrency,
+        "exit_code": code,
+        "seconds": round(seconds, 3),
+        "requests": requests,
+        "ok": by_status[200],
+        "not_found": by_status[404],
+        "throttled": by_status[429],
+        "errors": by_status[500],
+        "bytes": bytes_sent,
+        "requests_per_s": round(requests / seconds, 2),
+        "heroes_per_s": round(hero_pages / seconds, 2),
+        "mb_per_s": round(bytes_sent / seconds / 1e6, 3),
+        "request_seconds": round(sum(stage["request_seconds"] for stage in stages), 3),
+        "parse_seconds": round(
+            sum(parse["seconds"] for stage in stages for parse in stage["parse"].values()), 3
+        ),
+        "routes": {f"{route} {status}": count for (route, status), count in sorted(served.items())},
+    }
+
+
+def print_curves(runs: list[dict]) -> None:
+    print(f"\n{'client':<15} {'roster':>6} {'conc':>5} {'seconds':>8} {'req':>6} {'req/s':>8} "
+          f"{'heroes/s':>9} {'MB/s':>7} {'429':>5} {'5xx':>5}")
+    for run in runs:
+        print(f"{run['client']:<15} {run['roster']:>6} {run['concurrency']:>5} {run['seconds']:>8.2f} "
+              f"{run['requests']:>6} {run['requests_per_s']:>8.1f} {run['heroes_per_s']:>9.1f} "
+              f"{run['mb_per_s']:>7.2f} {run['throttled']:>5} {run['errors']:>5}")
+
+    peak = max((run["heroes_per_s"] for run in runs), default=0) or 1
+    for client in CLIENTS:
+        client_runs = [run for run in runs if run["client"] == client]
+        if not client_runs:
+            continue
+        print(f"\n{client}: hero pages/s by roster and concurrency")
+        for run in client_runs:
+            bar = "#" * max(1, round(run["heroes_per_s"] / peak * 40))
+            print(f"  roster {run['roster']:>5}  c={run['concurrency']:<3} {bar} {run['heroes_per_s']:.1f}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure scraper throughput against the synthetic stand-in server.")
+    parser.add_argument("--rosters", type=_int_list, default=[50, 200, 800], help="Comma-separated roster sizes")
+    parser.add_argument(
+        "--concurrency",
+        type=_int_list,
+        default=[1, 4, 16],
+        help="Comma-separated orchestrator concurrency levels",
+    )
+    parser.add_argument(
+        "--clients",
+        default=",".join(CLIENTS),
+        help=f"Comma-separated clients to run ({', '.join(CLIENTS)})",
+    )
+    add_config_arguments(parser)
+    parser.add_argument("--save", metavar="NAME", help=f"Also save results as {LOAD_DIR.name}/NAME.json")
+    parser.add_argument("--keep", action="store_true", help="Keep the sandboxes (printed) for inspection")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    clients = [client for client in args.clients.split(",") if client]
+    unknown = set(clients) - set(CLIENTS)
+    if unknown:
+        sys.exit(f"Unknown client(s): {', '.join(sorted(unknown))}")
+
+    config = config_from_args(args, args.rosters[0])
+    workdir = Path(tempfile.mkdtemp(prefix="topheroes-load-"))
+    runs = []
+    with serve(config) as (url, app):
+        print(f"Stand-in server on {url} (latency {args.latency.spec}, "
+              f"{args.error_rate:.1%} errors, {args.throttle_rate:.1%} throttled)")
+        stats = app["stats"]
+        for roster in args.rosters:
+            config.roster = roster
+            for client in clients:
+                levels = args.concurrency if client == "orchestrator" else [1]
+                for concurrency in levels:
+                    sandbox = make_sandbox(workdir / f"{client}-{roster}-{concurrency}")
+                    before, bytes_before = Counter(stats.requests), stats.bytes_sent
+                    print(f"{client}: roster {roster}, concurrency {concurrency}...")
+                    seconds, code, report_path = run_client(client, sandbox, url, concurrency)
+                    served = stats.requests - before
+                    runs.append(summarize_run(client, roster, concurrency, seconds, code, served,
+                                              stats.bytes_sent - bytes_before, report_path))
+
+    print_curves(runs)
+    if args.keep:
+        print(f"\nSandboxes kept in {workdir}")
+    else:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "latency": args.latency.spec,
+            "error_rate": args.error_rate,
+            "throttle_rate": args.throttle_rate,
+            "bandwidth": args.bandwidth,
+            "seed": args.seed,
+        },
+        "runs": runs,
+    }
+    LOAD_DIR.mkdir(parents=True, exist_ok=True)
+    text = json.dumps(report, indent=2)
+    (LOAD_DIR / "latest.json").write_text(text, encoding="utf-8")
+    print(f"\nWrote {LOAD_DIR / 'latest.json'}")
+    if args.save:
+        (LOAD_DIR / f"{args.save}.json").write_text(text, encoding="utf-8")
+        print(f"Saved {LOAD_DIR / args.save}.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""One markdown emitter for every content generator.
+
+``MarkdownWriter`` writes blocks as they are produced, either to an open text
+stream (a buffered file) or, with no stream, to an in-memory list of parts
+joined once by ``getvalue()``. Nothing is concatenated in a loop, so the cost
+is linear in the output size.
+
+Formatting is the same for every caller:
+
+- blocks (frontmatter, headings, paragraphs, lists, tables, quotes, rules,
+  raw HTML/MDX) are separated by exactly one blank line, and a document ends
+  with a single newline;
+- inline text (headings, list items, table cells) is collapsed onto one line;
+- table cells escape ``|``;
+- frontmatter values that YAML would misread are JSON-quoted, and lists are
+  written inline as ``[a, b]``.
+
+Text is otherwise written as given: callers clean scraped text first, so
+markdown that a generator builds on purpose (``**bold**``) is kept.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional, TextIO
+
+_WHITESPACE_RUN = re.compile(r"\s*\n\s*")
+_YAML_SPECIAL_START = tuple("[]{}&*!|>'\"%@`#,?-")
+
+
+def inline(text: Any) -> str:
+    """Collapse ``text`` onto one line."""
+    return _WHITESPACE_RUN.sub(" ", str(text).strip())
+
+
+def _cell(text: Any) -> str:
+    return inline(text).replace("|", "\\|")
+
+
+def _yaml_scalar(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    text = inline(value)
+    if not text or text.startswith(_YAML_SPECIAL_START) or ": " in text or " #" in text or text.endswith(":"):
+        return json.dumps(text, ensure_ascii=False)
+    return text
+
+
+class MarkdownWriter:
+    def __init__(self, stream: Optional[TextIO] = None) -> None:
+        self._stream = stream
+        self._parts: list[str] = []
+        self._started = False
+
+    def _write(self, text: str) -> None:
+        if self._stream is not None:
+            self._stream.write(text)
+        else:
+            self._parts.append(text)
+
+    def _block(self, lines: Iterable[str]) -> None:
+        if self._started:
+            self._write("\n")
+        for line in lines:
+            self._write(line)
+            self._write("\n")
+        self._started = True
+
+    def frontmatter(self, fields: dict[str, Any]) -> None:
+        lines = ["---"]
+        for key, value in fields.items():
+            if isinstance(value, (list, tuple)):
+                value = "[" + ", ".join(_yaml_scalar(item) for item in value) + "]"
+            else:
+                value = _yaml_scalar(value)
+            lines.append(f"{key}: {value}")
+        lines.append("---")
+        self._block(lines)
+
+    def heading(self, text: Any, level: int = 1) -> None:
+        self._block([f"{'#' * level} {inline(text)}"])
+
+    def paragraph(self, text: Any) -> bool:
+        """Write ``text`` as a paragraph; returns False (and writes nothing) if it is blank."""
+        text = str(text).strip() if text is not None else ""
+        if not text:
+            return False
+        self._block([text])
+        return True
+
+    def bullets(self, items: Iterable[Any]) -> bool:
+        lines = [f"- {inline(item)}" for item in items if item is not None and str(item).strip()]
+        if not lines:
+            return False
+        self._block(lines)
+        return True
+
+    def blockquote(self, text: Any) -> None:
+        self._block(f"> {line}".rstrip() for line in str(text).strip().splitlines())
+
+    def table(self, headers: list[Any], rows: Iterable[list[Any]]) -> None:
+        lines = [
+            "| " + " | ".join(_cell(header) for header in headers) + " |",
+            "| " + " | ".join(["---"] * len(headers)) + " |",
+        ]
+        lines.extend("| " + " | ".join(_cell(cell) for cell in row) + " |" for row in rows if row)
+        self._block(lines)
+
+    def rule(self) -> None:
+        self._block(["---"])
+
+    def raw(self, text: str) -> None:
+        """Write a pre-formatted block (HTML, MDX) untouched."""
+        self._block([str(text).strip("\n")])
+
+    def getvalue(self) -> str:
+        """The document so far; only for writers without a stream."""
+        if self._stream is not None:
+            raise ValueError("getvalue() is only available without a stream")
+        return "".join(self._parts)
+
+
+@contextmanager
+def open_markdown(path: Path) -> Iterator[MarkdownWriter]:
+    """Stream a document to ``path``; the file is replaced only if the block succeeds."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(path.name + ".partial")
+    try:
+        with partial.open("w", encoding="utf-8") as handle:
+            yield MarkdownWriter(handle)
+        os.replace(partial, path)
+    finally:
+        partial.unlink(missing_ok=True)
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""Per-stage CPU profiles and flamegraph stacks for the content pipeline.
+
+Profiling is off unless ``start_profile(directory)`` is called, either by
+``--profile [DIR]`` (default ``.build/profile``) or by the ``CONTENT_PROFILE``
+environment variable. While it is on, every ``metrics.stage(name)`` also runs
+under cProfile, and a sampler thread records the profiled thread's stack every
+few milliseconds. ``stop_profile()`` prints the summary and writes, under the
+directory (replacing the previous run's files):
+
+    <stage>.pstats          cProfile data (snakeviz, ``python -m pstats``)
+    <stage>.collapsed       sampled stacks, one ``a;b;c count`` line per stack,
+                            for flamegraph.pl, speedscope or inferno
+    loop-blocking.collapsed stacks seen while the asyncio loop was blocked
+    summary.txt             per-stage time and the top-N hot functions
+
+cProfile allows one active profile per thread, so a stage that starts inside
+another (or alongside it, as the orchestrator's concurrent scrapers do) is
+counted in the outer one.
+"""
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from chunk_content import BUILD_DIR
+
+PROFILE_ENV = "CONTENT_PROFILE"
+PROFILE_DIR = BUILD_DIR / "profile"
+SAMPLE_INTERVAL = 0.005
+LOOP_BEAT = 0.01
+# A heartbeat this late means something ran on the loop without yielding.
+LOOP_BLOCKED_AFTER = 0.05
+MAX_DEPTH = 200
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+def _function_label(key: tuple) -> str:
+    filename, line, name = key
+    if filename == "~":
+        return name  # builtins
+    return f"{name} ({Path(filename).name}:{line})"
+
+
+class Profiler:
+    def __init__(self, directory: Path, top: int = 15) -> None:
+        self.directory = Path(directory)
+        self.top = top
+        self.thread_id = threading.get_ident()
+        self.stage_name = "main"
+        self.active: Optional[cProfile.Profile] = None
+        self.stage_seconds: Counter = Counter()
+        self.samples: dict[str, Counter] = {}
+        self.blocking: Counter = Counter()
+        self.loop_lag_max = 0.0
+        self.loop_blocked_seconds = 0.0
+        self._beat: Optional[float] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+        for pattern in ("*.pstats", "*.collapsed"):
+            for stale in self.directory.glob(pattern):
+                stale.unlink()
+        self._sampler = threading.Thread(target=self._sample, name="profile-sampler", daemon=True)
+        self._sampler.start()
+
+    def _stack(self) -> Optional[str]:
+        frame = sys._current_frames().get(self.thread_id)
+        labels = []
+        while frame is not None and len(labels) < MAX_DEPTH:
+            labels.append(_frame_label(frame.f_code))
+            frame = frame.f_back
+        return ";".join(reversed(labels)) if labels else None
+
+    def _sample(self) -> None:
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            stack = self._stack()
+            if stack is None:
+                continue
+            self.samples.setdefault(self.stage_name, Counter())[stack] += 1
+            beat = self._beat
+            if beat is not None and time.perf_counter() - beat > LOOP_BEAT + LOOP_BLOCKED_AFTER:
+                self.blocking[stack] += 1
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        if self.active is not None or threading.get_ident() != self.thread_id:
+            yield
+            return
+        profile = cProfile.Profile()
+        self.active, self.stage_name = profile, name
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            repeated = name in self.stage_seconds
+            self.stage_seconds[name] += time.perf_counter() - started
+            self.active, self.stage_name = None, "main"
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.directory / f"{name}.pstats"
+            # A stage that runs twice keeps both runs.
+            if repeated:
+                stats = pstats.Stats(profile)
+                stats.add(str(path))
+                stats.dump_stats(path)
+            else:
+                profile.dump_stats(path)
+
+    def watch_loop(self) -> None:
+        """Start a heartbeat on the running loop so blocking calls get sampled."""
+
+        async def beat() -> None:
+            while True:
+                self._beat = expected = time.perf_counter()
+                await asyncio.sleep(LOOP_BEAT)
+                lag = time.perf_counter() - expected - LOOP_BEAT
+                self.loop_lag_max = max(self.loop_lag_max, lag)
+                if lag > LOOP_BLOCKED_AFTER:
+                    self.loop_blocked_seconds += lag
+
+        self._heartbeat = asyncio.get_running_loop().create_task(beat(), name="profile-heartbeat")
+
+    def summary(self) -> str:
+        lines = ["Stage time:"]
+        for name, seconds in self.stage_seconds.most_common():
+            lines.append(f"  {name:<24} {seconds:>9.3f} s")
+        if self._heartbeat is not None:
+            lines.append(
+                f"Event loop: max lag {self.loop_lag_max * 1000:.1f} ms, "
+                f"{self.loop_blocked_seconds:.3f} s blocked over {LOOP_BLOCKED_AFTER * 1000:.0f} ms"
+            )
+
+        paths = [str(self.directory / f"{name}.pstats") for name in self.stage_seconds]
+        if paths:
+            stats = pstats.Stats(*paths)
+            hot = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[: self.top]
+            lines.append(f"Top {len(hot)} functions by own time:")
+            lines.append(f"  {'tottime':>9} {'cumtime':>9} {'calls':>9}  function")
+            for key, (_cc, calls, tottime, cumtime, _callers) in hot:
+                lines.append(f"  {tottime:>9.3f} {cumtime:>9.3f} {calls:>9}  {_function_label(key)}")
+        return "\n".join(lines)
+
+    def close(self) -> Path:
+        self._stop.set()
+        self._sampler.join()
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for name, stacks in self.samples.items():
+            with (self.directory / f"{name}.collapsed").open("w", encoding="utf-8") as handle:
+                for stack, count in stacks.most_common():
+                    handle.write(f"{stack} {count}\n")
+        if self.blocking:
+            with (self.directory / "loop-blocking.collapsed").open("w", encoding="utf-8") as handle:
+                for stack, count in self.blocking.most_common():
+                    handle.write(f"{stack} {count}\n")
+        summary = self.summary()
+        (self.directory / "summary.txt").write_text(summary + "\n", encoding="utf-8")
+        print(summary)
+        return self.directory
+
+
+_profiler: Optional[Profiler] = None
+
+
+def start_profile(directory: Path, top: int = 15) -> Profiler:
+    global _profiler
+    _profiler = Profiler(Path(directory), top)
+    return _profiler
+
+
+def start_profile_from_env() -> Optional[Profiler]:
+    directory = os.environ.get(PROFILE_ENV)
+    return start_profile(Path(directory)) if directory else None
+
+
+def stop_profile() -> Optional[Path]:
+    """Write stacks and the summary and disable profiling; returns the directory if it was on."""
+    global _profiler
+    profiler, _profiler = _profiler, None
+    return profiler.close() if profiler is not None else None
+
+
+def watch_loop() -> None:
+    if _profiler is not None:
+        _profiler.watch_loop()
+
+
+@contextmanager
+def profile_stage(name: str) -> Iterator[None]:
+    if _profiler is None:
+        yield
+        return
+    with _profiler.stage(name):
+        yield
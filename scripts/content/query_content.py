@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Query the local rag-content index from the command line."""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from lexical_index import LEXICAL_INDEX, LexicalIndex
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Search rag-content chunks and report per-query latency.")
+    parser.add_argument("queries", nargs="*", help="Queries to run (reads one per line from stdin if omitted)")
+    parser.add_argument("-k", type=int, default=5, help="Number of results per query")
+    parser.add_argument(
+        "--mode",
+        choices=["lexical", "tfidf", "lsa"],
+        default="lexical",
+        help="BM25 over lexical.idx, or cosine over the TF-IDF / LSA vectors",
+    )
+    parser.add_argument("--index", type=Path, default=LEXICAL_INDEX, help="Lexical index file")
+    return parser.parse_args()
+
+
+def open_searcher(args: argparse.Namespace):
+    """Return (n_docs, search) where search(query, k) yields (score, source, heading)."""
+    if args.mode == "lexical":
+        if not args.index.exists():
+            sys.exit(f"Index not found: {args.index} (run update_content.py --index first)")
+        index = LexicalIndex(args.index)
+
+        def search(query: str, k: int):
+            return [
+                (hit.score, hit.record["source"], " > ".join(hit.record["heading_path"]))
+                for hit in index.search(query, k)
+            ]
+
+        return index.n_docs, search
+
+    from vector_index import VECTOR_DIR, VectorIndex
+
+    if not (VECTOR_DIR / "meta.json").exists():
+        sys.exit(f"Vector index not found: {VECTOR_DIR} (run update_content.py --vectors first)")
+    index = VectorIndex(VECTOR_DIR)
+
+    def search(query: str, k: int):
+        return [(hit.score, hit.source, hit.chunk_id) for hit in index.search(query, k, args.mode)]
+
+    return index.n_docs, search
+
+
+def main() -> None:
+    args = parse_args()
+
+    started = time.perf_counter()
+    n_docs, search = open_searcher(args)
+    print(f"Opened {n_docs} chunks ({args.mode}) in {(time.perf_counter() - started) * 1000:.2f} ms")
+
+    queries = args.queries or (line.strip() for line in sys.stdin)
+    for query in queries:
+        if not query:
+            continue
+        started = time.perf_counter()
+        hits = search(query, args.k)
+        elapsed = (time.perf_counter() - started) * 1000
+
+        print(f"\n{query!r}: {len(hits)} hits in {elapsed:.2f} ms")
+        for rank, (score, source, label) in enumerate(hits, start=1):
+            print(f"  {rank}. {score:6.2f}  {source}  [{label or '-'}]")
+
+
+if __name__ == "__main__":
+    main()
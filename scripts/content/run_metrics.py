@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""Per-stage run metrics for the content pipeline.
+
+Instrumented code records into the module-level ``metrics`` collector; the
+entry point wraps each stage in ``metrics.stage(name)`` and calls
+``metrics.write(run)`` at the end. Stages and parses also open trace spans
+(see ``tracing.py``). That produces, under ``METRICS_DIR``:
+
+    <run>.json           report for the latest run
+    <run>.prom           Prometheus textfile-collector format
+    history.ndjson       one report per line, for comparing runs over time
+
+Point node_exporter's ``--collector.textfile.directory`` (or
+``CONTENT_METRICS_DIR``) at the same directory to scrape the ``.prom`` file.
+
+With ``--profile``, each stage also runs under cProfile (see ``profiling.py``).
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, Optional
+from urllib.parse import urlsplit
+
+from chunk_content import BUILD_DIR
+from profiling import profile_stage
+from tracing import span
+
+METRICS_DIR = Path(os.environ.get("CONTENT_METRICS_DIR", BUILD_DIR / "metrics"))
+PREFIX = "topheroes_content"
+
+# A context variable rather than an attribute, so concurrent asyncio tasks
+# each attribute their requests to their own stage.
+_current_stage: ContextVar[str] = ContextVar("metrics_stage", default="main")
+
+
+@dataclass
+class StageMetrics:
+    wall_seconds: float = 0.0
+    requests: Counter = field(default_factory=Counter)  # (host, status) -> count
+    request_seconds: float = 0.0
+    bytes_downloaded: int = 0
+    cache_hits: Counter = field(default_factory=Counter)
+    cache_misses: Counter = field(default_factory=Counter)
+    parse_pages: Counter = field(default_factory=Counter)
+    parse_seconds: Counter = field(default_factory=Counter)
+    parse_max_seconds: dict = field(default_factory=dict)
+    files_written: int = 0
+    files_skipped: int = 0
+
+    def report(self) -> dict:
+        caches = sorted(set(self.cache_hits) | set(self.cache_misses))
+        return {
+            "wall_seconds": round(self.wall_seconds, 4),
+            "requests": [
+                {"host": host, "status": status, "count": count}
+                for (host, status), count in sorted(self.requests.items())
+            ],
+            "request_seconds": round(self.request_seconds, 4),
+            "bytes_downloaded": self.bytes_downloaded,
+            "cache": {
+                name: {
+                    "hits": self.cache_hits[name],
+                    "misses": self.cache_misses[name],
+                    "hit_ratio": _ratio(self.cache_hits[name], self.cache_misses[name]),
+                }
+                for name in caches
+            },
+            "parse": {
+                kind: {
+                    "pages": self.parse_pages[kind],
+                    "seconds": round(self.parse_seconds[kind], 4),
+                    "mean_ms": round(self.parse_seconds[kind] / self.parse_pages[kind] * 1000, 3),
+                    "max_ms": round(self.parse_max_seconds[kind] * 1000, 3),
+                }
+                for kind in sorted(self.parse_pages)
+            },
+            "files": {"written": self.files_written, "skipped": self.files_skipped},
+        }
+
+
+def _ratio(hits: int, misses: int) -> Optional[float]:
+    total = hits + misses
+    return round(hits / total, 4) if total else None
+
+
+def _escape(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: object) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+class RunMetrics:
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.started = time.time()
+        self.status = "ok"
+        self.stages: dict[str, StageMetrics] = {}
+
+    def _stage(self) -> StageMetrics:
+        name = _current_stage.get()
+        if name not in self.stages:
+            self.stages[name] = StageMetrics()
+        return self.stages[name]
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageMetrics]:
+        token = _current_stage.set(name)
+        started = time.perf_counter()
+        try:
+            with span(name, "stage"), profile_stage(name):
+                yield self._stage()
+        finally:
+            self._stage().wall_seconds += time.perf_counter() - started
+            _current_stage.reset(token)
+
+    def request(self, url: str, status: object, nbytes: int = 0, seconds: float = 0.0) -> None:
+        """Record one HTTP request; ``status`` is the code or an error label."""
+        stage = self._stage()
+        stage.requests[(urlsplit(url).hostname or "", str(status))] += 1
+        stage.bytes_downloaded += nbytes
+        stage.request_seconds += seconds
+
+    def cache(self, name: str, hits: int = 0, misses: int = 0) -> None:
+        stage = self._stage()
+        stage.cache_hits[name] += hits
+        stage.cache_misses[name] += misses
+
+    @contextmanager
+    def parse(self, kind: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            with span(kind, "parse"):
+                yield
+        finally:
+            elapsed = time.perf_counter() - started
+            stage = self._stage()
+            stage.parse_pages[kind] += 1
+            stage.parse_seconds[kind] += elapsed
+            stage.parse_max_seconds[kind] = max(stage.parse_max_seconds.get(kind, 0.0), elapsed)
+
+    def files(self, written: int = 0, skipped: int = 0) -> None:
+        stage = self._stage()
+        stage.files_written += written
+        stage.files_skipped += skipped
+
+    def report(self, run: str) -> dict:
+        return {
+            "run": run,
+            "status": self.status,
+            "started": round(self.started, 3),
+            "duration_seconds": round(time.time() - self.started, 4),
+            "stages": {name: stage.report() for name, stage in self.stages.items()},
+        }
+
+    def prometheus(self, report: dict) -> str:
+        run = report["run"]
+        series: dict[str, tuple[str, str, list[str]]] = {}
+
+        def add(name: str, metric_type: str, help_text: str, value: object, **labels: object) -> None:
+            if value is None:
+                return
+            entry = series.setdefault(name, (metric_type, help_text, []))
+            entry[2].append(f"{PREFIX}_{name}{_labels(run=run, **labels)} {value}")
+
+        add("run_timestamp_seconds", "gauge", "Unix time the run started", report["started"])
+        add("run_duration_seconds", "gauge", "Wall time of the whole run", report["duration_seconds"])
+        add("run_success", "gauge", "1 if the run finished without an error", int(report["status"] == "ok"))
+        for stage, data in report["stages"].items():
+            add("stage_duration_seconds", "gauge", "Wall time per stage", data["wall_seconds"], stage=stage)
+            for entry in data["requests"]:
+                add(
+                    "requests_total", "counter", "HTTP requests by host and status",
+                    entry["count"], stage=stage, host=entry["host"], status=entry["status"],
+                )
+            add("request_seconds_total", "counter", "Time spent waiting on HTTP", data["request_seconds"], stage=stage)
+            add("download_bytes_total", "counter", "Response bytes downloaded", data["bytes_downloaded"], stage=stage)
+            for cache, counts in data["cache"].items():
+                add("cache_hits_total", "counter", "Cache hits", counts["hits"], stage=stage, cache=cache)
+                add("cache_misses_total", "counter", "Cache misses", counts["misses"], stage=stage, cache=cache)
+                add("cache_hit_ratio", "gauge", "Cache hit ratio", counts["hit_ratio"], stage=stage, cache=cache)
+            for kind, parse in data["parse"].items():
+                add("parse_pages_total", "counter", "Pages parsed", parse["pages"], stage=stage, kind=kind)
+                add("parse_seconds_total", "counter", "Time spent parsing pages", parse["seconds"], stage=stage, kind=kind)
+            for result, count in data["files"].items():
+                add("files_total", "counter", "Output files written or skipped", count, stage=stage, result=result)
+
+        lines = []
+        for name, (metric_type, help_text, samples) in series.items():
+            lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PREFIX}_{name} {metric_type}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+    def write(self, run: str, directory: Path = METRICS_DIR) -> Path:
+        """Write the JSON report, Prometheus textfile and history line; return the report path."""
+        report = self.report(run)
+        directory.mkdir(parents=True, exist_ok=True)
+        report_path = directory / f"{run}.json"
+        report_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        # The textfile collector may read at any moment, so swap the file in whole.
+        prom_tmp = directory / f".{run}.prom.tmp"
+        prom_tmp.write_text(self.prometheus(report), encoding="utf-8")
+        prom_tmp.replace(directory / f"{run}.prom")
+        with (directory / "history.ndjson").open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(report, separators=(",", ":")) + "\n")
+        return report_path
+
+
+metrics = RunMetrics()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""Version-keyed hero data from topheroes.info's versioned assets.
+
+The site tags its assets with a release number (``/assets/js/hero-profile.js?v=200``,
+``/assets/css/app.css?v=200``), and every hero page embeds the same full
+``HERO_MASTER``. So the hero data mostly changes when the versions do:
+
+- ``asset_versions(html)`` reads the ``?v=`` of every ``/assets/`` script and
+  stylesheet on a page. The hero list's versions, which ``--heroes-json``
+  downloads anyway, name the release.
+- ``load_site_data`` fetches one hero page on every run. Its inline
+  ``HERO_MASTER`` is hashed into the release key with the versions, so an
+  inline edit that keeps the versions still starts a new release.
+- For a release not seen before, it finds the page's data scripts, downloads
+  each once per version (cached in ``.build/site-data/bundles/<name>@<v>.json``)
+  and parses the JSON literals they assign (``const X = {...}``,
+  ``window.X = [...]``). ``HERO_MASTER`` comes from the page or, failing that,
+  from a bundle.
+- The result is saved as ``.build/site-data/<release>.json``. ``crawled``
+  records the hero pages already fetched for this release, so those are not
+  fetched again. Edits that only touch other hero pages (skill cards) change
+  neither key, so a release is dropped once it is older than ``SITE_DATA_TTL``
+  or when ``refresh`` is set (``--refresh-site``), and every page is fetched
+  again.
+
+A page without versioned assets has no release key and nothing is cached.
+"""
+from __future__ import annotations
+
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qs, urljoin, urlsplit
+
+from bs4 import BeautifulSoup
+
+from chunk_content import BUILD_DIR, content_hash
+
+SITE_DATA_DIR = BUILD_DIR / "site-data"
+BUNDLE_CACHE_DIR = SITE_DATA_DIR / "bundles"
+ASSET_PREFIX = "/assets/"
+SITE_DATA_TTL = 24 * 3600
+DECLARATION_RE = re.compile(r"(?:\b(?:const|let|var)\s+|\bwindow\.)([A-Za-z_$][\w$]*)\s*=\s*(?=[\[{])")
+_DECODER = json.JSONDecoder()
+# The release last loaded or saved, by file; a new release replaces it.
+_LOADED: dict[Path, "SiteData"] = {}
+
+
+def asset_versions(html: str, base_url: str) -> dict[str, str]:
+    """``{absolute asset URL without query: version}`` for versioned assets on a page."""
+    soup = BeautifulSoup(html, "html.parser")
+    versions = {}
+    for tag in soup.find_all(["script", "link"]):
+        src = tag.get("src") or tag.get("href")
+        if not src:
+            continue
+        url = urljoin(base_url, src)
+        parts = urlsplit(url)
+        version = parse_qs(parts.query).get("v")
+        if parts.path.startswith(ASSET_PREFIX) and version:
+            versions[f"{parts.scheme}://{parts.netloc}{parts.path}"] = version[0]
+    return versions
+
+
+def release_key(versions: dict[str, str], hero_master: Optional[Any] = None) -> Optional[str]:
+    if not versions:
+        return None
+    return content_hash(json.dumps([sorted(versions.items()), hero_master], sort_keys=True))[:16]
+
+
+def parse_declarations(script: str) -> dict[str, Any]:
+    """JSON literals assigned to top-level names; anything else is skipped."""
+    data = {}
+    for match in DECLARATION_RE.finditer(script):
+        try:
+            value, _end = _DECODER.raw_decode(script, match.end())
+        except json.JSONDecodeError:
+            continue
+        data.setdefault(match.group(1), value)
+    return data
+
+
+def find_hero_master(data: dict[str, Any]) -> Optional[Any]:
+    """``HERO_MASTER`` if declared, else the first value shaped like a hero list."""
+    if "HERO_MASTER" in data:
+        return data["HERO_MASTER"]
+    for value in data.values():
+        if isinstance(value, dict) and isinstance(value.get("heroes"), list):
+            return value
+        if isinstance(value, list) and value and isinstance(value[0], dict) and "hero_id" in value[0]:
+            return value
+    return None
+
+
+class SiteData:
+    def __init__(self, release: str, versions: dict[str, str], hero_master: Optional[Any],
+                 bundles: dict[str, dict], crawled: Optional[set[str]] = None,
+                 directory: Path = SITE_DATA_DIR, built: Optional[float] = None) -> None:
+        self.release = release
+        self.versions = versions
+        self.hero_master = hero_master
+        self.bundles = bundles
+        self.crawled = crawled or set()
+        self.directory = directory
+        self.built = time.time() if built is None else built
+
+    @property
+    def heroes(self) -> list[dict]:
+        master = self.hero_master
+        if isinstance(master, dict):
+            return master.get("heroes") or []
+        return master or []
+
+    @classmethod
+    def load(cls, release: str, directory: Path = SITE_DATA_DIR) -> Optional["SiteData"]:
+        path = directory / f"{release}.json"
+        if not path.exists():
+            return None
+        if path not in _LOADED:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            _LOADED.clear()
+            _LOADED[path] = cls(
+                release, data["versions"], data["hero_master"], data["bundles"], set(data["crawled"]), directory,
+                data.get("built", 0.0),
+            )
+        return _LOADED[path]
+
+    def save(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        data = {
+            "built": self.built,
+            "versions": self.versions,
+            "hero_master": self.hero_master,
+            "bundles": self.bundles,
+            "crawled": sorted(self.crawled),
+        }
+        path = self.directory / f"{self.release}.json"
+        path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        _LOADED.clear()
+        _LOADED[path] = self
+
+
+def fetch_bundle(url: str, version: str, get_text: Callable[[str], Optional[str]],
+                 directory: Path = BUNDLE_CACHE_DIR) -> tuple[Optional[dict[str, Any]], bool]:
+    """Parsed declarations of one script at one version; returns (data, was_cached).
+
+    ``get_text`` returns None when a download fails; nothing is cached then.
+    """
+    path = directory / f"{Path(urlsplit(url).path).name}@{version}.json"
+    if path.exists():
+        return json.loads(path.read_text(encoding="utf-8")), True
+    script = get_text(f"{url}?v={version}")
+    if script is None:
+        return None, False
+    data = parse_declarations(script)
+    directory.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    return data, False
+
+
+def load_site_data(
+    list_html: str,
+    list_url: str,
+    sample_page_url: str,
+    get_text: Callable[[str], Optional[str]],
+    extract_inline: Callable[[str], Optional[Any]],
+    directory: Path = SITE_DATA_DIR,
+    max_age: float = SITE_DATA_TTL,
+    refresh: bool = False,
+) -> tuple[Optional[SiteData], dict]:
+    """Site data for the current release, fetching it if the release is new or stale.
+
+    Returns (data or None, ``{"release", "cached", "requests"}``); None when
+    the list page carries no versioned assets or the sample page fails.
+    """
+    versions = asset_versions(list_html, list_url)
+    stats = {"release": None, "cached": False, "requests": 0}
+    if not versions:
+        return None, stats
+
+    page_html = get_text(sample_page_url)
+    stats["requests"] += 1
+    if page_html is None:
+        return None, stats
+    hero_master = extract_inline(page_html)
+    release = release_key(versions, hero_master)
+    stats["release"] = release
+    site = SiteData.load(release, directory)
+    if site is not None and not refresh and time.time() - site.built < max_age:
+        stats["cached"] = True
+        return site, stats
+
+    bundles = {}
+    for url, version in asset_versions(page_html, sample_page_url).items():
+        if not url.endswith(".js"):
+            continue
+        data, cached = fetch_bundle(url, version, get_text, directory / BUNDLE_CACHE_DIR.name)
+        stats["requests"] += 0 if cached else 1
+        if data is None:
+            continue
+        bundles[Path(urlsplit(url).path).name] = {"version": version, "data": data}
+        if hero_master is None:
+            hero_master = find_hero_master(data)
+
+    site = SiteData(release, versions, hero_master, bundles, directory=directory)
+    site.save()
+    return site, stats
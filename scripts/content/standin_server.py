@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""Synthetic stand-in for topheroes.info and the Fandom wiki, for load testing.
+
+Serves generated pages under the same ``/<host>/<path>`` layout as the replay
+server, so both clients reach it through ``CONTENT_REPLAY_URL`` (or
+``update_content.py --replay-url``)::
+
+    python3 scripts/content/standin_server.py --roster 400 --latency lognormal:80,0.5 \\
+        --error-rate 0.01 --throttle-rate 0.02 --bandwidth 2MB
+    CONTENT_REPLAY_URL=http://127.0.0.1:8766 python3 scripts/scrapers/orchestrator.py
+
+Pages are built from the benchmark fixtures and scale with the roster the
+way the real site does: the hero list has one card per hero and every hero
+page embeds the full ``HERO_MASTER``. Heroes beyond the 50 in the fixture are
+numbered copies (``altar-marshal-2``). The wiki has an article for every hero
+but each ``WIKI_GAP``-th, a redirect to it from its ``hero_id``, and a
+MediaWiki ``api.php`` that lists both. Assets carry ``?v=<release>``
+(``--release``); ``/assets/js/hero-profile.js`` and ``translate-init.js``
+assign JSON data the way the site's bundles do. ``GET /_stats`` returns request counts
+by route and status.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import copy
+import functools
+import hashlib
+import html
+import json
+import math
+import random
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+from urllib.parse import unquote
+
+from http_replay import REPLAY_URL_ENV
+
+FIXTURE_DIR = Path(__file__).resolve().parent / "bench" / "fixtures"
+SITE_HOST = "topheroes.info"
+FANDOM_HOST = "topheroes1.fandom.com"
+FACTIONS = ("League", "Horde", "Nature")
+CHUNK_SIZE = 16 * 1024
+IMAGE_BYTES = 12 * 1024
+WIKI_GAP = 10
+
+
+def _fixture(name: str) -> str:
+    return (FIXTURE_DIR / name).read_text(encoding="utf-8")
+
+
+class LatencyModel:
+    """Per-response delay in ms.
+
+    ``40`` (fixed), ``20-80`` (uniform), ``lognormal:MEDIAN,SIGMA`` or
+    ``exp:MEAN``. The bare forms match ``--replay-latency``.
+    """
+
+    def __init__(self, spec: str = "0") -> None:
+        self.spec = spec
+        kind, _, params = spec.partition(":")
+        if not params:
+            if "-" in kind:
+                low, high = (float(value) for value in kind.split("-", 1))
+                self.kind, self.params = "uniform", (low, high)
+            else:
+                self.kind, self.params = "fixed", (float(kind),)
+        elif kind in ("lognormal", "exp"):
+            self.kind, self.params = kind, tuple(float(value) for value in params.split(","))
+        else:
+            raise ValueError(f"Unknown latency distribution: {spec}")
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return rng.uniform(*self.params)
+        if self.kind == "lognormal":
+            median, sigma = self.params
+            return rng.lognormvariate(math.log(median), sigma)
+        if self.kind == "exp":
+            return rng.expovariate(1 / self.params[0])
+        return self.params[0]
+
+    def __repr__(self) -> str:
+        return f"LatencyModel({self.spec!r})"
+
+
+def parse_bandwidth(value: str) -> Optional[float]:
+    """argparse type: bytes per second, with an optional KB/MB suffix; 0 disables the cap."""
+    match = re.fullmatch(r"([\d.]+)\s*([KM]?)B?(?:/s)?", value.strip(), re.IGNORECASE)
+    if not match:
+        raise argparse.ArgumentTypeError(f"Invalid bandwidth: {value}")
+    scale = {"": 1, "K": 1024, "M": 1024 * 1024}[match.group(2).upper()]
+    rate = float(match.group(1)) * scale
+    return rate or None
+
+
+@dataclass
+class StandinConfig:
+    roster: int = 50
+    release: int = 200
+    latency: LatencyModel = field(default_factory=LatencyModel)
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    bandwidth: Optional[float] = None  # bytes per second per response
+    seed: int = 0
+
+
+@dataclass
+class StandinStats:
+    requests: Counter = field(default_factory=Counter)  # (route, status) -> count
+    bytes_sent: int = 0
+
+    def report(self) -> dict:
+        return {
+            "requests": [
+                {"route": route, "status": status, "count": count}
+                for (route, status), count in sorted(self.requests.items())
+            ],
+            "total": sum(self.requests.values()),
+            "bytes_sent": self.bytes_sent,
+        }
+
+
+def _seed_heroes() -> list[dict]:
+    page = _fixture("hero_page.html")
+    match = re.search(r"const\s+HERO_MASTER\s*=\s*({.*?});", page, re.DOTALL)
+    return json.loads(match.group(1))["heroes"]
+
+
+@functools.lru_cache(maxsize=8)
+def build_roster(size: int) -> tuple[dict, ...]:
+    """``size`` heroes: the fixture roster, then numbered copies of it."""
+    seed = _seed_heroes()
+    with_skills = [hero for hero in seed if hero["skills"]]
+    roster = []
+    for number in range(size):
+        template = seed[number % len(seed)]
+        copy_number = number // len(seed) + 1
+        hero = copy.deepcopy(template)
+        if copy_number > 1:
+            hero["hero_name"] = f"{template['hero_name']} {copy_number}"
+            hero["slug"] = f"{template['slug']}-{copy_number}"
+            hero["hero_id"] = f"{template['hero_id']}{copy_number}"
+            if not hero["skills"]:
+                hero["skills"] = copy.deepcopy(with_skills[number % len(with_skills)]["skills"])
+        roster.append(hero)
+    return tuple(roster)
+
+
+class StandinSite:
+    """Generates and caches the pages for one roster size and release."""
+
+    def __init__(self, roster: int, release: int = 200) -> None:
+        self.release = release
+        self.heroes = build_roster(roster)
+        self.by_slug = {hero["slug"]: hero for hero in self.heroes}
+        self.by_image = {hero["hero_id"]: hero for hero in self.heroes}
+        self.master = json.dumps({"version": release, "heroes": list(self.heroes)}, ensure_ascii=False)
+        self.hero_list = self._hero_list().encode("utf-8")
+        self.guide = _fixture("hero_guide.html").encode("utf-8")
+        self._article = _fixture("fandom_article.html")
+        self._pages: dict[str, bytes] = {}
+        self.wiki_titles = [
+            hero["hero_name"] for number, hero in enumerate(self.heroes, 1) if number % WIKI_GAP
+        ]
+        self.wiki_redirects = {
+            hero["hero_id"]: hero["hero_name"] for number, hero in enumerate(self.heroes, 1) if number % WIKI_GAP
+        }
+
+    def _hero_list(self) -> str:
+        sections = []
+        for faction in FACTIONS:
+            cards = []
+            for hero in self.heroes:
+                if hero["faction"] != faction:
+                    continue
+                name = html.escape(hero["hero_name"])
+                cards.append(
+                    f'<div class="hero-card rounded-lg shadow" data-rarity="{hero["rarity"].lower()}">'
+                    f'<a href="/hero/{hero["slug"]}" class="block">'
+                    f'<img src="/assets/heroes/{hero["hero_id"]}.webp" alt="{name}" loading="lazy">'
+                    f'<span class="text-sm font-bold text-slate-900">{name}</span></a>'
+                    f'<div class="meta"><span class="badge">{faction}</span><span class="badge">{hero["rarity"]}</span>'
+                    f'<span class="badge">{hero["role"]}</span></div></div>'
+                )
+            sections.append(
+                f'<section class="faction" data-faction="{faction.lower()}"><h2 class="text-2xl">{faction}</h2>'
+                f'<div class="grid grid-cols-4 gap-4">\n' + "\n".join(cards) + "\n</div></section>"
+            )
+        return (
+            '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>Top Heroes - All Heroes</title>\n'
+            f'<link rel="stylesheet" href="/assets/css/app.css?v={self.release}"></head><body>\n'
+            '<nav class="bg-slate-900"><a href="/">Home</a><a href="/hero.php">Heroes</a>'
+            '<a href="/hero-guide.php">Guides</a><a href="/tier-list.php">Tier List</a></nav>\n'
+            '<main class="container mx-auto px-4">\n<h1 class="text-3xl font-bold">All Heroes</h1>\n'
+            + "\n".join(sections)
+            + "\n</main><footer><p>Fan site. Not affiliated with the game publisher.</p></footer></body></html>"
+        )
+
+    def hero_page(self, slug: str) -> Optional[bytes]:
+        hero = self.by_slug.get(slug)
+        if hero is None:
+            return None
+        if slug not in self._pages:
+            name = html.escape(hero["hero_name"])
+            cards = "\n".join(
+                f'<div class="skill-card"><p class="text-sm font-bold text-slate-900">{html.escape(skill["name"])}</p>'
+                f'<p class="text-xs">{skill["type"]}</p><p>{html.escape(skill["base_description"])}</p></div>'
+                for skill in hero["skills"]
+            )
+            page = (
+                f'<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">\n<title>{name} - Top Heroes</title>\n'
+                f'<script src="/assets/js/translate-init.js?v={self.release}"></script></head><body>\n'
+                '<nav class="bg-slate-900"><a href="/">Home</a><a href="/hero.php">Heroes</a></nav>\n'
+                f'<main id="hero-profile" data-hero="{slug}"><h1 class="text-3xl font-bold">{name}</h1>\n'
+                f'<div id="skills">\n{cards}\n</div></main>\n<script>\n'
+                "window.dataLayer = window.dataLayer || [];\n"
+                f"const HERO_MASTER = {self.master};\n"
+                f'const CURRENT_HERO = "{slug}";\n</script>\n'
+                f'<script src="/assets/js/hero-profile.js?v={self.release}"></script></body></html>'
+            )
+            self._pages[slug] = page.encode("utf-8")
+        return self._pages[slug]
+
+    def bundle(self, name: str) -> Optional[bytes]:
+        """A data script: JSON literals assigned to globals, as the site ships them."""
+        if name == "translate-init.js":
+            data = {"default": "en", "languages": ["en", "de", "fr", "es", "pt"], "release": self.release}
+            return f"window.I18N_CONFIG = {json.dumps(data)};\n".encode("utf-8")
+        if name == "hero-profile.js":
+            config = {"release": self.release, "factions": list(FACTIONS), "skill_slots": 4}
+            return (
+                f"const PROFILE_CONFIG = {json.dumps(config)};\n"
+                "document.addEventListener('DOMContentLoaded', function () { renderProfile(CURRENT_HERO); });\n"
+            ).encode("utf-8")
+        return None
+
+    def fandom_article(self, title: str) -> Optional[bytes]:
+        name = title.replace("_", " ")
+        name = self.wiki_redirects.get(name, name)
+        if name not in self.wiki_titles:
+            return None
+        return self._article.replace("Adjudicator", html.escape(name)).encode("utf-8")
+
+    def fandom_api(self, query: dict) -> bytes:
+        """The two MediaWiki queries the title index makes, in one page each."""
+        if query.get("list") == "allpages":
+            pages = [{"pageid": number, "ns": 0, "title": title} for number, title in enumerate(self.wiki_titles, 1)]
+            data = {"batchcomplete": "", "query": {"allpages": pages}}
+        elif query.get("generator") == "allpages":
+            redirects = [{"from": source, "to": target} for source, target in self.wiki_redirects.items()]
+            data = {"batchcomplete": "", "query": {"redirects": redirects}}
+        else:
+            data = {"error": {"code": "badquery", "info": "Unsupported query"}}
+        return json.dumps(data).encode("utf-8")
+
+    def image(self, name: str) -> Optional[bytes]:
+        if name not in self.by_image:
+            return None
+        # Deterministic filler behind a RIFF/WEBP header, sized like a portrait.
+        digest = hashlib.sha256(name.encode("utf-8")).digest()
+        body = (digest * (IMAGE_BYTES // len(digest) + 1))[: IMAGE_BYTES - 12]
+        return b"RIFF" + (len(body) + 4).to_bytes(4, "little") + b"WEBP" + body
+
+
+def route(host: str, path: str) -> str:
+    """Coarse route label used in stats: ``hero_list``, ``hero_page``, ``fandom`` ..."""
+    if host == FANDOM_HOST:
+        if path == "api.php":
+            return "fandom_api"
+        return "fandom" if path.startswith("wiki/") else "other"
+    if host != SITE_HOST:
+        return "other"
+    if path == "hero.php":
+        return "hero_list"
+    if path == "hero-guide.php":
+        return "guide"
+    if path.startswith("hero/"):
+        return "hero_page"
+    if path.startswith("assets/heroes/"):
+        return "image"
+    if path.startswith("assets/js/"):
+        return "bundle"
+    return "other"
+
+
+def create_app(config: StandinConfig):
+    """aiohttp application; ``app["config"]`` may be changed between runs."""
+    from aiohttp import web
+
+    rng = random.Random(config.seed)
+    stats = StandinStats()
+    sites: dict[tuple[int, int], StandinSite] = {}
+
+    def site() -> StandinSite:
+        key = (app["config"].roster, app["config"].release)
+        if key not in sites:
+            sites[key] = StandinSite(*key)
+        return sites[key]
+
+    def resolve(host: str, path: str, query: dict) -> tuple[Optional[bytes], str]:
+        current = site()
+        kind = route(host, path)
+        if kind == "hero_list":
+            return current.hero_list, "text/html; charset=utf-8"
+        if kind == "guide":
+            return current.guide, "text/html; charset=utf-8"
+        if kind == "hero_page":
+            return current.hero_page(path.split("/", 1)[1]), "text/html; charset=utf-8"
+        if kind == "fandom":
+            return current.fandom_article(unquote(path.split("/", 1)[1])), "text/html; charset=utf-8"
+        if kind == "fandom_api":
+            return current.fandom_api(query), "application/json"
+        if kind == "image":
+            stem, _, ext = path.rsplit("/", 1)[1].partition(".")
+            return (current.image(stem) if ext == "webp" else None), "image/webp"
+        if kind == "bundle":
+            return current.bundle(path.rsplit("/", 1)[1]), "application/javascript"
+        return None, "text/plain"
+
+    async def send(request: "web.Request", status: int, body: bytes, content_type: str, headers=None):
+        response = web.StreamResponse(status=status, headers=headers)
+        response.content_type, _, charset = content_type.partition("; charset=")
+        if charset:
+            response.charset = charset
+        response.content_length = len(body)
+        await response.prepare(request)
+        bandwidth = app["config"].bandwidth
+        for start in range(0, len(body), CHUNK_SIZE):
+            chunk = body[start : start + CHUNK_SIZE]
+            if bandwidth:
+                # Hold each chunk for its transfer time at the capped rate.
+                await asyncio.sleep(len(chunk) / bandwidth)
+            await response.write(chunk)
+            stats.bytes_sent += len(chunk)
+        await response.write_eof()
+        return response
+
+    async def handle(request: "web.Request") -> "web.StreamResponse":
+        current = app["config"]
+        host, _, path = request.match_info["tail"].partition("/")
+        kind = route(host, path)
+        delay = current.latency.sample(rng)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        roll = rng.random()
+        if roll < current.throttle_rate:
+            status, body, headers = 429, b"Too Many Requests", {"Retry-After": "1"}
+            content_type = "text/plain"
+        elif roll < current.throttle_rate + current.error_rate:
+            status, body, headers = 500, b"Internal Server Error", None
+            content_type = "text/plain"
+        else:
+            body, content_type = resolve(host, path, dict(request.query))
+            status, headers = (200, None) if body is not None else (404, None)
+            body = body if body is not None else b"Not Found"
+        stats.requests[(kind, status)] += 1
+        return await send(request, status, body, content_type, headers)
+
+    async def handle_stats(request: "web.Request") -> "web.Response":
+        return web.json_response(stats.report())
+
+    app = web.Application()
+    app["config"] = config
+    app["stats"] = stats
+    app.router.add_get("/_stats", handle_stats)
+    app.router.add_route("*", "/{tail:.*}", handle)
+    return app
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--latency",
+        type=LatencyModel,
+        default=LatencyModel("0"),
+        help="Delay per response in ms: 40, 20-80, lognormal:MEDIAN,SIGMA or exp:MEAN",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of responses that are HTTP 500")
+    parser.add_argument(
+        "--throttle-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of responses that are HTTP 429 with Retry-After",
+    )
+    parser.add_argument(
+        "--bandwidth",
+        type=parse_bandwidth,
+        default=None,
+        help="Per-response transfer cap, e.g. 512KB or 2MB (per second)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed for latency and error sampling")
+    parser.add_argument("--release", type=int, default=200, help="Asset version (?v=) the site serves")
+
+
+def config_from_args(args: argparse.Namespace, roster: int) -> StandinConfig:
+    return StandinConfig(
+        roster=roster,
+        release=args.release,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        bandwidth=args.bandwidth,
+        seed=args.seed,
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve synthetic topheroes.info and Fandom pages for load tests.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--roster", type=int, default=50, help="Heroes on the list page and in HERO_MASTER")
+    add_config_arguments(parser)
+    return parser.parse_args()
+
+
+def main() -> None:
+    from aiohttp import web
+
+    args = parse_args()
+    print(f"Serving a {args.roster}-hero stand-in on http://{args.host}:{args.port}")
+    print(f"  e.g. {REPLAY_URL_ENV}=http://{args.host}:{args.port}")
+    web.run_app(create_app(config_from_args(args, args.roster)), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
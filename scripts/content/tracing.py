@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""Nested span tracing in Chrome trace-event JSON (opens in Perfetto or chrome://tracing).
+
+Tracing is off unless ``start_trace(path)`` is called, either by ``--trace FILE`` or
+by the ``CONTENT_TRACE`` environment variable. While it is off, ``span()``
+returns a shared no-op object, so instrumented code pays one global lookup
+per call.
+
+    with span("GET", "http", url=url) as s:
+        response = ...
+        s.set(status=response.status_code)
+
+Spans become complete (``"ph": "X"``) events. Each asyncio task gets its own
+track, so spans from concurrent fetches nest correctly.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar
+
+TRACE_ENV = "CONTENT_TRACE"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+    def set(self, **args: Any) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start", "lane")
+
+    def __init__(self, tracer: "Tracer", name: str, cat: str, args: dict) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def set(self, **args: Any) -> None:
+        self.args.update(args)
+
+    def __enter__(self) -> "Span":
+        self.lane = self.tracer.lane()
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type: Optional[type], *exc: object) -> None:
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.complete(self.name, self.cat, self.start, end, self.lane, self.args)
+
+
+class Tracer:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.origin = time.perf_counter_ns()
+        self.pid = os.getpid()
+        self.events: list[dict] = []
+        self._lanes: dict[object, int] = {}
+        self._lock = threading.Lock()
+
+    def lane(self) -> int:
+        """Return a track id: one per asyncio task, otherwise one per thread."""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        key = task if task is not None else threading.get_ident()
+        lane = self._lanes.get(key)
+        if lane is None:
+            with self._lock:
+                lane = self._lanes.setdefault(key, len(self._lanes) + 1)
+                label = task.get_name() if task is not None else threading.current_thread().name
+                self.events.append(
+                    {"ph": "M", "name": "thread_name", "pid": self.pid, "tid": lane, "args": {"name": label}}
+                )
+        return lane
+
+    def complete(self, name: str, cat: str, start: int, end: int, lane: int, args: dict) -> None:
+        self.events.append(
+            {
+                "ph": "X",
+                "name": name,
+                "cat": cat,
+                "ts": (start - self.origin) / 1000,
+                "dur": (end - start) / 1000,
+                "pid": self.pid,
+                "tid": lane,
+                "args": args,
+            }
+        )
+
+    def write(self) -> Path:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"traceEvents": self.events, "displayTimeUnit": "ms"}
+        self.path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+        return self.path
+
+
+_tracer: Optional[Tracer] = None
+
+
+def start_trace(path: Path) -> Tracer:
+    global _tracer
+    _tracer = Tracer(Path(path))
+    return _tracer
+
+
+def start_trace_from_env() -> Optional[Tracer]:
+    path = os.environ.get(TRACE_ENV)
+    return start_trace(Path(path)) if path else None
+
+
+def stop_trace() -> Optional[Path]:
+    """Write the trace file and disable tracing; returns the path if tracing was on."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer.write() if tracer is not None else None
+
+
+def span(name: str, cat: str = "pipeline", **args: Any) -> Any:
+    if _tracer is None:
+        return _NULL_SPAN
+    return Span(_tracer, name, cat, args)
+
+
+def traced(cat: str, name: Optional[str] = None) -> Callable[[F], F]:
+    """Decorator form of ``span`` for functions called on hot paths."""
+
+    def decorate(func: F) -> F:
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with Span(_tracer, label, cat, {}):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def aiohttp_trace_configs() -> list:
+    """TraceConfigs that split aiohttp requests into DNS, connect and request spans.
+
+    Returns an empty list when tracing is off, so sessions carry no hooks.
+    """
+    if _tracer is None:
+        return []
+    import aiohttp
+
+    def pair(phase: str, label: str):
+        async def on_start(session, ctx, params) -> None:
+            setattr(ctx, phase, (time.perf_counter_ns(), _tracer.lane() if _tracer else 0))
+
+        async def on_end(session, ctx, params) -> None:
+            started = getattr(ctx, phase, None)
+            if _tracer is None or started is None:
+                return
+            args = {}
+            host = getattr(params, "host", None) or getattr(getattr(params, "url", None), "host", None)
+            if host:
+                args["host"] = host
+            if getattr(params, "response", None) is not None:
+                args["status"] = params.response.status
+            _tracer.complete(label, "http", started[0], time.perf_counter_ns(), started[1], args)
+
+        return on_start, on_end
+
+    config = aiohttp.TraceConfig()
+    dns_start, dns_end = pair("dns", "dns")
+    config.on_dns_resolvehost_start.append(dns_start)
+    config.on_dns_resolvehost_end.append(dns_end)
+    connect_start, connect_end = pair("connect", "connect (tcp+tls)")
+    config.on_connection_create_start.append(connect_start)
+    config.on_connection_create_end.append(connect_end)
+    request_start, request_end = pair("request", "request (to headers)")
+    config.on_request_start.append(request_start)
+    config.on_request_end.append(request_end)
+    return [config]
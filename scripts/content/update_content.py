@@ -2,27 +2,54 @@
 from __future__ import annotations
 
 import argparse
+import contextvars
 import json
+import os
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Iterable, Optional
+from urllib.parse import quote
 
 import requests
 from bs4 import BeautifulSoup
 
+from build_stages import run_build_stages
+from chunk_content import DEFAULT_MAX_TOKENS, DEFAULT_OVERLAP, content_hash
+from crawl_journal import CrawlJournal
+from fandom_titles import TitleIndex
+from guide_specs import GuidePage, extract_sections, load_guide_specs
+from hero_columnar import COLUMNAR_FILE, write_columnar
+from hero_merge import (
+    MERGE_DIR,
+    fandom_snapshot,
+    load_roster,
+    load_snapshots,
+    master_snapshot,
+    merge_heroes,
+    parse_skill_cards,
+    snapshot_path,
+    store_snapshot,
+    write_roster,
+)
+from hero_store import HERO_DATA_DIR, HEROES_JSON, write_heroes
+from http_replay import REPLAY_URL_ENV, install as install_http_adapter, parse_latency
+from markdown_emitter import MarkdownWriter
+from profiling import PROFILE_DIR, PROFILE_ENV, start_profile, stop_profile
+from run_metrics import METRICS_DIR, metrics
+from site_data import load_site_data
+from tracing import TRACE_ENV, span, start_trace, stop_trace, traced
+
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 RAG_DIR = PROJECT_ROOT / "rag-content"
 HERO_RAG_DIR = RAG_DIR / "heroes"
-MECHANICS_DIR = RAG_DIR / "mechanics"
-META_DIR = RAG_DIR / "meta"
-HEROES_JSON = PROJECT_ROOT / "src" / "data" / "heroes.json"
 HERO_IMAGES_DIR = PROJECT_ROOT / "public" / "img" / "heroes"
 
 TOPHEROES_BASE = "https://topheroes.info"
 TOPHEROES_HERO_LIST = f"{TOPHEROES_BASE}/hero.php"
-TOPHEROES_GUIDE = f"{TOPHEROES_BASE}/hero-guide.php"
 FANDOM_BASE = "https://topheroes1.fandom.com/wiki/"
+GUIDE_WORKERS = 4
 
 HEADERS = {
     "User-Agent": (
@@ -32,15 +59,45 @@ HEADERS = {
     )
 }
 
+# One pooled session for every fetch; --record/--replay mount adapters on it.
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
 
-def clean_text(text: Optional[str]) -> str:
-    if not text:
-        return ""
-    return text.strip().replace('"', "'").replace("\n", " ")
+
+def http_get(url: str, timeout: int = 20) -> requests.Response:
+    """GET with the shared headers, recording the request in the run metrics.
+
+    The body is streamed so the trace can separate time-to-headers
+    (DNS, connect, TLS, server) from the body download.
+    """
+    started = time.perf_counter()
+    with span("GET", "http", url=url) as trace:
+        try:
+            with span("http.headers", "http"):
+                response = SESSION.get(url, timeout=timeout, stream=True)
+            with span("http.body", "http"):
+                body = response.content
+        except requests.RequestException as exc:
+            metrics.request(url, type(exc).__name__, seconds=time.perf_counter() - started)
+            raise
+        trace.set(status=response.status_code, bytes=len(body))
+    metrics.request(url, response.status_code, len(body), time.perf_counter() - started)
+    return response
+
+
+def write_output(path: Path, data: str | bytes) -> None:
+    """Write a generated file, creating its directory; traced and counted."""
+    with span("write", "io", path=str(path), bytes=len(data)):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(data, bytes):
+            path.write_bytes(data)
+        else:
+            path.write_text(data, encoding="utf-8")
+    metrics.files(written=1)
 
 
 def request_text(url: str, timeout: int = 20) -> str:
-    response = requests.get(url, headers=HEADERS, timeout=timeout)
+    response = http_get(url, timeout=timeout)
     response.raise_for_status()
     return response.text
 
@@ -58,19 +115,22 @@ def download_image(hero_slug: str, web_slug: str) -> str:
             filename = f"{web_slug}.{ext}"
             filepath = HERO_IMAGES_DIR / filename
             if filepath.exists() and filepath.stat().st_size > 1000:
+                metrics.cache("images", hits=1)
                 return f"/img/heroes/{filename}"
 
             url = f"{TOPHEROES_BASE}/assets/heroes/{name}.{ext}"
             try:
-                resp = requests.get(url, headers=HEADERS, timeout=20)
+                resp = http_get(url)
                 if resp.status_code == 200:
-                    filepath.write_bytes(resp.content)
+                    write_output(filepath, resp.content)
+                    metrics.cache("images", misses=1)
                     return f"/img/heroes/{filename}"
             except requests.RequestException:
                 continue
     return "/img/heroes/placeholder.png"
 
 
+@traced("parse")
 def extract_json_from_html(content: str) -> Optional[Any]:
     match = re.search(r"const\s+HERO_MASTER\s*=\s*({.*?});", content, re.DOTALL)
     if match:
@@ -93,247 +153,308 @@ def extract_json_from_html(content: str) -> Optional[Any]:
     return None
 
 
-def detect_faction_from_link(link: Any) -> str:
-    link_text = link.get_text().strip()
-    context_text = link_text
-    parent_div = link.find_parent("div")
-    if parent_div:
-        context_text += " " + parent_div.get_text()
-
-    if "Nature" in context_text:
-        return "Nature"
-    if "Horde" in context_text:
-        return "Horde"
-    if "League" in context_text:
-        return "League"
-    return "Unknown"
-
-
-def normalize_hero(hero: dict, web_slug: str, detected_faction: str) -> dict:
-    hero_id = hero.get("hero_id", hero.get("id", web_slug)).replace("-", "").lower()
-    name = hero.get("hero_name", hero.get("name", web_slug.replace("-", " ").title()))
-    faction = hero.get("faction", detected_faction)
-    rarity = hero.get("rarity", "Legendary")
-    role = hero.get("role", "DPS")
-
-    skills = []
-    for skill in hero.get("skills", []) or []:
-        skills.append(
-            {
-                "name": skill.get("name", "Unknown"),
-                "type": skill.get("type", "Passive"),
-                "description": clean_text(skill.get("base_description", "")),
-                "tips": clean_text(skill.get("tips", "")),
-            }
-        )
+FACTIONS = ("League", "Horde", "Nature")
+RARITIES = ("Mythic", "Legendary", "Epic", "Rare")
+HEADINGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+
+
+def _card_of(link: Any) -> Any:
+    """Nearest ancestor that looks like a hero card, else the link's parent."""
+    for parent in link.parents:
+        classes = parent.get("class") or []
+        if any("card" in name for name in classes):
+            return parent
+        if parent.name in ("section", "main", "body"):
+            break
+    return link.parent
+
+
+@traced("parse")
+def build_hero_index(soup: BeautifulSoup) -> dict[str, dict]:
+    """Map each ``/hero/<slug>`` link on the list page to its faction and rarity.
+
+    Walks the page once. Faction section headers (or ``data-faction``) set the
+    faction for the links that follow; a faction or rarity badge inside a
+    link's own card overrides it. Entries keep page order:
+    ``{slug: {"href", "name", "faction", "rarity"}}``.
+    """
+    index: dict[str, dict] = {}
+    section_faction = "Unknown"
+    entry: Optional[dict] = None
+    card = None
+    badges: set[str] = set()
+
+    for element in soup.find_all(True):
+        section = (element.get("data-faction") or "").title()
+        if section in FACTIONS:
+            section_faction, entry = section, None
+        elif element.name in HEADINGS:
+            heading = element.get_text(strip=True)
+            if heading in FACTIONS:
+                section_faction, entry = heading, None
+
+        if element.name == "a":
+            href = element.get("href")
+            if isinstance(href, list):
+                href = href[0]
+            if href and "/hero/" in href:
+                slug = href.split("/hero/", 1)[1].split("?")[0].strip("/")
+                if not slug or slug in index:
+                    entry = None
+                    continue
+                card = _card_of(element)
+                rarity = (card.get("data-rarity") or "").title() if card is not None else ""
+                entry = {
+                    "href": href,
+                    "name": element.get_text(strip=True),
+                    "faction": section_faction,
+                    "rarity": rarity if rarity in RARITIES else None,
+                }
+                index[slug] = entry
+                badges = set()
+                continue
 
-    gear_data = hero.get("gear") or {}
-    gear_set = gear_data.get("default_set_name", "None")
-    positions = hero.get("positions") or []
-    unique_weapon = hero.get("unique_weapon", "None")
-
-    image_path = download_image(hero_id, web_slug)
-
-    return {
-        "id": web_slug,
-        "game_id": hero_id,
-        "name": name,
-        "faction": faction,
-        "rarity": rarity,
-        "role": role,
-        "image": image_path,
-        "gear_set": gear_set,
-        "unique_weapon": unique_weapon,
-        "positions": positions,
-        "skills": skills,
-    }
+        # Badges: leaf text that names a faction or rarity, inside the current card.
+        if entry is None or element.string is None:
+            continue
+        text = element.string.strip()
+        field = "faction" if text in FACTIONS else "rarity" if text in RARITIES else None
+        if field and field not in badges and any(parent is card for parent in element.parents):
+            entry[field] = text
+            badges.add(field)
+
+    return index
+
+
+def listing_snapshot(master: dict, web_slug: str, hero_index: dict[str, dict]) -> dict:
+    """What hero.php says about a hero, plus its downloaded portrait."""
+    listing = hero_index.get(web_slug, {})
+    snapshot = {field: listing[field] for field in ("name", "faction", "rarity") if listing.get(field)}
+    if snapshot.get("faction") == "Unknown":
+        del snapshot["faction"]
+    game_id = master.get("game_id", web_slug.replace("-", "").lower())
+    snapshot["image"] = download_image(game_id, web_slug)
+    return snapshot
+
+
+def match_master_hero(json_data: Any, web_slug: str, listing_name: str) -> Optional[dict]:
+    """The ``HERO_MASTER`` entry for a list-page hero: by id or slug, then by name."""
+    heroes_list: Iterable[dict] = []
+    if isinstance(json_data, list):
+        heroes_list = json_data
+    elif isinstance(json_data, dict) and "heroes" in json_data:
+        heroes_list = json_data["heroes"]
+    if not heroes_list:
+        return None
+
+    simple_slug = web_slug.replace("-", "").lower()
+    for hero in heroes_list:
+        hero_id = hero.get("hero_id", hero.get("id", "")).replace("-", "").lower()
+        hero_slug = hero.get("slug", "").replace("-", "").lower()
+        if hero_id == simple_slug or hero_slug == simple_slug:
+            return hero
+
+    link_text = listing_name.lower()
+    for hero in heroes_list:
+        hero_name = hero.get("hero_name", hero.get("name", "")).lower()
+        if hero_name and hero_name in link_text:
+            return hero
+    return None
 
 
-def update_heroes_json(delay: float) -> int:
+def fetch_text_or_none(url: str) -> Optional[str]:
+    try:
+        return request_text(url)
+    except requests.RequestException as exc:
+        print(f"  Could not fetch {url}: {exc}")
+        return None
+
+
+# Parsed hero.php keyed by page hash; only the latest page is kept.
+_HERO_INDEX_CACHE: dict[str, dict[str, dict]] = {}
+
+
+def update_heroes_json(delay: float, resume: bool = False, refresh_site: bool = False) -> int:
+    """Crawl hero.php and every hero page into master, listing and html snapshots.
+
+    Hero pages already crawled for the current site release (see site_data.py)
+    are not fetched again; their master data comes from the release cache.
+    ``refresh_site`` drops that cache and fetches every page.
+    """
+    journal = CrawlJournal("heroes-json")
+    if not resume:
+        journal.reset()
+    completed = journal.completed()
+    if completed:
+        print(f"Resuming: {len(completed)} heroes already journaled")
+
     print("Fetching hero list...")
     html = request_text(TOPHEROES_HERO_LIST)
-    soup = BeautifulSoup(html, "html.parser")
-    links = soup.find_all("a", href=re.compile(r"/hero/"))
-
-    processed_slugs: set[str] = set()
-    all_heroes: list[dict] = []
+    page_key = content_hash(html)
+    hero_index = _HERO_INDEX_CACHE.get(page_key)
+    metrics.cache("hero_list", hits=int(hero_index is not None), misses=int(hero_index is None))
+    if hero_index is None:
+        with metrics.parse("hero_list"):
+            soup = BeautifulSoup(html, "html.parser")
+            hero_index = build_hero_index(soup)
+        _HERO_INDEX_CACHE.clear()
+        _HERO_INDEX_CACHE[page_key] = hero_index
+
+    site = None
+    if hero_index:
+        first = next(iter(hero_index.values()))
+        site, site_stats = load_site_data(
+            html,
+            TOPHEROES_HERO_LIST,
+            f"{TOPHEROES_BASE}/{first['href'].lstrip('/')}",
+            fetch_text_or_none,
+            extract_json_from_html,
+            refresh=refresh_site,
+        )
+        if site is None:
+            print("No site release found; crawling every hero page")
+        else:
+            state = "cached" if site_stats["cached"] else f"fetched with {site_stats['requests']} requests"
+            print(f"Site release {site.release} ({state}, {len(site.crawled)} hero pages already crawled)")
+        metrics.cache("site_data", hits=int(site_stats["cached"]), misses=int(not site_stats["cached"]))
+
+    with journal:
+        for web_slug, listing in hero_index.items():
+            if web_slug in completed:
+                metrics.cache("journal", hits=1)
+                continue
+            metrics.cache("journal", misses=1)
+
+            full_url = f"{TOPHEROES_BASE}/{listing['href'].lstrip('/')}"
+            cached_page = (
+                site is not None
+                and site.hero_master is not None
+                and web_slug in site.crawled
+                and snapshot_path("html", web_slug).exists()
+            )
+            metrics.cache("hero_pages", hits=int(cached_page), misses=int(not cached_page))
 
-    for link in links:
-        href = link.get("href")
-        if isinstance(href, list):
-            href = href[0]
-        if not href:
-            continue
+            try:
+                sources: list[tuple[str, dict]] = []
+                if cached_page:
+                    json_data = site.hero_master
+                else:
+                    print(f"Processing {web_slug}...")
+                    page_html = request_text(full_url)
+                    with metrics.parse("hero_page"):
+                        json_data = extract_json_from_html(page_html)
+                    with metrics.parse("skill_cards"):
+                        sources.append(("html", parse_skill_cards(page_html)))
+
+                master = master_snapshot(match_master_hero(json_data, web_slug, listing["name"]) or {})
+                sources[:0] = [
+                    ("master", master),
+                    ("listing", listing_snapshot(master, web_slug, hero_index)),
+                ]
+                changed = [source for source, data in sources if store_snapshot(source, web_slug, data)]
+                metrics.cache("snapshots", hits=len(sources) - len(changed), misses=len(changed))
+                journal.append(web_slug, {"id": web_slug, "changed": changed})
+                if site is not None and not cached_page:
+                    site.crawled.add(web_slug)
+            except requests.RequestException as exc:
+                print(f"  Error processing {web_slug}: {exc}")
+
+            if not cached_page:
+                time.sleep(delay)
+
+    if site is not None:
+        site.save()
+
+    # The roster comes from the journal, so a resumed run merges the same heroes as a clean one.
+    hero_ids = [record["id"] for record in journal.records()]
+    write_roster(hero_ids)
+    return len(hero_ids)
+
+
+def update_hero_images() -> int:
+    """Fetch portraits missing for heroes on the current roster; returns how many changed.
+
+    The listing snapshot records the image path, so a portrait that was a
+    placeholder at crawl time is picked up by the next merge.
+    """
+    changed = 0
+    for hero_id in load_roster():
+        raw = load_snapshots(hero_id)
+        master = json.loads(raw.get("master", "{}"))
+        listing = json.loads(raw.get("listing", "{}"))
+        listing["image"] = download_image(master.get("game_id", hero_id.replace("-", "").lower()), hero_id)
+        changed += store_snapshot("listing", hero_id, listing)
+    return changed
+
+
+def merge_hero_data(shards: int = 0, monolithic: bool = True, compact: bool = False, force: bool = False) -> int:
+    """Merge the stored snapshots into hero records and write the hero data files."""
+    records, merged = merge_heroes(force=force)
+    if not records:
+        print("No hero snapshots to merge; run --heroes-json first.")
+        return 0
+    metrics.cache("merge", hits=merged["unchanged"], misses=merged["merged"])
+    print(f"Merged {merged['merged']} heroes ({merged['unchanged']} unchanged) -> {MERGE_DIR}")
+
+    stats = write_heroes(records, shards=shards, monolithic=monolithic)
+    metrics.files(written=stats["written"], skipped=stats["shards"] - stats["written"])
+    print(
+        f"Wrote {stats['heroes']} heroes to {HERO_DATA_DIR} "
+        f"({stats['shards']} detail shards, {stats['summary_bytes']} byte summary)"
+    )
+    if monolithic:
+        print(f"Wrote monolithic {HEROES_JSON}")
+    if compact:
+        size = write_columnar(records)
+        print(f"Wrote columnar {COLUMNAR_FILE} ({size} bytes)")
+    return stats["heroes"]
 
-        web_slug = href.split("/")[-1]
-        if web_slug in processed_slugs:
-            continue
-        processed_slugs.add(web_slug)
 
-        detected_faction = detect_faction_from_link(link)
-        full_url = f"{TOPHEROES_BASE}/{href.lstrip('/')}"
-        print(f"Processing {web_slug}...")
+def fetch_guide_page(page: GuidePage) -> Optional[str]:
+    try:
+        return request_text(page.url)
+    except requests.RequestException as exc:
+        print(f"  Failed to fetch {page.url}: {exc}")
+        return None
 
-        try:
-            page_html = request_text(full_url)
-            json_data = extract_json_from_html(page_html)
-
-            hero_data = None
-            if json_data:
-                heroes_list: Iterable[dict] = []
-                if isinstance(json_data, list):
-                    heroes_list = json_data
-                elif isinstance(json_data, dict) and "heroes" in json_data:
-                    heroes_list = json_data["heroes"]
-
-                if heroes_list:
-                    simple_slug = web_slug.replace("-", "").lower()
-                    for hero in heroes_list:
-                        hero_id = hero.get("hero_id", hero.get("id", "")).replace("-", "").lower()
-                        hero_slug = hero.get("slug", "").replace("-", "").lower()
-                        if hero_id == simple_slug or hero_slug == simple_slug:
-                            hero_data = hero
-                            break
-
-                    if not hero_data:
-                        link_text = link.get_text().strip().lower()
-                        for hero in heroes_list:
-                            hero_name = hero.get("hero_name", hero.get("name", "")).lower()
-                            if hero_name and hero_name in link_text:
-                                hero_data = hero
-                                break
-
-            if not hero_data:
-                hero_data = {}
-
-            all_heroes.append(normalize_hero(hero_data, web_slug, detected_faction))
-        except requests.RequestException as exc:
-            print(f"  Error processing {web_slug}: {exc}")
 
-        time.sleep(delay)
+def update_guides(pages: Optional[tuple[GuidePage, ...]] = None) -> None:
+    pages = pages if pages is not None else load_guide_specs()
+    print(f"Fetching {len(pages)} guide page(s)...")
+    # Each worker gets a copy of the context so requests count toward this stage.
+    with ThreadPoolExecutor(max_workers=min(GUIDE_WORKERS, len(pages)) or 1) as pool:
+        futures = [pool.submit(contextvars.copy_context().run, fetch_guide_page, page) for page in pages]
+        htmls = [future.result() for future in futures]
 
-    HEROES_JSON.parent.mkdir(parents=True, exist_ok=True)
-    HEROES_JSON.write_text(json.dumps(all_heroes, indent=2), encoding="utf-8")
-    print(f"Wrote {len(all_heroes)} heroes to {HEROES_JSON}")
-    return len(all_heroes)
+    for page, html in zip(pages, htmls):
+        if html is None:
+            continue
+        with metrics.parse("guides"):
+            soup = BeautifulSoup(html, "html.parser")
+            sections = extract_sections(page, soup)
 
+        for spec, content in sections.items():
+            if content is None:
+                print(f"  {spec.title} header not found")
+                continue
+            path = RAG_DIR / spec.output
+            write_output(path, content)
+            print(f"  Updated {path.relative_to(RAG_DIR).as_posix()}")
 
-def update_guides() -> None:
-    print("Fetching hero guides...")
-    html = request_text(TOPHEROES_GUIDE)
-    soup = BeautifulSoup(html, "html.parser")
 
-    MECHANICS_DIR.mkdir(parents=True, exist_ok=True)
-    META_DIR.mkdir(parents=True, exist_ok=True)
-
-    core_header = soup.find(lambda tag: tag.name == "h2" and "Core Hero Strategy" in tag.get_text())
-    if core_header:
-        content = "# Core Hero Strategy\n\n"
-        grid_container = core_header.find_next_sibling("div")
-        if grid_container:
-            items = grid_container.find_all("h3")
-            for item_title in items:
-                title_text = clean_text(item_title.get_text())
-                content += f"## {title_text}\n"
-
-                desc = item_title.find_next_sibling("p")
-                if desc:
-                    content += f"{clean_text(desc.get_text())}\n\n"
-                else:
-                    parent = item_title.parent
-                    paragraph = parent.find("p")
-                    if paragraph:
-                        content += f"{clean_text(paragraph.get_text())}\n\n"
-
-        (MECHANICS_DIR / "core-strategy.md").write_text(content, encoding="utf-8")
-        print("  Updated mechanics/core-strategy.md")
-    else:
-        print("  Core Hero Strategy header not found")
-
-    meta_header = soup.find(lambda tag: tag.name == "h2" and "Faction Meta Guides" in tag.get_text())
-    if meta_header:
-        content = "# Faction Meta Guides\n\n"
-        curr = meta_header.find_next_sibling()
-        while curr and curr.name != "h2":
-            if curr.name == "p":
-                text = clean_text(curr.get_text())
-                if text:
-                    content += f"{text}\n\n"
-            elif curr.name == "h3":
-                content += f"## {clean_text(curr.get_text())}\n\n"
-            elif curr.name == "h4":
-                content += f"### {clean_text(curr.get_text())}\n\n"
-            elif curr.name == "div":
-                headers_in_div = curr.find_all(["h3", "h4"])
-                if headers_in_div:
-                    for header in headers_in_div:
-                        content += f"## {clean_text(header.get_text())}\n"
-                        paragraph = header.find_next_sibling("p")
-                        if paragraph:
-                            content += f"{clean_text(paragraph.get_text())}\n\n"
-                else:
-                    text = clean_text(curr.get_text())
-                    if len(text) > 20:
-                        content += f"{text}\n\n"
-            curr = curr.find_next_sibling()
+def load_fandom_titles() -> Optional[TitleIndex]:
+    try:
+        return TitleIndex.cached(lambda url: json.loads(request_text(url)))
+    except (requests.RequestException, ValueError) as exc:
+        print(f"Fandom title index unavailable ({exc}); deriving titles from file names")
+        return None
 
-        (META_DIR / "faction-meta.md").write_text(content, encoding="utf-8")
-        print("  Updated meta/faction-meta.md")
-    else:
-        print("  Faction Meta Guides header not found")
-
-    passive_header = soup.find(string=re.compile("Epic Hero Passive Traits"))
-    if passive_header:
-        header_elem = passive_header.parent if getattr(passive_header, "parent", None) else passive_header
-        table = None
-        curr = header_elem
-        for _ in range(10):
-            if not curr:
-                break
-            curr = curr.find_next_sibling()
-            if curr and curr.name == "div":
-                candidate = curr.find("table")
-                if candidate:
-                    table = candidate
-                    break
-            if curr and curr.name == "table":
-                table = curr
-                break
-
-        if not table:
-            for candidate in soup.find_all("table"):
-                if "Hero" in candidate.get_text() and "Trait" in candidate.get_text():
-                    table = candidate
-                    break
-
-        content = "# Epic Hero Passive Traits\n\n"
-        content += (
-            "Once Epic Heroes reach 2-Star Platinum, they unlock a global passive trait "
-            "(Skill 3). Prioritize maxing these out!\n\n"
-        )
 
-        if table:
-            rows = table.find_all("tr")
-            if rows:
-                headers_list = [clean_text(th.get_text()) for th in rows[0].find_all(["th", "td"])]
-                content += "| " + " | ".join(headers_list) + " |\n"
-                content += "| " + " | ".join(["---"] * len(headers_list)) + " |\n"
-                for row in rows[1:]:
-                    cols = [clean_text(td.get_text()) for td in row.find_all("td")]
-                    if cols:
-                        content += "| " + " | ".join(cols) + " |\n"
-
-        (MECHANICS_DIR / "epic-passives.md").write_text(content, encoding="utf-8")
-        print("  Updated mechanics/epic-passives.md")
-    else:
-        print("  Epic Hero Passive Traits header not found")
-
-
-def fetch_fandom_html(hero_name: str) -> Optional[str]:
-    url_name = hero_name.replace(" ", "_")
+def fetch_fandom_html(title: str) -> Optional[str]:
+    url_name = quote(title.replace(" ", "_"), safe="/:'()")
     url = f"{FANDOM_BASE}{url_name}"
     try:
-        response = requests.get(url, headers=HEADERS, timeout=20)
+        response = http_get(url)
         if response.status_code != 200:
             return None
         return response.text
@@ -341,6 +462,7 @@ def fetch_fandom_html(hero_name: str) -> Optional[str]:
         return None
 
 
+@traced("parse")
 def extract_fandom_sections(html: str) -> dict:
     soup = BeautifulSoup(html, "html.parser")
     if not soup.find(id="firstHeading"):
@@ -350,60 +472,58 @@ def extract_fandom_sections(html: str) -> dict:
 
     lore_header = soup.find(lambda tag: tag.name in ["h2", "h3"] and "Lore" in tag.get_text())
     if lore_header:
-        lore_text = ""
+        lore = MarkdownWriter()
         curr = lore_header.find_next_sibling()
         while curr and curr.name not in ["h2", "h3"]:
             if curr.name == "p":
-                lore_text += curr.get_text(strip=True) + "\n\n"
+                lore.paragraph(curr.get_text(strip=True))
             curr = curr.find_next_sibling()
-        if lore_text:
-            data["lore"] = lore_text.strip()
+        text = lore.getvalue().strip()
+        if text:
+            data["lore"] = text
 
     skills_header = soup.find(lambda tag: tag.name in ["h2", "h3"] and "Skills" in tag.get_text())
     if skills_header:
-        skills_text = ""
+        skills = MarkdownWriter()
         curr = skills_header.find_next_sibling()
         stop_tags = ["h2"] if skills_header.name == "h2" else ["h2", "h3"]
 
         while curr and curr.name not in stop_tags:
             if curr.name == "h3":
-                skills_text += f"### {curr.get_text(strip=True).replace('[edit]', '')}\n"
+                skills.heading(curr.get_text(strip=True).replace("[edit]", ""), 3)
             elif curr.name == "p":
                 text = curr.get_text(strip=True)
-                if text:
-                    if re.match(r"^\d+\.", text):
-                        skills_text += f"### {text}\n"
-                    elif text.startswith("→"):
-                        skills_text += f"> {text}\n\n"
-                    else:
-                        skills_text += f"{text}\n\n"
+                if re.match(r"^\d+\.", text):
+                    skills.heading(text, 3)
+                elif text.startswith("→"):
+                    skills.blockquote(text)
+                else:
+                    skills.paragraph(text)
             elif curr.name == "ul":
-                for li in curr.find_all("li"):
-                    skills_text += f"- {li.get_text(strip=True)}\n"
-                skills_text += "\n"
+                skills.bullets(li.get_text(strip=True) for li in curr.find_all("li"))
             curr = curr.find_next_sibling()
-        if skills_text:
-            data["skills"] = skills_text.strip()
+        text = skills.getvalue().strip()
+        if text:
+            data["skills"] = text
 
     strat_header = soup.find(
         lambda tag: tag.name in ["h2", "h3"]
         and ("Strategy" in tag.get_text() or "Formation" in tag.get_text())
     )
     if strat_header:
-        strat_text = ""
+        strategy = MarkdownWriter()
         curr = strat_header.find_next_sibling()
         stop_tags = ["h2"] if strat_header.name == "h2" else ["h2", "h3"]
 
         while curr and curr.name not in stop_tags:
             if curr.name == "p":
-                strat_text += curr.get_text(strip=True) + "\n\n"
+                strategy.paragraph(curr.get_text(strip=True))
             elif curr.name == "ul":
-                for li in curr.find_all("li"):
-                    strat_text += f"- {li.get_text(strip=True)}\n"
-                strat_text += "\n"
+                strategy.bullets(li.get_text(strip=True) for li in curr.find_all("li"))
             curr = curr.find_next_sibling()
-        if strat_text:
-            data["strategy"] = strat_text.strip()
+        text = strategy.getvalue().strip()
+        if text:
+            data["strategy"] = text
 
     return data
 
@@ -414,8 +534,8 @@ def update_markdown(filepath: Path, data: dict) -> None:
     if "lore" in data:
         if "## Lore" in content:
             content = re.sub(
-                r"## Lore\n.*?(?=\n##|\Z)",
-                f"## Lore\n\n{data['lore']}\n",
+                r"## Lore\n.*?(?=\n##(?!#)|\Z)",
+                lambda _match: f"## Lore\n\n{data['lore']}\n",
                 content,
                 flags=re.DOTALL,
             )
@@ -425,7 +545,7 @@ def update_markdown(filepath: Path, data: dict) -> None:
             else:
                 content = re.sub(
                     r"(# .*?\n)",
-                    f"\\1\n## Lore\n\n{data['lore']}\n\n",
+                    lambda match: f"{match.group(1)}\n## Lore\n\n{data['lore']}\n\n",
                     content,
                     count=1,
                 )
@@ -433,8 +553,8 @@ def update_markdown(filepath: Path, data: dict) -> None:
     if "skills" in data:
         if "## Skills" in content:
             content = re.sub(
-                r"(## Skills\n).*?(?=\n##|\Z)",
-                f"\\1\n{data['skills']}\n",
+                r"(## Skills\n).*?(?=\n##(?!#)|\Z)",
+                lambda match: f"{match.group(1)}\n{data['skills']}\n",
                 content,
                 flags=re.DOTALL,
             )
@@ -444,76 +564,279 @@ def update_markdown(filepath: Path, data: dict) -> None:
     if "strategy" in data:
         if "## Strategy" in content:
             content = re.sub(
-                r"## Strategy\n.*?(?=\n##|\Z)",
-                f"## Strategy\n\n{data['strategy']}\n",
+                r"## Strategy\n.*?(?=\n##(?!#)|\Z)",
+                lambda _match: f"## Strategy\n\n{data['strategy']}\n",
                 content,
                 flags=re.DOTALL,
             )
         else:
             content += f"\n## Strategy\n\n{data['strategy']}\n"
 
-    filepath.write_text(content, encoding="utf-8")
+    write_output(filepath, content)
     print(f"  Updated {filepath.name}")
 
 
-def update_fandom_hero_content(delay: float) -> int:
+def update_fandom_hero_content(delay: float, resume: bool = False) -> int:
     if not HERO_RAG_DIR.exists():
         print(f"Hero RAG directory not found: {HERO_RAG_DIR}")
         return 0
 
-    files = [path for path in HERO_RAG_DIR.iterdir() if path.suffix == ".md"]
+    files = sorted(path for path in HERO_RAG_DIR.iterdir() if path.suffix == ".md")
     print(f"Found {len(files)} hero files.")
 
-    updated = 0
-    for filepath in files:
-        hero_name = filepath.stem.replace("-", " ").title()
-        html = fetch_fandom_html(hero_name)
-        if not html:
-            print(f"  Failed to fetch {hero_name}")
+    journal = CrawlJournal("fandom")
+    if not resume:
+        journal.reset()
+    completed = journal.completed()
+    if completed:
+        print(f"Resuming: {len(completed)} hero files already processed")
+
+    titles = load_fandom_titles()
+    unresolved = []
+    with journal:
+        for filepath in files:
+            if filepath.stem in completed:
+                metrics.cache("journal", hits=1)
+                continue
+            metrics.cache("journal", misses=1)
+            if titles is None:
+                title = filepath.stem.replace("-", " ").title()
+            else:
+                title = titles.resolve(filepath.stem)
+                metrics.cache("fandom_titles", hits=int(title is not None), misses=int(title is None))
+                if title is None:
+                    # No such article: journaled without a request, and reported below.
+                    unresolved.append(filepath.stem)
+                    journal.append(filepath.stem, {"updated": False})
+                    continue
+            html = fetch_fandom_html(title)
+            if not html:
+                # Not journaled, so a resumed run retries it.
+                print(f"  Failed to fetch {title}")
+                time.sleep(delay)
+                continue
+
+            with metrics.parse("fandom_page"):
+                fandom_data = extract_fandom_sections(html)
+            store_snapshot("fandom", filepath.stem, fandom_snapshot(fandom_data))
+            if fandom_data:
+                update_markdown(filepath, fandom_data)
+            else:
+                metrics.files(skipped=1)
+            journal.append(filepath.stem, {"updated": bool(fandom_data)})
+
             time.sleep(delay)
-            continue
 
-        fandom_data = extract_fandom_sections(html)
-        if fandom_data:
-            update_markdown(filepath, fandom_data)
-            updated += 1
+    if unresolved:
+        titles.report_unresolved(unresolved)
+    return sum(1 for record in journal.records() if record["updated"])
 
-        time.sleep(delay)
 
-    return updated
+STAGE_FLAGS = ("heroes_json", "guides", "fandom", "images", "merge", "build", "chunks", "dedup", "index", "vectors", "bundles", "compress")
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Update Top Heroes content from official sources."
     )
-    parser.add_argument("--heroes-json", action="store_true", help="Update src/data/heroes.json")
+    parser.add_argument("--heroes-json", action="store_true", help="Update hero summary and detail shards")
     parser.add_argument("--guides", action="store_true", help="Update rag-content guides")
     parser.add_argument("--fandom", action="store_true", help="Update rag-content hero lore/skills")
+    parser.add_argument(
+        "--images",
+        action="store_true",
+        help="Fetch portraits still missing for the crawled roster (--heroes-json fetches them too)",
+    )
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        help="Rewrite hero data from stored snapshots (implied by --heroes-json and --fandom)",
+    )
+    parser.add_argument(
+        "--force-merge",
+        action="store_true",
+        help="Re-merge every hero, not only those whose snapshots changed (with --merge or a crawl stage)",
+    )
+    parser.add_argument(
+        "--build",
+        action="store_true",
+        help="Rebuild out-of-date retrieval artifacts as a full run would, without crawling",
+    )
+    parser.add_argument("--chunks", action="store_true", help="Rebuild rag-content retrieval chunks")
+    parser.add_argument("--dedup", action="store_true", help="Report near-duplicate chunks and emit a deduplicated set")
+    parser.add_argument("--index", action="store_true", help="Rebuild the rag-content lexical index")
+    parser.add_argument("--vectors", action="store_true", help="Update the TF-IDF/LSA vector index")
+    parser.add_argument("--bundles", action="store_true", help="Rebuild per-hero assistant context bundles")
+    parser.add_argument("--compress", action="store_true", help="Write .gz/.br siblings for generated artifacts")
     parser.add_argument("--all", action="store_true", help="Run all updates")
     parser.add_argument(
         "--delay",
         type=float,
-        default=0.4,
-        help="Delay between requests (seconds)",
+        default=None,
+        help="Delay between requests (seconds; default 0.4, or 0 with --replay/--replay-url)",
+    )
+    parser.add_argument(
+        "--hero-shards",
+        type=int,
+        default=0,
+        help="Group hero detail into N size-balanced shards (0 = one shard per hero)",
+    )
+    parser.add_argument(
+        "--monolithic-heroes",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Also write the single-file src/data/heroes.json the app imports",
+    )
+    parser.add_argument(
+        "--compact-heroes",
+        action="store_true",
+        help="Also write the columnar, string-interned heroes.columnar.json",
+    )
+    parser.add_argument(
+        "--chunk-tokens",
+        type=int,
+        default=DEFAULT_MAX_TOKENS,
+        help="Token budget per retrieval chunk",
+    )
+    parser.add_argument(
+        "--chunk-overlap",
+        type=int,
+        default=DEFAULT_OVERLAP,
+        help="Tokens of overlap between split chunks",
+    )
+    parser.add_argument(
+        "--refit",
+        action="store_true",
+        help="Refit the vector index instead of folding in changed chunks",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip heroes already journaled by an interrupted --heroes-json/--fandom run",
+    )
+    parser.add_argument(
+        "--refresh-site",
+        action="store_true",
+        help="Fetch every hero page again, even if the site release is cached and fresh",
+    )
+    capture = parser.add_mutually_exclusive_group()
+    capture.add_argument(
+        "--record",
+        type=Path,
+        metavar="DIR",
+        help="Save every HTTP response to DIR for later --replay",
+    )
+    capture.add_argument(
+        "--replay",
+        type=Path,
+        metavar="DIR",
+        help="Serve HTTP responses from a --record directory instead of the network",
+    )
+    parser.add_argument(
+        "--replay-url",
+        default=os.environ.get(REPLAY_URL_ENV),
+        metavar="URL",
+        help=f"Send every request to a replay or stand-in server at URL (or set {REPLAY_URL_ENV})",
+    )
+    parser.add_argument(
+        "--replay-latency",
+        type=parse_latency,
+        default=None,
+        metavar="MS",
+        help="With --replay, delay each response by MS, a uniform range like 20-80, or 'recorded'",
+    )
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        default=os.environ.get(TRACE_ENV),
+        help=f"Write a Chrome/Perfetto trace of fetches, parses and writes (or set {TRACE_ENV})",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        nargs="?",
+        const=PROFILE_DIR,
+        default=os.environ.get(PROFILE_ENV),
+        metavar="DIR",
+        help=f"Write per-stage .pstats, flamegraph stacks and a hot-function summary to DIR (or set {PROFILE_ENV})",
+    )
+    parser.add_argument(
+        "--metrics-dir",
+        type=Path,
+        default=METRICS_DIR,
+        help="Where to write the JSON run report and Prometheus textfile",
     )
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
-def main() -> None:
-    args = parse_args()
-    run_all = args.all or not (args.heroes_json or args.guides or args.fandom)
+def run_stages(args: argparse.Namespace) -> None:
+    run_all = args.all or not any(getattr(args, stage) for stage in STAGE_FLAGS)
+    # --build runs the retrieval stages the way a full run does, without crawling.
+    build_all = run_all or args.build
 
     if run_all or args.heroes_json:
-        update_heroes_json(args.delay)
+        with metrics.stage("heroes_json"):
+            update_heroes_json(args.delay, resume=args.resume, refresh_site=args.refresh_site)
 
     if run_all or args.guides:
-        update_guides()
+        with metrics.stage("guides"):
+            update_guides()
 
     if run_all or args.fandom:
-        updated = update_fandom_hero_content(args.delay)
+        with metrics.stage("fandom"):
+            updated = update_fandom_hero_content(args.delay, resume=args.resume)
         print(f"Updated {updated} hero files from Fandom.")
 
+    if args.images:
+        with metrics.stage("images"):
+            changed = update_hero_images()
+        print(f"Updated {changed} hero portraits.")
+
+    # Hero records combine the snapshots of both crawl stages, so merge after them.
+    if run_all or args.merge or args.heroes_json or args.fandom or args.images:
+        with metrics.stage("merge"):
+            merge_hero_data(args.hero_shards, args.monolithic_heroes, args.compact_heroes, force=args.force_merge)
+
+    run_build_stages(args, build_all)
+
+
+def configure_http(args: argparse.Namespace):
+    """Apply the default --delay and mount the record/replay adapter on ``SESSION``."""
+    if args.delay is None:
+        args.delay = 0.0 if args.replay or args.replay_url else 0.4
+    return install_http_adapter(
+        SESSION,
+        record=args.record,
+        replay=args.replay,
+        latency=args.replay_latency,
+        server=None if args.replay else args.replay_url,
+    )
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    args = parse_args(argv)
+    adapter = configure_http(args)
+    if args.trace:
+        start_trace(args.trace)
+    if args.profile:
+        start_profile(args.profile)
+    try:
+        run_stages(args)
+    except BaseException:
+        metrics.status = "failed"
+        raise
+    finally:
+        if args.replay and adapter.misses:
+            print(f"Replay: {len(adapter.misses)} requests were not in {args.replay}, e.g. {adapter.misses[0]}")
+        report = metrics.write("update_content", args.metrics_dir)
+        print(f"Run metrics -> {report}")
+        trace = stop_trace()
+        if trace:
+            print(f"Trace -> {trace} (open in https://ui.perfetto.dev)")
+        profile = stop_profile()
+        if profile:
+            print(f"Profile -> {profile}")
+
 
 if __name__ == "__main__":
     main()
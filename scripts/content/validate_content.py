@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Check the generated content before it ships.
+
+- rag-content docs: not near-empty, and with a heading
+- guide_specs.json: compiles
+- hero data: the summary and every detail shard load, ids are unique, the
+  roster fields are filled, and each portrait exists under ``public/``
+
+Prints one line per issue and exits 1 if there are any.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+from chunk_content import PROJECT_ROOT, RAG_DIR, iter_markdown_files
+from guide_specs import load_guide_specs
+from hero_store import HERO_DATA_DIR, SUMMARY_FIELDS, load_heroes
+
+MIN_DOC_CHARS = 100
+PUBLIC_DIR = PROJECT_ROOT / "public"
+
+
+def validate_docs(rag_dir: Path = RAG_DIR) -> list[str]:
+    issues = []
+    for path in iter_markdown_files(rag_dir):
+        content = path.read_text(encoding="utf-8")
+        if len(content) < MIN_DOC_CHARS:
+            issues.append(f"Short content: {path}")
+        if "# " not in content:
+            issues.append(f"Missing header: {path}")
+    return issues
+
+
+def validate_guide_specs() -> list[str]:
+    try:
+        load_guide_specs()
+    except (KeyError, TypeError, ValueError) as exc:
+        return [f"Invalid guide specs: {type(exc).__name__}: {exc}"]
+    return []
+
+
+def validate_heroes(data_dir: Path = HERO_DATA_DIR) -> list[str]:
+    try:
+        heroes = load_heroes(data_dir)
+    except (OSError, KeyError, ValueError) as exc:
+        return [f"Hero data does not load: {type(exc).__name__}: {exc}"]
+    if not heroes:
+        return [f"No hero data in {data_dir}"]
+
+    issues = []
+    counts = Counter(hero.get("id") for hero in heroes)
+    issues.extend(f"Duplicate hero id: {hero_id}" for hero_id, count in counts.items() if count > 1)
+    for hero in heroes:
+        missing = [field for field in SUMMARY_FIELDS if not hero.get(field)]
+        if missing:
+            issues.append(f"Hero {hero.get('id')}: missing {', '.join(missing)}")
+        image = hero.get("image")
+        if image and not (PUBLIC_DIR / image.lstrip("/")).exists():
+            issues.append(f"Hero {hero.get('id')}: image not found: {image}")
+    return issues
+
+
+def validate_all() -> list[str]:
+    return validate_docs() + validate_guide_specs() + validate_heroes()
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Check rag-content docs, guide specs and hero data.")
+    parser.add_argument("--json", action="store_true", help="Print the issues as a JSON list")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    args = parse_args(argv)
+    issues = validate_all()
+    if args.json:
+        print(json.dumps(issues, indent=2))
+    else:
+        for issue in issues:
+            print(issue)
+        print(f"{len(issues)} issue(s)")
+    if issues:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
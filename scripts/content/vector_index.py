@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""TF-IDF and LSA vector index over rag-content chunks, stored as .npy files.
+
+Small corpus changes are folded in against the existing vocabulary and SVD
+basis; a full refit runs on demand or once too much of the corpus has drifted.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import svds
+
+from chunk_content import BUILD_DIR, display_path, load_chunks
+from lexical_index import default_chunks_path, index_text, tokenize
+
+VECTOR_DIR = BUILD_DIR / "vectors"
+
+DEFAULT_DIMENSIONS = 128
+# Refit once folded-in rows exceed this share of the corpus.
+REFIT_FRACTION = 0.2
+
+
+@dataclass
+class VectorHit:
+    doc_id: int
+    score: float
+    chunk_id: str
+    source: str
+
+
+def _tf_row(text: str, vocab: dict[str, int], idf: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Sublinear TF-IDF weights for one document, L2-normalized."""
+    counts = Counter(term for term in tokenize(text) if term in vocab)
+    if not counts:
+        return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+    columns = np.array([vocab[term] for term in counts], dtype=np.int32)
+    weights = np.array([1.0 + math.log(tf) for tf in counts.values()], dtype=np.float32) * idf[columns]
+    order = np.argsort(columns)
+    columns, weights = columns[order], weights[order]
+    return columns, weights / np.linalg.norm(weights)
+
+
+def _build_matrix(texts: list[str], vocab: dict[str, int], idf: np.ndarray) -> sparse.csr_matrix:
+    indptr = [0]
+    indices: list[np.ndarray] = []
+    data: list[np.ndarray] = []
+    for text in texts:
+        columns, weights = _tf_row(text, vocab, idf)
+        indices.append(columns)
+        data.append(weights)
+        indptr.append(indptr[-1] + len(columns))
+    return sparse.csr_matrix(
+        (
+            np.concatenate(data) if data else np.zeros(0, dtype=np.float32),
+            np.concatenate(indices) if indices else np.zeros(0, dtype=np.int32),
+            np.array(indptr, dtype=np.int64),
+        ),
+        shape=(len(texts), len(vocab)),
+        dtype=np.float32,
+    )
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+
+def _save(directory: Path, arrays: dict[str, np.ndarray], meta: dict) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(directory / f"{name}.npy", array, allow_pickle=False)
+    (directory / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+
+def _lsa_components(matrix: sparse.csr_matrix, dimensions: int) -> np.ndarray:
+    """Top right singular vectors of ``matrix``, one row per LSA dimension."""
+    smallest = min(matrix.shape)
+    if smallest <= 1:
+        # svds needs k < min(shape); a one-doc or one-term corpus takes the dense SVD.
+        _, _, components = np.linalg.svd(matrix.toarray().astype(np.float64), full_matrices=False)
+        return components[: min(dimensions, smallest)].astype(np.float32)
+    _, _, components = svds(matrix.astype(np.float64), k=min(dimensions, smallest - 1), random_state=0)
+    return components.astype(np.float32)
+
+
+def refit(records: list[dict], directory: Path, dimensions: int) -> dict:
+    texts = [index_text(record) for record in records]
+    document_frequency: Counter[str] = Counter()
+    for text in texts:
+        document_frequency.update(set(tokenize(text)))
+
+    terms = sorted(document_frequency)
+    vocab = {term: column for column, term in enumerate(terms)}
+    n_docs = len(texts)
+    idf = np.array(
+        [math.log((1 + n_docs) / (1 + document_frequency[term])) + 1.0 for term in terms],
+        dtype=np.float32,
+    )
+    matrix = _build_matrix(texts, vocab, idf)
+
+    components = _lsa_components(matrix, dimensions)
+    rank = len(components)
+
+    _save(
+        directory,
+        {
+            "vocab": np.array(terms, dtype=str),
+            "idf": idf,
+            "tfidf_data": matrix.data,
+            "tfidf_indices": matrix.indices,
+            "tfidf_indptr": matrix.indptr,
+            "lsa_components": components,
+            "lsa_docs": _normalize_rows(np.asarray(matrix @ components.T)),
+            "chunk_ids": np.array([record["id"] for record in records], dtype=str),
+            "chunk_hashes": np.array([record["chunk_hash"] for record in records], dtype=str),
+            "sources": np.array([record["source"] for record in records], dtype=str),
+        },
+        {
+            "docs": n_docs,
+            "terms": len(terms),
+            "dimensions": rank,
+            "requested_dimensions": dimensions,
+            "fitted_docs": n_docs,
+            "folded_docs": 0,
+        },
+    )
+    return {"mode": "refit", "docs": n_docs, "terms": len(terms), "dimensions": rank, "folded": 0}
+
+
+def fold_in(records: list[dict], directory: Path, meta: dict) -> Optional[dict]:
+    """Update rows for changed chunks against the existing basis.
+
+    Returns ``None`` when the change set is too large and a refit is needed.
+    """
+    index = VectorIndex(directory)
+    previous = {
+        (chunk_id, chunk_hash): row
+        for row, (chunk_id, chunk_hash) in enumerate(zip(index.chunk_ids.tolist(), index.chunk_hashes.tolist()))
+    }
+    keys = [(record["id"], record["chunk_hash"]) for record in records]
+    changed = [position for position, key in enumerate(keys) if key not in previous]
+    folded_total = meta.get("folded_docs", 0) + len(changed)
+    if folded_total > REFIT_FRACTION * max(len(records), 1):
+        return None
+
+    vocab = {term: column for column, term in enumerate(index.vocab.tolist())}
+    new_rows = _build_matrix([index_text(records[position]) for position in changed], vocab, index.idf)
+    new_lsa = _normalize_rows(np.asarray(new_rows @ index.lsa_components.T)) if changed else None
+
+    rows = []
+    lsa_rows = []
+    fresh = {position: offset for offset, position in enumerate(changed)}
+    for position, key in enumerate(keys):
+        if position in fresh:
+            rows.append(new_rows[fresh[position]])
+            lsa_rows.append(new_lsa[fresh[position]])
+        else:
+            row = previous[key]
+            rows.append(index.tfidf[row])
+            lsa_rows.append(index.lsa_docs[row])
+
+    matrix = sparse.vstack(rows, format="csr", dtype=np.float32) if rows else index.tfidf[:0]
+    lsa_docs = np.vstack(lsa_rows).astype(np.float32) if lsa_rows else index.lsa_docs[:0]
+    meta = dict(meta, docs=len(records), folded_docs=folded_total)
+    _save(
+        directory,
+        {
+            "tfidf_data": matrix.data.astype(np.float32),
+            "tfidf_indices": matrix.indices.astype(np.int32),
+            "tfidf_indptr": matrix.indptr.astype(np.int64),
+            "lsa_docs": lsa_docs,
+            "chunk_ids": np.array([key[0] for key in keys], dtype=str),
+            "chunk_hashes": np.array([key[1] for key in keys], dtype=str),
+            "sources": np.array([record["source"] for record in records], dtype=str),
+        },
+        meta,
+    )
+    return {"mode": "fold-in", "docs": len(records), "terms": len(vocab), "dimensions": meta["dimensions"], "folded": len(changed)}
+
+
+def build_vector_index(
+    chunks_path: Optional[Path] = None,
+    directory: Path = VECTOR_DIR,
+    dimensions: int = DEFAULT_DIMENSIONS,
+    force_refit: bool = False,
+) -> dict:
+    records = load_chunks(chunks_path or default_chunks_path())
+    meta_path = directory / "meta.json"
+    stats = None
+    if not force_refit and meta_path.exists():
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        # ``dimensions`` is capped by the corpus size, so compare against what was asked for.
+        if meta.get("requested_dimensions", meta.get("dimensions")) == dimensions:
+            stats = fold_in(records, directory, meta)
+    if stats is None:
+        stats = refit(records, directory, dimensions)
+
+    print(
+        f"Vector index {stats['mode']}: {stats['docs']} docs, {stats['terms']} terms, "
+        f"{stats['dimensions']} LSA dims ({stats['folded']} folded in) -> {display_path(directory)}"
+    )
+    return stats
+
+
+class VectorIndex:
+    """Loads the .npy arrays (dense ones memory-mapped) and answers top-k queries."""
+
+    def __init__(self, directory: Path = VECTOR_DIR):
+        def load(name: str, mmap: bool = False) -> np.ndarray:
+            return np.load(directory / f"{name}.npy", mmap_mode="r" if mmap else None, allow_pickle=False)
+
+        self.vocab = load("vocab")
+        self.idf = load("idf")
+        self.lsa_components = load("lsa_components", mmap=True)
+        self.lsa_docs = load("lsa_docs", mmap=True)
+        self.chunk_ids = load("chunk_ids")
+        self.chunk_hashes = load("chunk_hashes")
+        self.sources = load("sources")
+        self.tfidf = sparse.csr_matrix(
+            (load("tfidf_data"), load("tfidf_indices"), load("tfidf_indptr")),
+            shape=(len(self.chunk_ids), len(self.vocab)),
+        )
+        self._vocab = {term: column for column, term in enumerate(self.vocab.tolist())}
+
+    @property
+    def n_docs(self) -> int:
+        return len(self.chunk_ids)
+
+    def query_vector(self, query: str) -> tuple[np.ndarray, np.ndarray]:
+        return _tf_row(query, self._vocab, self.idf)
+
+    def scores(self, query: str, mode: str = "lsa") -> np.ndarray:
+        columns, weights = self.query_vector(query)
+        if not len(columns):
+            return np.zeros(self.n_docs, dtype=np.float32)
+        if mode == "tfidf":
+            query_vec = np.zeros(len(self.vocab), dtype=np.float32)
+            query_vec[columns] = weights
+            return self.tfidf @ query_vec
+        projected = weights @ self.lsa_components[:, columns].T
+        norm = np.linalg.norm(projected)
+        return self.lsa_docs @ (projected / norm if norm else projected)
+
+    def search(self, query: str, k: int = 5, mode: str = "lsa") -> list[VectorHit]:
+        scores = self.scores(query, mode)
+        k = min(k, self.n_docs)
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            VectorHit(int(doc), float(scores[doc]), str(self.chunk_ids[doc]), str(self.sources[doc]))
+            for doc in top
+            if scores[doc] > 0
+        ]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build the TF-IDF/LSA vector index for rag-content.")
+    parser.add_argument("--chunks", type=Path, help="Chunk file to index (defaults to the deduplicated set)")
+    parser.add_argument("--dimensions", type=int, default=DEFAULT_DIMENSIONS, help="LSA dimensions")
+    parser.add_argument("--refit", action="store_true", help="Refit vocabulary and SVD instead of folding in")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    started = time.perf_counter()
+    build_vector_index(args.chunks, dimensions=args.dimensions, force_refit=args.refit)
+    print(f"  Build took {(time.perf_counter() - started) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
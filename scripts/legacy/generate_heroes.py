@@ -1,3 +1,9 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "content"))
+from markdown_emitter import open_markdown  # noqa: E402
+
 heroes = [
     {"name": "Adjudicator", "faction": "League", "role": "Tank", "desc": "Frontline durability expert."},
     {"name": "Bishop", "faction": "League", "role": "Support", "desc": " Healer and buffer for League teams."},
@@ -39,35 +45,27 @@ for hero in heroes:
     if hero["faction"] == "Horde": img = "placeholder_horde.png"
     if hero["faction"] == "Nature": img = "placeholder_nature.png"
 
-    content = f"""---
-title: {hero['name']}
-description: Complete guide for {hero['name']} ({hero['faction']} {hero['role']})
-tags: [{hero['faction']}, {hero['role']}, Hero]
----
-
-# {hero['name']}
+    with open_markdown(Path(filename)) as out:
+        out.frontmatter({
+            'title': hero['name'],
+            'description': f"Complete guide for {hero['name']} ({hero['faction']} {hero['role']})",
+            'tags': [hero['faction'], hero['role'], 'Hero'],
+        })
+        out.heading(hero['name'])
+        out.paragraph(f"![{hero['name']}](/img/{img})")
 
-![{hero['name']}](/img/{img})
+        out.heading('Overview', 2)
+        out.paragraph(f"**Faction:** {hero['faction']}\n**Role:** {hero['role']}")
+        out.paragraph(hero['desc'])
 
-## Overview
-**Faction:** {hero['faction']}
-**Role:** {hero['role']}
+        out.heading('Skills', 2)
+        out.paragraph("*(Detailed skill data coming soon)*")
 
-{hero['desc']}
+        out.heading('Gear Recommendations', 2)
+        out.bullets(["**Set:** Coming soon.", "**Stats:** Coming soon."])
 
-## Skills
-*(Detailed skill data coming soon)*
-
-## Gear Recommendations
-- **Set:** Coming soon.
-- **Stats:** Coming soon.
-
-## Analysis
-{hero['name']} is a key unit in {hero['faction']} compositions.
-"""
-    
-    with open(filename, "w") as f:
-        f.write(content)
-        print(f"Created {filename}")
+        out.heading('Analysis', 2)
+        out.paragraph(f"{hero['name']} is a key unit in {hero['faction']} compositions.")
+    print(f"Created {filename}")
 
 print("Mass generation complete.")
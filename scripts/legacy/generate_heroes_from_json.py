@@ -1,7 +1,13 @@
 import json
 import os
+import sys
+from pathlib import Path
+
 import requests
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "content"))
+from markdown_emitter import open_markdown  # noqa: E402
+
 # Config
 IMG_DIR = "static/img/heroes"
 OUTPUT_DIR = "docs/heroes"
@@ -47,64 +53,44 @@ def generate_markdown(hero):
 
     image_file = download_image(slug)
     
-    # Skills
-    skills_md = ""
-    if 'skills' in hero:
-        for skill in hero['skills']:
-            s_name = skill.get('name', 'Unnamed Skill')
-            s_type = skill.get('type', 'Passive').capitalize()
-            s_cooldown = skill.get('cooldown_sec')
-            s_desc = skill.get('base_description', '')
-            
-            cd_str = f" ({s_cooldown}s CD)" if s_cooldown else ""
-            
-            skills_md += f"### {s_name}\n"
-            skills_md += f"**Type:** {s_type}{cd_str}\n\n"
-            skills_md += f"{s_desc}\n\n"
-            
-            # Star levels
-            if 'star_levels' in skill and skill['star_levels']:
-                skills_md += "**Upgrades:**\n"
-                for star in skill['star_levels']:
-                    stars_icon = "⭐" * star['stars']
-                    skills_md += f"- **{stars_icon}**: {star['description']}\n"
-            
-            skills_md += "\n---\n\n"
-    
-    md_content = f"""---
-title: {name}
-description: Complete guide for {name} ({rarity} {faction})
-tags: [{rarity}, {faction}, Hero]
----
-
-# {name}
-
-<div className="hero-header">
+    with open_markdown(Path(OUTPUT_DIR) / f"{slug}.md") as out:
+        out.frontmatter({
+            'title': name,
+            'description': f"Complete guide for {name} ({rarity} {faction})",
+            'tags': [rarity, faction, 'Hero'],
+        })
+        out.heading(name)
+        out.raw(f"""<div className="hero-header">
   <img src="/img/heroes/{image_file}" alt="{name}" width="200" />
   <div className="hero-info">
     <p><strong>Faction:</strong> {faction}</p>
     <p><strong>Rarity:</strong> {rarity}</p>
     <p><strong>Role:</strong> DPS/Support (Automated Role Detection Coming Soon)</p>
   </div>
-</div>
-
-## Overview
-
-{name} is a {rarity} hero from the {faction} faction.
-
-## Skills
-
-{skills_md}
+</div>""")
+        out.heading('Overview', 2)
+        out.paragraph(f"{name} is a {rarity} hero from the {faction} faction.")
 
-## Recommended Queues
+        out.heading('Skills', 2)
+        for skill in hero.get('skills', []):
+            s_name = skill.get('name', 'Unnamed Skill')
+            s_type = skill.get('type', 'Passive').capitalize()
+            s_cooldown = skill.get('cooldown_sec')
+            cd_str = f" ({s_cooldown}s CD)" if s_cooldown else ""
 
-*Updated lineup strategies coming soon.*
+            out.heading(s_name, 3)
+            out.paragraph(f"**Type:** {s_type}{cd_str}")
+            out.paragraph(skill.get('base_description', ''))
 
-<small>Data sourced from TopHeroes.info</small>
-"""
-    
-    with open(os.path.join(OUTPUT_DIR, f"{slug}.md"), 'w') as f:
-        f.write(md_content)
+            # Star levels
+            if skill.get('star_levels'):
+                out.paragraph("**Upgrades:**")
+                out.bullets(f"**{'⭐' * star['stars']}**: {star['description']}" for star in skill['star_levels'])
+            out.rule()
+
+        out.heading('Recommended Queues', 2)
+        out.paragraph("*Updated lineup strategies coming soon.*")
+        out.raw("<small>Data sourced from TopHeroes.info</small>")
     print(f"Generated {slug}.md")
 
 def main():
@@ -3,7 +3,12 @@ from bs4 import BeautifulSoup
 import re
 import json
 import os
+import sys
 import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "content"))
+from markdown_emitter import open_markdown  # noqa: E402
 
 # Config
 BASE_URL = "https://topheroes.info"
@@ -102,17 +107,17 @@ def generate_markdown(hero, filename):
     image_file = download_image(hero.get('hero_id', hero.get('id', filename.replace('.md', ''))), filename.replace('.md', ''))
     
     # MDX Content
-    md_content = f"""---
-title: {hero.get('hero_name', hero.get('name', 'Unknown'))}
-description: Guide for {hero.get('hero_name', hero.get('name', 'Unknown'))}
-image: {image_file}
-tags: [{hero.get('rarity', 'Legendary')}, {hero.get('faction', 'Unknown')}, Hero]
----
-
-import HeroProfile from '@site/src/components/HeroProfile';
-
-<HeroProfile 
-  name="{hero.get('hero_name', hero.get('name', 'Unknown'))}"
+    name = hero.get('hero_name', hero.get('name', 'Unknown'))
+    with open_markdown(Path(OUTPUT_DIR) / filename) as out:
+        out.frontmatter({
+            'title': name,
+            'description': f"Guide for {name}",
+            'image': image_file,
+            'tags': [hero.get('rarity', 'Legendary'), hero.get('faction', 'Unknown'), 'Hero'],
+        })
+        out.raw("import HeroProfile from '@site/src/components/HeroProfile';")
+        out.raw(f"""<HeroProfile 
+  name="{name}"
   rarity="{hero.get('rarity', 'Legendary')}"
   faction="{hero.get('faction', 'Unknown')}"
   role="{hero.get('role', 'DPS')}"
@@ -121,13 +126,7 @@ import HeroProfile from '@site/src/components/HeroProfile';
   positions={{{positions_json}}}
   uniqueWeapon="{unique_weapon}"
   skills={{{skills_json}}}
-/>
-
-"""
-    
-    filepath = os.path.join(OUTPUT_DIR, filename)
-    with open(filepath, 'w') as f:
-        f.write(md_content)
+/>""")
     print(f"Generated {filename}")
 
 
@@ -1,9 +1,15 @@
 
 import os
+import sys
+from pathlib import Path
+
 import requests
 from bs4 import BeautifulSoup
 import time
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "content"))
+from markdown_emitter import open_markdown  # noqa: E402
+
 # Comprehensive list from research
 heroes = [
     "Adjudicator", "Astrologer", "Barbarian", "Bard", "Beastmaster", "Bishop", 
@@ -94,32 +100,22 @@ for hero_name in heroes:
             elif "Healer" in text_content: role = "Healer"
         
         # Generate Markdown
-        markdown = f"""---
-title: {hero_name}
-description: Complete guide for {hero_name} in Top Heroes.
-tags: [{faction}, {role}, Hero]
----
-
-# {hero_name}
-
-![{hero_name}](/img/{final_img_path})
-
-## Overview
-**Faction:** {faction}
-**Role:** {role}
-
-## Skills
-*(Skill data extracted from Fandom)*
-> This section is under construction. Please check [Fandom]({url}) for accurate skill percentages.
-
-## Strategies
-- **Best Team Comps:** Coming soon.
-- **Countered By:** Coming soon.
-
-"""
-        with open(f"{doc_dir}/{slug}.md", "w") as f:
-            f.write(markdown)
-            print(f"  Generated page for {hero_name}")
+        with open_markdown(Path(doc_dir) / f"{slug}.md") as out:
+            out.frontmatter({
+                'title': hero_name,
+                'description': f"Complete guide for {hero_name} in Top Heroes.",
+                'tags': [faction, role, 'Hero'],
+            })
+            out.heading(hero_name)
+            out.paragraph(f"![{hero_name}](/img/{final_img_path})")
+            out.heading('Overview', 2)
+            out.paragraph(f"**Faction:** {faction}\n**Role:** {role}")
+            out.heading('Skills', 2)
+            out.paragraph("*(Skill data extracted from Fandom)*")
+            out.blockquote(f"This section is under construction. Please check [Fandom]({url}) for accurate skill percentages.")
+            out.heading('Strategies', 2)
+            out.bullets(["**Best Team Comps:** Coming soon.", "**Countered By:** Coming soon."])
+        print(f"  Generated page for {hero_name}")
             
         time.sleep(1) # Be nice to the server
 
@@ -3,7 +3,12 @@ from bs4 import BeautifulSoup
 import re
 import json
 import os
+import sys
 import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "content"))
+from markdown_emitter import open_markdown  # noqa: E402
 
 # Config
 BASE_URL = "https://topheroes.info"
@@ -118,64 +123,56 @@ def parse_hero_page(url, web_slug):
         saved_image = download_image(image_url, image_filename)
         
         # 4. Generate Markdown
-        md_content = f"""# {name}
-
-## Overview
-
-- **Faction**: {faction}
-- **Rarity**: {rarity}
-- **Role**: {role}
-
-"""
-        # Add JSON extra data if available
-        if hero_json:
-            if 'tier' in hero_json:
-                md_content += f"- **Tier**: {hero_json['tier']}\n"
-            
-            # Gear
-            if 'gear' in hero_json:
-                gear = hero_json['gear']
-                md_content += f"\n## Recommended Build\n\n"
-                if 'default_set_name' in gear:
-                    md_content += f"### Gear Set\n**{gear['default_set_name']}**\n"
-                    if 'notes' in gear:
-                        md_content += f"> {gear['notes']}\n"
-                
-                if 'default_set_stats' in gear:
-                    stats = gear['default_set_stats']
-                    if isinstance(stats, dict):
-                        md_content += "\n**Stats to Focus:**\n"
-                        for k, v in stats.items():
-                            md_content += f"- {k.replace('_', ' ').title()}: {v}\n"
-
-            # Awakening
-            if 'awakening_details' in hero_json:
-                awk = hero_json['awakening_details']
-                md_content += f"\n## Awakening\n\n"
-                if 'notes' in awk:
-                    md_content += f"{awk['notes']}\n\n"
-                md_content += f"**Estimated Cost:** {awk.get('awakening_shards_estimate', '???')} Shards\n"
-
-        # Skills Section
-        md_content += "\n## Skills\n\n"
-        if skills_html:
-            for skill in skills_html:
-                tags_str = ", ".join([f"`{t}`" for t in skill['tags']])
-                md_content += f"### {skill['name']}\n"
-                if tags_str:
-                    md_content += f"**Type:** {tags_str}\n\n"
-                md_content += f"{skill['description']}\n\n"
-        elif hero_json and 'skills' in hero_json:
-             for skill in hero_json['skills']:
-                 md_content += f"### {skill.get('name', 'Unknown')}\n"
-                 md_content += f"**Type:** {skill.get('type', '')}\n\n"
-        else:
-            md_content += "*Skill data not available.*\n"
-
-        # Write to file
         filename = f"{web_slug}.md"
-        with open(os.path.join(OUTPUT_DIR, filename), 'w') as f:
-            f.write(md_content)
+        with open_markdown(Path(OUTPUT_DIR) / filename) as out:
+            out.heading(name)
+            out.heading('Overview', 2)
+            overview = [f"**Faction**: {faction}", f"**Rarity**: {rarity}", f"**Role**: {role}"]
+            if hero_json and 'tier' in hero_json:
+                overview.append(f"**Tier**: {hero_json['tier']}")
+            out.bullets(overview)
+
+            # Add JSON extra data if available
+            if hero_json:
+                # Gear
+                if 'gear' in hero_json:
+                    gear = hero_json['gear']
+                    out.heading('Recommended Build', 2)
+                    if 'default_set_name' in gear:
+                        out.heading('Gear Set', 3)
+                        out.paragraph(f"**{gear['default_set_name']}**")
+                        if 'notes' in gear:
+                            out.blockquote(gear['notes'])
+
+                    if 'default_set_stats' in gear:
+                        stats = gear['default_set_stats']
+                        if isinstance(stats, dict):
+                            out.paragraph("**Stats to Focus:**")
+                            out.bullets(f"{k.replace('_', ' ').title()}: {v}" for k, v in stats.items())
+
+                # Awakening
+                if 'awakening_details' in hero_json:
+                    awk = hero_json['awakening_details']
+                    out.heading('Awakening', 2)
+                    if 'notes' in awk:
+                        out.paragraph(awk['notes'])
+                    out.paragraph(f"**Estimated Cost:** {awk.get('awakening_shards_estimate', '???')} Shards")
+
+            # Skills Section
+            out.heading('Skills', 2)
+            if skills_html:
+                for skill in skills_html:
+                    tags_str = ", ".join([f"`{t}`" for t in skill['tags']])
+                    out.heading(skill['name'], 3)
+                    if tags_str:
+                        out.paragraph(f"**Type:** {tags_str}")
+                    out.paragraph(skill['description'])
+            elif hero_json and 'skills' in hero_json:
+                 for skill in hero_json['skills']:
+                     out.heading(skill.get('name', 'Unknown'), 3)
+                     out.paragraph(f"**Type:** {skill.get('type', '')}")
+            else:
+                out.paragraph("*Skill data not available.*")
         
         print(f"  Generated {filename}")
 
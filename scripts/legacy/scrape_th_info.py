@@ -2,7 +2,12 @@ import requests
 from bs4 import BeautifulSoup
 import os
 import re
+import sys
 import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "content"))
+from markdown_emitter import open_markdown  # noqa: E402
 
 BASE_URL = "https://topheroes.info"
 HERO_LIST_URL = f"{BASE_URL}/hero.php"
@@ -113,57 +118,43 @@ def parse_hero_page(hero_url, hero_name, rarity, faction):
                 pass
 
         # 4. Generate Markdown
-        skill_section = ""
-        if skills:
-            skill_section = "## Skills\n\n"
-            for skill in skills:
-                tags_str = ", ".join([f"`{t}`" for t in skill['tags']])
-                skill_section += f"### {skill['name']}\n"
-                if tags_str:
-                    skill_section += f"**Type:** {tags_str}\n\n"
-                skill_section += f"{skill['description']}\n\n---\n\n"
-        else:
-            skill_section = "## Skills\n\n*Skill data currently unavailable.*\n"
-
-        md_content = f"""---
-title: {hero_name}
-description: Complete guide for {hero_name} ({rarity} {faction}) - Skills, Gears, and Lineups.
-tags: [{rarity}, {faction}, Hero]
----
-
-# {hero_name}
-
-<div className="hero-header">
+        filename = f"{slug}.md"
+        with open_markdown(Path(OUTPUT_DIR) / filename) as out:
+            out.frontmatter({
+                'title': hero_name,
+                'description': f"Complete guide for {hero_name} ({rarity} {faction}) - Skills, Gears, and Lineups.",
+                'tags': [rarity, faction, 'Hero'],
+            })
+            out.heading(hero_name)
+            out.raw(f"""<div className="hero-header">
   <img src="/img/heroes/{local_image}" alt="{hero_name}" width="200" />
   <div className="hero-info">
     <p><strong>Faction:</strong> {faction}</p>
     <p><strong>Rarity:</strong> {rarity}</p>
     <p><strong>Role:</strong> (Role functionality coming soon)</p>
   </div>
-</div>
-
-## Overview
-
-{hero_name} is a {rarity} hero from the {faction} faction.
-
-{skill_section}
-
-## Recommended Queues
-
-*Coming soon. Check back for updated lineup strategies.*
-
-## Gear Priorities
-
-*Coming soon.*
-
-<br/>
-
-<small>Data sourced from [TopHeroes.info]({hero_url})</small>
-"""
-        
-        filename = f"{slug}.md"
-        with open(os.path.join(OUTPUT_DIR, filename), 'w') as f:
-            f.write(md_content)
+</div>""")
+            out.heading('Overview', 2)
+            out.paragraph(f"{hero_name} is a {rarity} hero from the {faction} faction.")
+
+            out.heading('Skills', 2)
+            if skills:
+                for skill in skills:
+                    tags_str = ", ".join([f"`{t}`" for t in skill['tags']])
+                    out.heading(skill['name'], 3)
+                    if tags_str:
+                        out.paragraph(f"**Type:** {tags_str}")
+                    out.paragraph(skill['description'])
+                    out.rule()
+            else:
+                out.paragraph("*Skill data currently unavailable.*")
+
+            out.heading('Recommended Queues', 2)
+            out.paragraph("*Coming soon. Check back for updated lineup strategies.*")
+            out.heading('Gear Priorities', 2)
+            out.paragraph("*Coming soon.*")
+            out.raw("<br/>")
+            out.raw(f"<small>Data sourced from [TopHeroes.info]({hero_url})</small>")
             
         print(f"  Generated {filename} with {len(skills)} skills")
         
@@ -0,0 +1,24 @@
+"""Console entry point for ``topheroes-content``.
+
+The pipeline modules live in ``scripts/content`` and import each other as
+siblings, so this puts that directory on the path and hands over to
+``content_cli``. Install the project editable so the path resolves to the
+checkout: ``pip install -e scripts/python``.
+"""
+import sys
+from pathlib import Path
+
+CONTENT_DIR = Path(__file__).resolve().parents[1] / "content"
+
+
+def main() -> None:
+    if not (CONTENT_DIR / "content_cli.py").exists():
+        raise SystemExit(f"{CONTENT_DIR} not found; install with 'pip install -e scripts/python' from the checkout")
+    sys.path.insert(0, str(CONTENT_DIR))
+    from content_cli import main as cli_main
+
+    cli_main()
+
+
+if __name__ == "__main__":
+    main()
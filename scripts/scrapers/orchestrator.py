@@ -4,8 +4,11 @@ Top Heroes Content Scraper Agent System
 Orchestrates multiple scrapers to gather and update game content.
 """
 
+import argparse
 import json
 import os
+import sys
+import time
 import asyncio
 import logging
 from pathlib import Path
@@ -28,6 +31,23 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 RAG_CONTENT_DIR = PROJECT_ROOT / "rag-content"
 DATA_DIR = PROJECT_ROOT / "src" / "data"
 
+# Shared pipeline helpers live next to update_content.py
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "content"))
+from run_metrics import metrics  # noqa: E402
+from tracing import aiohttp_trace_configs, span, start_trace_from_env, stop_trace  # noqa: E402
+from http_replay import RECORD_ENV, REPLAY_URL_ENV, Cassette, replay_server_url  # noqa: E402
+from markdown_emitter import MarkdownWriter  # noqa: E402
+from profiling import PROFILE_DIR, PROFILE_ENV, profile_stage, start_profile, stop_profile, watch_loop  # noqa: E402
+from validate_content import validate_docs  # noqa: E402
+
+# Offline runs: CONTENT_REPLAY_URL points fetches at `http_replay.py DIR`,
+# CONTENT_RECORD_DIR saves every response for later replay.
+REPLAY_URL = os.environ.get(REPLAY_URL_ENV)
+RECORDER = Cassette(Path(os.environ[RECORD_ENV])) if os.environ.get(RECORD_ENV) else None
+
+# Hero pages fetched at once per scraper; keep it low against the live site.
+CONCURRENCY = int(os.environ.get("CONTENT_CONCURRENCY", "1"))
+
 
 @dataclass
 class HeroData:
@@ -76,17 +96,43 @@ class BaseScraperAgent:
         """Save content to RAG directory"""
         output_path = RAG_CONTENT_DIR / category / filename
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(content, encoding='utf-8')
+        with span("write", "io", path=f"{category}/{filename}", bytes=len(content)):
+            output_path.write_text(content, encoding='utf-8')
+        metrics.files(written=1)
         self.logger.info(f"Saved: {output_path}")
 
+    async def fetch(self, session: aiohttp.ClientSession, url: str):
+        """GET a page, recording status, bytes and latency in the run metrics.
+
+        Returns (status, html); html is None for non-200 responses.
+        """
+        started = time.perf_counter()
+        target = replay_server_url(url, REPLAY_URL) if REPLAY_URL else url
+        with span("GET", "http", url=url) as trace:
+            try:
+                async with session.get(target) as response:
+                    with span("http.body", "http"):
+                        body = await response.read()
+                    html = await response.text() if response.status == 200 else None
+            except aiohttp.ClientError as e:
+                metrics.request(url, type(e).__name__, seconds=time.perf_counter() - started)
+                raise
+            trace.set(status=response.status, bytes=len(body))
+        elapsed = time.perf_counter() - started
+        metrics.request(url, response.status, len(body), elapsed)
+        if RECORDER is not None:
+            RECORDER.record("GET", url, response.status, dict(response.headers), body, elapsed)
+        return response.status, html
+
 
 class TopHeroesInfoScraper(BaseScraperAgent):
     """Scraper for topheroes.info website"""
     
     BASE_URL = "https://topheroes.info"
     
-    def __init__(self):
+    def __init__(self, concurrency: int = CONCURRENCY):
         super().__init__("topheroes_info")
+        self.concurrency = max(1, concurrency)
     
     async def scrape(self) -> ScraperResult:
         """Scrape hero data from topheroes.info"""
@@ -95,32 +141,45 @@ class TopHeroesInfoScraper(BaseScraperAgent):
         heroes_scraped = 0
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=aiohttp_trace_configs()) as session:
                 # Fetch hero list page
-                async with session.get(f"{self.BASE_URL}/hero.php") as response:
-                    if response.status != 200:
-                        raise Exception(f"HTTP {response.status}")
-                    
-                    html = await response.text()
+                status, html = await self.fetch(session, f"{self.BASE_URL}/hero.php")
+                if status != 200:
+                    raise Exception(f"HTTP {status}")
+
+                with metrics.parse("hero_list"):
                     soup = BeautifulSoup(html, 'html.parser')
-                    
                     # Parse hero links
                     hero_links = soup.select('a[href*="/hero/"]')
-                    
-                    for link in hero_links:
-                        try:
-                            hero_url = link.get('href')
-                            if hero_url:
-                                # Fetch individual hero page
-                                hero_data = await self._scrape_hero_page(
-                                    session, 
-                                    f"{self.BASE_URL}{hero_url}"
-                                )
-                                if hero_data:
-                                    self._save_hero_markdown(hero_data)
-                                    heroes_scraped += 1
-                        except Exception as e:
-                            errors.append(f"Error scraping {link}: {e}")
+
+                # Each hero is linked once per card; keep page order
+                hero_urls = list(dict.fromkeys(
+                    link.get('href') for link in hero_links if link.get('href')
+                ))
+
+                semaphore = asyncio.Semaphore(self.concurrency)
+
+                async def scrape_one(hero_url: str) -> bool:
+                    async with semaphore:
+                        # Fetch individual hero page
+                        hero_data = await self._scrape_hero_page(
+                            session,
+                            f"{self.BASE_URL}{hero_url}"
+                        )
+                    if hero_data:
+                        self._save_hero_markdown(hero_data)
+                        return True
+                    return False
+
+                results = await asyncio.gather(
+                    *(scrape_one(hero_url) for hero_url in hero_urls),
+                    return_exceptions=True
+                )
+                for hero_url, result in zip(hero_urls, results):
+                    if isinstance(result, Exception):
+                        errors.append(f"Error scraping {hero_url}: {result}")
+                    elif result:
+                        heroes_scraped += 1
             
             return ScraperResult(
                 source=self.name,
@@ -144,24 +203,24 @@ class TopHeroesInfoScraper(BaseScraperAgent):
     async def _scrape_hero_page(self, session, url: str) -> Optional[Dict]:
         """Scrape individual hero page"""
         try:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    return None
-                
-                html = await response.text()
+            status, html = await self.fetch(session, url)
+            if status != 200:
+                return None
+
+            with metrics.parse("hero_page"):
                 soup = BeautifulSoup(html, 'html.parser')
-                
+
                 # Extract hero data from page
                 # This would be customized based on actual page structure
                 name = soup.select_one('h1')
-                if name:
-                    return {
-                        'name': name.get_text(strip=True),
-                        'url': url,
-                        # Add more fields based on page structure
-                    }
-                
-                return None
+            if name:
+                return {
+                    'name': name.get_text(strip=True),
+                    'url': url,
+                    # Add more fields based on page structure
+                }
+
+            return None
         except Exception as e:
             self.logger.error(f"Error scraping {url}: {e}")
             return None
@@ -171,26 +230,21 @@ class TopHeroesInfoScraper(BaseScraperAgent):
         name = hero_data.get('name', 'Unknown')
         slug = name.lower().replace(' ', '-')
         
-        markdown = f"""# {name}
-
-## Overview
-- **Faction**: TBD
-- **Rarity**: TBD
-- **Role**: TBD
-- **Tier**: TBD
-
-## Skills
-*Content scraped from topheroes.info*
-
-## Recommended Build
-*See topheroes.info for latest recommendations*
-
-## Source
-- URL: {hero_data.get('url', 'N/A')}
-- Last Updated: {datetime.now().isoformat()}
-"""
+        out = MarkdownWriter()
+        out.heading(name)
+        out.heading('Overview', 2)
+        out.bullets(f"**{field}**: TBD" for field in ('Faction', 'Rarity', 'Role', 'Tier'))
+        out.heading('Skills', 2)
+        out.paragraph('*Content scraped from topheroes.info*')
+        out.heading('Recommended Build', 2)
+        out.paragraph('*See topheroes.info for latest recommendations*')
+        out.heading('Source', 2)
+        out.bullets([
+            f"URL: {hero_data.get('url', 'N/A')}",
+            f"Last Updated: {datetime.now().isoformat()}",
+        ])
         
-        self.save_to_rag('heroes', f'{slug}.md', markdown)
+        self.save_to_rag('heroes', f'{slug}.md', out.getvalue())
 
 
 class FandomWikiScraper(BaseScraperAgent):
@@ -221,9 +275,9 @@ class ContentOrchestrator:
     and manages content updates.
     """
     
-    def __init__(self):
+    def __init__(self, concurrency: int = CONCURRENCY):
         self.scrapers = [
-            TopHeroesInfoScraper(),
+            TopHeroesInfoScraper(concurrency),
             FandomWikiScraper(),
         ]
         self.logger = logging.getLogger("orchestrator")
@@ -232,39 +286,33 @@ class ContentOrchestrator:
         """Run all scrapers concurrently"""
         self.logger.info("Starting scraper orchestration...")
         
-        tasks = [scraper.scrape() for scraper in self.scrapers]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        tasks = [self._run_scraper(scraper) for scraper in self.scrapers]
+        # Scrapers share the loop thread, so they are profiled as one stage
+        with profile_stage("scrape"):
+            results = await asyncio.gather(*tasks, return_exceptions=True)
         
         # Process results
         successful = sum(1 for r in results if isinstance(r, ScraperResult) and r.success)
         self.logger.info(f"Scraping complete: {successful}/{len(self.scrapers)} successful")
         
         return [r for r in results if isinstance(r, ScraperResult)]
+
+    async def _run_scraper(self, scraper: BaseScraperAgent) -> ScraperResult:
+        # Each gathered task gets its own copy of the context, so stages don't mix
+        with metrics.stage(scraper.name):
+            return await scraper.scrape()
     
     async def validate_content(self):
         """Validate all RAG content files"""
-        issues = []
-        
-        for category in RAG_CONTENT_DIR.iterdir():
-            if category.is_dir():
-                for file in category.glob('*.md'):
-                    content = file.read_text()
-                    
-                    # Basic validation
-                    if len(content) < 100:
-                        issues.append(f"Short content: {file}")
-                    
-                    if '# ' not in content:
-                        issues.append(f"Missing header: {file}")
-        
-        return issues
+        return validate_docs(RAG_CONTENT_DIR)
     
     def generate_content_index(self):
         """Generate index of all RAG content"""
         index = {}
         
         for category in RAG_CONTENT_DIR.iterdir():
-            if category.is_dir():
+            # Hidden dirs (e.g. .build) hold generated retrieval artifacts
+            if category.is_dir() and not category.name.startswith('.'):
                 index[category.name] = []
                 for file in category.glob('*.md'):
                     index[category.name].append({
@@ -284,20 +332,43 @@ class ContentOrchestrator:
         return index
 
 
-async def main():
+async def main(profile: Optional[Path] = None):
     """Main entry point"""
-    orchestrator = ContentOrchestrator()
-    
+    # Set CONTENT_TRACE=path/to/trace.json to record spans
+    start_trace_from_env()
+    if profile:
+        start_profile(profile)
+        watch_loop()
+    try:
+        await run(ContentOrchestrator())
+    except BaseException:
+        metrics.status = "failed"
+        raise
+    finally:
+        report = metrics.write("orchestrator")
+        logger.info(f"Run metrics: {report}")
+        trace = stop_trace()
+        if trace:
+            logger.info(f"Trace: {trace}")
+        profile_dir = stop_profile()
+        if profile_dir:
+            logger.info(f"Profile: {profile_dir}")
+
+
+async def run(orchestrator: ContentOrchestrator):
     # Run scrapers
     results = await orchestrator.run_all_scrapers()
     
     # Validate content
-    issues = await orchestrator.validate_content()
+    with metrics.stage("validate"):
+        issues = await orchestrator.validate_content()
     if issues:
         logger.warning(f"Content validation issues: {issues}")
     
     # Generate index
-    orchestrator.generate_content_index()
+    with metrics.stage("index"):
+        orchestrator.generate_content_index()
+        metrics.files(written=1)
     
     # Summary
     for result in results:
@@ -306,5 +377,20 @@ async def main():
             logger.info(f"{status} {result.source}: {result.items_scraped} items")
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the content scrapers, validate and index rag-content.")
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        nargs="?",
+        const=PROFILE_DIR,
+        default=os.environ.get(PROFILE_ENV),
+        metavar="DIR",
+        help=f"Write per-stage .pstats, flamegraph stacks and event-loop blocking stacks to DIR (or set {PROFILE_ENV})",
+    )
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    args = parse_args()
+    asyncio.run(main(args.profile))